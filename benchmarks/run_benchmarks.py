@@ -0,0 +1,327 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   run_benchmarks.py
+@Time    :   2026/10/18 23:18:02
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Benchmarks of the hot paths (glossary compiler, macro expansion,
+             atmosphere, aero lookup, linearization) on the real inputs and
+             on synthetic 10x/100x ones, with JSON baselines and regression
+             flags.
+"""
+
+import argparse
+import atexit
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+GLOSSARY_DIR = os.path.join(ROOT_DIR, "glossaries")
+TEX_DIR = os.path.join(ROOT_DIR, "tex_folder")
+BASELINE_FILE = os.path.join(ROOT_DIR, "benchmarks", "baseline.json")
+SCALES = (1, 10, 100)
+THRESHOLD = 0.20  # relative slowdown flagged as a regression
+MIN_TIME = 0.2  # seconds of calls per repeat
+REPEATS = 5
+
+for path in (ROOT_DIR, GLOSSARY_DIR, TEX_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# name -> (setup(scale) -> callable, description)
+BENCHMARKS = {}
+
+
+def benchmark(name, description=""):
+    """Register ``setup(scale)``, which prepares the inputs and returns the callable to time."""
+
+    def register(setup):
+        BENCHMARKS[name] = (setup, description)
+        return setup
+
+    return register
+
+
+def _suffix(i):
+    """Letters only (the keys also become macro names): 0 -> '', 1 -> 'b', 26 -> 'ba'."""
+    letters = ""
+    while i:
+        i, r = divmod(i, 26)
+        letters = chr(ord("a") + r) + letters
+    return letters
+
+
+def scale_glossary(content, keys, scale):
+    """``content`` repeated ``scale`` times, the keys of every copy renamed."""
+    if scale == 1:
+        return content
+    pattern = re.compile(r"\{(" + "|".join(map(re.escape, sorted(keys, key=len, reverse=True))) + r")\}")
+    copies = [content]
+    for i in range(1, scale):
+        tag = _suffix(i)
+        copies.append(pattern.sub(lambda m: "{" + m.group(1) + tag + "}", content))
+    return "\n".join(copies)
+
+
+def _glossary_sources():
+    from glossary_compiler import SOURCE_FILES, iter_entries, read_source
+
+    sources = {name: read_source(os.path.join(GLOSSARY_DIR, name)) for name in SOURCE_FILES}
+    keys = {key for content in sources.values() for key, _, _ in iter_entries(content)}
+    return sources, keys
+
+
+@benchmark("glossary.parse", "parse every glossaries/*.tex source")
+def _glossary_parse(scale):
+    from glossary_compiler import parse_glossary_text
+
+    sources, keys = _glossary_sources()
+    texts = {name: scale_glossary(content, keys, scale) for name, content in sources.items()}
+    return lambda: [parse_glossary_text(text, source=name) for name, text in texts.items()]
+
+
+@benchmark("glossary.compile", "parse + resolve + render the three symbol files (no cache, no write)")
+def _glossary_compile(scale):
+    from glossary_compiler import LYX_FILE, SIGLAS_FILES, GlossaryCompiler
+
+    sources, keys = _glossary_sources()
+    directory = tempfile.mkdtemp(prefix="bench_glossary_")
+    atexit.register(shutil.rmtree, directory, True)
+    for name, content in sources.items():
+        with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+            f.write(scale_glossary(content, keys, scale))
+    for name in SIGLAS_FILES + [LYX_FILE]:
+        if os.path.isfile(os.path.join(GLOSSARY_DIR, name)):
+            shutil.copy(os.path.join(GLOSSARY_DIR, name), directory)
+    return lambda: GlossaryCompiler(directory).load().render()
+
+
+@benchmark("macros.substitute", "substituir_comandos on tex_folder/control.tex")
+def _macros(scale):
+    from glossary_compiler import QTIKZ_FILE, GlossaryCompiler
+    from sub_glossaries_by_definitions import carregar_definicoes, substituir_comandos
+
+    # the definitions are rendered from the sources: the generated file may not exist
+    directory = tempfile.mkdtemp(prefix="bench_macros_")
+    atexit.register(shutil.rmtree, directory, True)
+    path = os.path.join(directory, QTIKZ_FILE)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(GlossaryCompiler(GLOSSARY_DIR).load().render()[QTIKZ_FILE])
+    definitions = carregar_definicoes(path)
+    with open(os.path.join(TEX_DIR, "control.tex"), "r", encoding="utf-8") as f:
+        text = f.read() * scale
+    return lambda: substituir_comandos(text, definitions)
+
+
+def _altitudes(scale):
+    import numpy as np
+    import pandas as pd
+
+    from python.linearization_of_model import atmosphere
+
+    altitude = pd.read_csv(os.path.join(ROOT_DIR, "images", "atmosfera_dados.csv"))["Altitude_km"].to_numpy()
+    # the upper model needs the atmosphere1976 submodule: the lower atmosphere only
+    altitude = altitude[altitude < atmosphere.UPPER_LIMIT_KM]
+    return np.tile(altitude, scale)
+
+
+@benchmark("atmosphere.vectorized", "get_properties of every altitude of atmosfera_dados.csv at once")
+def _atmosphere_vectorized(scale):
+    from python.linearization_of_model.atmosphere import get_properties
+
+    altitude = _altitudes(scale)
+    return lambda: get_properties(altitude)
+
+
+@benchmark("atmosphere.per_altitude", "one get_properties call per altitude (the loop of graphics_atmos.py)")
+def _atmosphere_loop(scale):
+    from python.linearization_of_model.atmosphere import get_properties
+
+    altitude = _altitudes(scale).tolist()
+    return lambda: [get_properties(z) for z in altitude]
+
+
+@benchmark("atmosphere.atmosphere1976", "Atmosphere1976.get_properties per altitude (needs the submodule)")
+def _atmosphere_scalar(scale):
+    from python.linearization_of_model.atmosphere import _scalar_model
+
+    model = _scalar_model()
+    altitude = _altitudes(scale).tolist()
+    return lambda: [model.get_properties(z) for z in altitude]
+
+
+def _flight_points(n, vehicle, seed=0):
+    import numpy as np
+
+    from python.linearization_of_model.aero_database import AeroDatabase
+
+    database = AeroDatabase.from_dataset(vehicle)
+    rng = np.random.default_rng(seed)
+    (mach, alpha, beta) = (database.axes[0], database.axes[1], database.axes[2])
+    points = [rng.uniform(axis.min(), axis.max(), n) for axis in (mach, alpha, beta)]
+    return database, points
+
+
+for _vehicle in ("14x", "hxi"):
+
+    @benchmark("aero.lookup.%s" % _vehicle, "AeroDatabase.evaluate of 1000 x scale random points")
+    def _aero_lookup(scale, vehicle=_vehicle):
+        database, points = _flight_points(1000 * scale, vehicle)
+        return lambda: database.evaluate(*points)
+
+    @benchmark("aero.derivatives.%s" % _vehicle, "interpolate_derivatives of every column at 1000 x scale Mach")
+    def _aero_derivatives(scale, vehicle=_vehicle):
+        import numpy as np
+
+        from python.linearization_of_model import aero_data
+
+        table = aero_data.load_derivatives(vehicle)
+        columns = [c for c in table.keys() if c != "MACH"]
+        mach = np.random.default_rng(0).uniform(table["MACH"].min(), table["MACH"].max(), 1000 * scale)
+        return lambda: aero_data.interpolate_derivatives(table, mach, columns)
+
+    @benchmark("aero.spline.%s" % _vehicle, "DerivativeSpline of every column at 1000 x scale Mach")
+    def _aero_spline(scale, vehicle=_vehicle):
+        import numpy as np
+
+        from python.linearization_of_model import aero_data
+
+        spline = aero_data.load_derivative_spline(vehicle)
+        grid = spline.breakpoints
+        mach = np.random.default_rng(0).uniform(grid[0], grid[-1], 1000 * scale)
+        return lambda: spline(mach)
+
+    @benchmark("linearization.%s" % _vehicle, "longitudinal + lateral state space of 100 x scale points")
+    def _linearization(scale, vehicle=_vehicle):
+        import numpy as np
+
+        from python.linearization_of_model.linearization import LinearizationEngine
+
+        engine = LinearizationEngine(vehicle)
+        mach = engine.derivatives["MACH"]
+        rng = np.random.default_rng(0)
+        n = 100 * scale
+        args = (rng.uniform(np.min(mach), np.max(mach), n), rng.uniform(10.0, 40.0, n), rng.uniform(-2.0, 6.0, n))
+        return lambda: engine.linearize(*args)
+
+
+def measure(function, min_time=MIN_TIME, repeats=REPEATS):
+    """(median, min) seconds per call over ``repeats`` batches of about ``min_time`` seconds."""
+    function()  # warm-up: caches, lazy imports
+    number, elapsed = 1, 0.0
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / repeats or number >= 1 << 20:
+            break
+        number *= 2
+    samples = [elapsed / number]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - start) / number)
+    return statistics.median(samples), min(samples)
+
+
+def run(names=None, scales=SCALES, min_time=MIN_TIME, repeats=REPEATS, verbose=True):
+    """{"<name>@<scale>x": {"median", "min"}} for the selected benchmarks."""
+    results = {}
+    for name, (setup, _) in BENCHMARKS.items():
+        if names and not any(re.search(pattern, name) for pattern in names):
+            continue
+        for scale in scales:
+            key = "%s@%dx" % (name, scale)
+            try:
+                median, best = measure(setup(scale), min_time, repeats)
+            except ImportError as err:  # e.g. a submodule not checked out
+                if verbose:
+                    print("%-36s skipped (%s)" % (key, err))
+                continue
+            results[key] = {"median": median, "min": best}
+            if verbose:
+                print("%-36s %12.3f ms" % (key, best * 1e3))
+    return results
+
+
+def load_baseline(file_path=BASELINE_FILE):
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_baseline(results, file_path=BASELINE_FILE):
+    baseline = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "processor": platform.processor()},
+        "results": results,
+    }
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=1, sort_keys=True)
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """
+    Rows (key, seconds, baseline seconds, ratio, flag) on the best time of
+    the repeats (the least noisy); flag is REGRESSION, faster, new or ''.
+    """
+    rows = []
+    for key, result in results.items():
+        reference = baseline["results"].get(key)
+        if reference is None:
+            rows.append((key, result["min"], None, None, "new"))
+            continue
+        ratio = result["min"] / reference["min"]
+        flag = "REGRESSION" if ratio > 1.0 + threshold else "faster" if ratio < 1.0 / (1.0 + threshold) else ""
+        rows.append((key, result["min"], reference["min"], ratio, flag))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks of the hot paths.")
+    parser.add_argument("names", nargs="*", help="regular expressions selecting benchmarks")
+    parser.add_argument("-l", "--list", action="store_true")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES))
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--min-time", type=float, default=MIN_TIME)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (_, description) in BENCHMARKS.items():
+            print("%-28s %s" % (name, description))
+        raise SystemExit(0)
+    results = run(args.names, args.scales, args.min_time, args.repeats)
+    if args.save:
+        save_baseline(results, args.baseline)
+        print("Baseline saved to " + os.path.relpath(args.baseline))
+        raise SystemExit(0)
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print("No baseline (run with --save to create one).")
+        raise SystemExit(0)
+    print()
+    regressions = 0
+    for key, seconds, reference, ratio, flag in compare(results, baseline, args.threshold):
+        if reference is None:
+            print("%-36s %12.3f ms  %12s  %6s  %s" % (key, seconds * 1e3, "-", "-", flag))
+        else:
+            print("%-36s %12.3f ms  %9.3f ms  %5.2fx  %s" % (key, seconds * 1e3, reference * 1e3, ratio, flag))
+        regressions += flag == "REGRESSION"
+    if regressions:
+        raise SystemExit("%d regression(s) beyond %d%%" % (regressions, 100 * args.threshold))
@@ -0,0 +1,400 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   glossary_compiler.py
+@Time    :   2026/10/18 09:12:40
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Single pass compiler of the glossary sources into the math
+             symbol files (mathSymbols.tex, mathSymbolsQtikz.tex and
+             mathSymbolsLyx.lyx).
+"""
+
+import hashlib
+import json
+import os
+import re
+
+from glossary_store import GlossaryEntry, GlossaryStore
+from latex_tokens import iter_commands_with_groups, strip_wrappers
+from macro_expander import MacroExpander
+
+GLOSSARY_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Tex files with the symbol entries, in the order they are emitted
+SOURCE_FILES = [
+    "states.tex",
+    "naca_coefficients.tex",
+    "parameters_vehicle.tex",
+    "coefficients.tex",
+    "comum.tex",
+    "constants.tex",
+    "control.tex",
+]
+SIGLAS_FILES = ["siglas.tex"]
+
+MATH_SYMBOLS_FILE = "mathSymbols.tex"
+QTIKZ_FILE = "mathSymbolsQtikz.tex"
+LYX_FILE = "mathSymbolsLyx.lyx"
+OUTPUT_FILES = [MATH_SYMBOLS_FILE, QTIKZ_FILE, LYX_FILE]
+
+# Manifest with the hashes and parsed entries of the last run. Bump the
+# version whenever the parsing or the rendering changes.
+CACHE_FILE = ".glossary_cache.json"
+CACHE_VERSION = 4
+
+# NOTE: \sc command cause conflicts with standart commands of latex
+RESERVED_COMMANDS = {"sc"}
+
+# Used when mathSymbolsLyx.lyx does not exist yet (fresh clone)
+DEFAULT_LYX_HEADER = (
+    "#LyX 2.3 created this file. For more info see http://www.lyx.org/\n"
+    "\\lyxformat 544\n"
+    "\\begin_document\n"
+    "\\begin_header\n"
+    "\\textclass article\n"
+    "\\use_default_options true\n"
+    "\\end_header\n"
+)
+
+# Acronyms keep their text inside braces: name={NACA}
+ACRONYM_PATTERN = re.compile(r"name\s*=\s*\{([^}]+)\}")
+
+GLS_ENTRY_PATTERN = re.compile(r"\\glsentry(name|symbol)\{([^}]+)\}")
+
+
+def read_source(file_path):
+    with open(file_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(file_path):
+    """sha256 of the file bytes, or None if it does not exist."""
+    try:
+        with open(file_path, "rb") as f:
+            return content_hash(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def iter_entries(content, source=None):
+    """
+    Yield (key, body, line) for every \\newglossaryentry{key}{body} of a file,
+    with the line where the entry starts. Unbalanced braces raise
+    LatexBraceError with the file and line.
+    """
+    line, last = 1, 0
+    for (key, body), start in iter_commands_with_groups(
+        content, "newglossaryentry", 2, source
+    ):
+        line += content.count("\n", last, start)
+        last = start
+        yield key, body, line
+
+
+def parse_entries(content, source=None):
+    """Parse the text of a glossary file into a list of GlossaryEntry."""
+    file_name = os.path.basename(source) if source else None
+    return [
+        GlossaryEntry.parse(key, body, source=file_name, line=line)
+        for key, body, line in iter_entries(content, source)
+    ]
+
+
+def parse_glossary_text(content, source=None):
+    """Parse the text of a glossary file into {entry: {field: value}}."""
+    return {entry.key: entry.as_dict() for entry in parse_entries(content, source)}
+
+
+def parse_latex_glossary(file_path):
+    return parse_glossary_text(read_source(file_path), source=file_path)
+
+
+def parse_siglas_text(content, source=None):
+    """Return {entry: acronym} for the acronym entries of siglas.tex."""
+    siglas = {}
+    for key, body, _ in iter_entries(content, source):
+        name = ACRONYM_PATTERN.search(body)
+        if name:
+            siglas[key] = name.group(1).strip()
+    return siglas
+
+
+def remover_ensuremath(s, source=None, first_line=1):
+    """
+    Remove todas as instâncias de ensuremath{...}, mesmo se estiverem aninhadas.
+    """
+    return strip_wrappers(s, ("ensuremath",), source, first_line)
+
+
+def gls_node(match):
+    return (match.group(1), match.group(2))
+
+
+def gls_expander(glossary):
+    """MacroExpander of the \\glsentryname{key}/\\glsentrysymbol{key} references."""
+    definitions = {
+        (field, key): entry.get(field)
+        for key, entry in glossary.items()
+        for field in ("name", "symbol")
+        if entry.get(field) is not None
+    }
+    return MacroExpander(definitions, pattern=GLS_ENTRY_PATTERN, node_of=gls_node)
+
+
+def substitute_gls_entries(text, glossary):
+    """
+    Substitui glsentryname{key} e glsentrysymbol{key} pelos valores do glossário,
+    inclusive as referências aninhadas.
+    """
+    if text is None:
+        return None
+    return gls_expander(glossary).expand(text)
+
+
+class GlossaryCompiler:
+    """
+    Compile the glossary sources into the math symbol files.
+
+    Every source is read and parsed exactly once into ``store`` (a
+    GlossaryStore indexed by file, type, parent and rendered symbol); all
+    outputs are rendered from it.
+    Given the manifest of a previous run, only the sources whose content hash
+    changed are parsed again, the others reuse the cached entries.
+    """
+
+    def __init__(self, glossary_dir=GLOSSARY_DIR, source_files=SOURCE_FILES,
+                 siglas_files=SIGLAS_FILES):
+        self.glossary_dir = glossary_dir
+        self.source_files = list(source_files)
+        self.siglas_files = list(siglas_files)
+        self.store = GlossaryStore()
+        self.siglas = {}
+        self.symbols = {}
+        self.hashes = {}
+        self.output_hashes = {}
+        self.parsed = []
+        self._raw = {}
+
+    def path(self, file_name):
+        return os.path.join(self.glossary_dir, file_name)
+
+    def scan(self):
+        """Read the bytes of every source and compute their hashes."""
+        for file_name in self.source_files + self.siglas_files:
+            with open(self.path(file_name), "rb") as f:
+                self._raw[file_name] = f.read()
+            self.hashes[file_name] = content_hash(self._raw[file_name])
+        return self.hashes
+
+    def is_up_to_date(self, manifest):
+        """True if neither the sources nor the outputs changed since ``manifest``."""
+        if not self.hashes:
+            self.scan()
+        if manifest.get("version") != CACHE_VERSION:
+            return False
+        cached = {**manifest.get("sources", {}), **manifest.get("siglas", {})}
+        if any(cached.get(k, {}).get("sha256") != v for k, v in self.hashes.items()):
+            return False
+        outputs = manifest.get("outputs", {})
+        return all(
+            outputs.get(k) is not None and file_hash(self.path(k)) == outputs[k]
+            for k in OUTPUT_FILES
+        )
+
+    def load(self, manifest=None):
+        if not self.hashes:
+            self.scan()
+        manifest = manifest if manifest and manifest.get("version") == CACHE_VERSION else {}
+        self.parsed = []
+
+        def cached_or_parse(section, file_name, parser):
+            cached = manifest.get(section, {}).get(file_name)
+            if cached is not None and cached["sha256"] == self.hashes[file_name]:
+                return cached["entries"]
+            self.parsed.append(file_name)
+            return parser(self._raw[file_name].decode("utf-8"), source=self.path(file_name))
+
+        self.store = GlossaryStore()
+        for file_name in self.source_files:
+            rows = cached_or_parse(
+                "sources",
+                file_name,
+                lambda *args, **kw: [e.to_row() for e in parse_entries(*args, **kw)],
+            )
+            for row in rows:
+                self.store.add(GlossaryEntry.from_row(row))
+        for file_name in self.siglas_files:
+            self.siglas[file_name] = cached_or_parse("siglas", file_name, parse_siglas_text)
+        self.resolve()
+        return self
+
+    def resolve(self):
+        """Resolve the \\glsentry* references of the symbols and render them."""
+        # every symbol is expanded once, however many entries reference it
+        expander = gls_expander(self.store.entries)
+        self.symbols = {}
+        for key in self.symbol_entries():
+            entry = self.store[key]
+            self.symbols[key] = expander.resolve(("symbol", key))
+            self.store.set_rendered(
+                key,
+                remover_ensuremath(
+                    self.symbols[key], source=self.path(entry.source), first_line=entry.line
+                ),
+            )
+
+    def symbol_entries(self):
+        """Yield the keys with a symbol, in source order."""
+        for file_name in self.source_files:
+            for entry in self.store.from_source(file_name):
+                if entry.symbol is not None:
+                    yield entry.key
+
+    def acronym_entries(self):
+        for siglas in self.siglas.values():
+            for key, name in siglas.items():
+                if key not in RESERVED_COMMANDS:
+                    yield key, name
+
+    def render_siglas(self):
+        return "".join(
+            "\\newcommand{\\" + key + "}{" + name + "}\n"
+            for key, name in self.acronym_entries()
+        )
+
+    def render_math_symbols(self):
+        lines = [
+            "\\newcommand{\\" + key + "}{\\glssymbol{" + key + "}}\n"
+            for key in self.symbol_entries()
+        ]
+        return "".join(lines) + self.render_siglas()
+
+    def render_qtikz(self):
+        lines = [
+            "\\newcommand{\\" + key + "}{" + self.store.rendered[key] + "}\n"
+            for key in self.symbol_entries()
+        ]
+        return "".join(lines) + self.render_siglas()
+
+    def read_lyx_header(self):
+        """Keep the header of the current LyX file (everything up to end_header)."""
+        lyx_path = self.path(LYX_FILE)
+        if not os.path.exists(lyx_path):
+            return DEFAULT_LYX_HEADER
+        header = []
+        with open(lyx_path, "r", encoding="utf-8") as f:
+            for lin in f:
+                header.append(lin)
+                if lin.find(r"end_header") > 0:
+                    break
+        return "".join(header)
+
+    def render_lyx(self, header=None):
+        if header is None:
+            header = self.read_lyx_header()
+        body = ["\n\\begin_body\n"]
+        for key in self.symbol_entries():
+            body.append(
+                "\\begin_layout Standard"
+                "\n\\begin_inset FormulaMacro\n"
+                "\\newcommand{\\" + key + "}{\\glssymbol{" + key + "}}\n"
+                "{" + self.symbols[key] + "}\n"
+                "\\end_inset\n"
+                "\n\\end_layout\n\n"
+            )
+        body.append("\\end_body\n\\end_document")
+        return header + "".join(body)
+
+    def render(self):
+        """Return {output file name: content} for every output."""
+        return {
+            MATH_SYMBOLS_FILE: self.render_math_symbols(),
+            QTIKZ_FILE: self.render_qtikz(),
+            LYX_FILE: self.render_lyx(),
+        }
+
+    def write(self, outputs=None):
+        """
+        Write the outputs whose bytes changed and return their names. Files
+        with the same content are left alone, so their mtime does not trigger
+        LaTeX rebuilds.
+        """
+        if outputs is None:
+            outputs = self.render()
+        written = []
+        self.output_hashes = {}
+        for file_name, content in outputs.items():
+            data = content.encode("utf-8")
+            self.output_hashes[file_name] = content_hash(data)
+            if file_hash(self.path(file_name)) == self.output_hashes[file_name]:
+                continue
+            with open(self.path(file_name), "wb") as f:
+                f.write(data)
+            written.append(file_name)
+        return written
+
+    def manifest(self):
+        return {
+            "version": CACHE_VERSION,
+            "sources": {
+                k: {
+                    "sha256": self.hashes[k],
+                    "entries": [e.to_row() for e in self.store.from_source(k)],
+                }
+                for k in self.source_files
+            },
+            "siglas": {
+                k: {"sha256": self.hashes[k], "entries": self.siglas[k]}
+                for k in self.siglas_files
+            },
+            "outputs": self.output_hashes,
+        }
+
+
+def load_manifest(manifest_path):
+    """Return the cache manifest, or an empty one if missing or unreadable."""
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest_path, manifest):
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, manifest_path)
+
+
+def compile_glossaries(glossary_dir=GLOSSARY_DIR, force=False):
+    """
+    Update the three symbol files from the glossary sources.
+
+    Unchanged sources reuse the entries cached in ``CACHE_FILE`` and only the
+    outputs whose content changed are rewritten. With ``force`` the cache is
+    ignored. Returns the list of rewritten files.
+    """
+    manifest_path = os.path.join(glossary_dir, CACHE_FILE)
+    manifest = {} if force else load_manifest(manifest_path)
+    compiler = GlossaryCompiler(glossary_dir)
+    compiler.scan()
+    if manifest and compiler.is_up_to_date(manifest):
+        return []
+    written = compiler.load(manifest).write()
+    save_manifest(manifest_path, compiler.manifest())
+    return written
+
+
+def load_store(glossary_dir=GLOSSARY_DIR):
+    """
+    Return the GlossaryStore of the glossary sources, reusing the entries of
+    the cache for the unchanged files (nothing is written).
+    """
+    manifest = load_manifest(os.path.join(glossary_dir, CACHE_FILE))
+    return GlossaryCompiler(glossary_dir).load(manifest).store
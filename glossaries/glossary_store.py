@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   glossary_store.py
+@Time    :   2026/10/18 12:03:55
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Compact, indexed store of the glossary entries.
+"""
+
+import json
+import re
+
+FIELDS = ("type", "name", "parent", "unit", "symbol", "description")
+
+# One alternative per field; lastgroup tells which field matched
+FIELD_PATTERN = re.compile(
+    "|".join(
+        [
+            r"type\s*=\s*(?P<type>[^,\n]+)",
+            r"name\s*=\s*(?P<name>\\[^,\n]+)",
+            r"parent\s*=\s*\{(?P<parent>[^}]+)\}",
+            r"unit\s*=\s*(?P<unit>\\[^,\n]+)",
+            r"symbol\s*=\s*(?P<symbol>\\[^,\n]+)",
+            r"description\s*=\s*\{(?P<description>[^}]+)\}",
+        ]
+    )
+)
+
+STORE_VERSION = 1
+
+
+class GlossaryEntry:
+    """One \\newglossaryentry: its fields, source file and line."""
+
+    __slots__ = ("key",) + FIELDS + ("source", "line")
+
+    def __init__(self, key, type=None, name=None, parent=None, unit=None,
+                 symbol=None, description=None, source=None, line=None):
+        self.key = key
+        self.type = type
+        self.name = name
+        self.parent = parent
+        self.unit = unit
+        self.symbol = symbol
+        self.description = description
+        self.source = source
+        self.line = line
+
+    @classmethod
+    def parse(cls, key, body, source=None, line=None):
+        """Extract the fields of the entry body in a single scan."""
+        entry = cls(key, source=source, line=line)
+        for match in FIELD_PATTERN.finditer(body):
+            field = match.lastgroup
+            # the first occurrence of each field wins
+            if getattr(entry, field) is None:
+                setattr(entry, field, match.group(field).strip())
+        return entry
+
+    def get(self, field, default=None):
+        value = getattr(self, field, None)
+        return default if value is None else value
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in FIELDS}
+
+    def to_row(self):
+        return [getattr(self, field) for field in self.__slots__]
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+    def __repr__(self):
+        return "GlossaryEntry(%r, symbol=%r)" % (self.key, self.symbol)
+
+
+class GlossaryStore:
+    """
+    Glossary entries indexed by key, type, parent, source file and rendered
+    symbol. Every query is a dict lookup; nothing is re-parsed.
+    """
+
+    def __init__(self, entries=()):
+        self.entries = {}
+        self.by_type = {}
+        self.by_parent = {}
+        self.by_source = {}
+        self.rendered = {}
+        self.by_symbol = {}
+        for entry in entries:
+            self.add(entry)
+
+    def add(self, entry):
+        if entry.key in self.entries:
+            self.remove(entry.key)
+        self.entries[entry.key] = entry
+        self.by_type.setdefault(entry.type, []).append(entry.key)
+        self.by_parent.setdefault(entry.parent, []).append(entry.key)
+        self.by_source.setdefault(entry.source, []).append(entry.key)
+
+    def remove(self, key):
+        entry = self.entries.pop(key)
+        self.by_type[entry.type].remove(key)
+        self.by_parent[entry.parent].remove(key)
+        self.by_source[entry.source].remove(key)
+        if key in self.rendered:
+            self.by_symbol[self.rendered.pop(key)].remove(key)
+
+    def set_rendered(self, key, symbol):
+        """Record the final (expanded) form of the symbol of ``key``."""
+        if key in self.rendered:
+            self.by_symbol[self.rendered[key]].remove(key)
+        self.rendered[key] = symbol
+        self.by_symbol.setdefault(symbol, []).append(key)
+
+    def __getitem__(self, key):
+        return self.entries[key]
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __iter__(self):
+        return iter(self.entries.values())
+
+    def __len__(self):
+        return len(self.entries)
+
+    def of_type(self, entry_type):
+        return [self.entries[k] for k in self.by_type.get(entry_type, [])]
+
+    def children(self, parent):
+        return [self.entries[k] for k in self.by_parent.get(parent, [])]
+
+    def from_source(self, source):
+        return [self.entries[k] for k in self.by_source.get(source, [])]
+
+    def keys_for_symbol(self, symbol):
+        """Keys whose rendered symbol is ``symbol``."""
+        return list(self.by_symbol.get(symbol, []))
+
+    def to_json(self):
+        """Columnar form: the field names once and one row per entry."""
+        return {
+            "version": STORE_VERSION,
+            "fields": list(GlossaryEntry.__slots__),
+            "rows": [entry.to_row() for entry in self.entries.values()],
+            "rendered": self.rendered,
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        if data.get("version") != STORE_VERSION:
+            raise ValueError("Versão do cache do glossário incompatível")
+        store = cls(GlossaryEntry.from_row(row) for row in data["rows"])
+        for key, symbol in data.get("rendered", {}).items():
+            store.set_rendered(key, symbol)
+        return store
+
+    def save(self, file_path):
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path, "r", encoding="utf-8") as f:
+            return cls.from_json(json.load(f))
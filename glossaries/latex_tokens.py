@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   latex_tokens.py
+@Time    :   2026/10/18 11:20:37
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Small brace-aware LaTeX tokenizer shared by the glossary
+             compiler and the macro expander.
+"""
+
+import re
+
+COMMAND = "command"
+BEGIN_GROUP = "begin_group"
+END_GROUP = "end_group"
+COMMENT = "comment"
+TEXT = "text"
+
+TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<command>\\(?:[A-Za-z]+|.))  # control word ou control symbol
+    |(?P<begin_group>\{)
+    |(?P<end_group>\})
+    |(?P<comment>%[^\n]*)
+    |(?P<text>[^\\{}%]+)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# A LaTeX control word. The letters are taken greedily, so the match is
+# always the longest command name; (?!\w) keeps the old \b behaviour of not
+# touching \alpha_x or \alpha1.
+CONTROL_WORD_PATTERN = re.compile(r"\\([A-Za-z]+)(?!\w)")
+# Incomplete control word at the end of a chunk
+PARTIAL_CONTROL_WORD = re.compile(r"\\[A-Za-z]*\Z")
+
+
+class LatexBraceError(ValueError):
+    """Unbalanced braces, with the file and line where they were found."""
+
+    def __init__(self, message, source=None, line=None, column=None):
+        self.source = source
+        self.line = line
+        self.column = column
+        where = ":".join(str(i) for i in (source, line, column) if i is not None)
+        super().__init__(where + ": " + message if where else message)
+
+
+def position(text, offset, first_line=1):
+    """Line and column (both from 1) of ``offset`` in ``text``."""
+    line = text.count("\n", 0, offset)
+    column = offset - (text.rfind("\n", 0, offset) + 1) + 1
+    return first_line + line, column
+
+
+def brace_error(message, text, offset, source=None, first_line=1):
+    line, column = position(text, offset, first_line)
+    return LatexBraceError(message, source, line, column)
+
+
+def tokenize(text):
+    """Yield (kind, value, offset) for every token of ``text``."""
+    for match in TOKEN_PATTERN.finditer(text):
+        yield match.lastgroup, match.group(), match.start()
+
+
+def match_braces(text, source=None, first_line=1, command=None):
+    """
+    Return {offset of "{": offset of the matching "}"} for the whole text in
+    one pass. Braces in comments and escaped braces are ignored.
+
+    With ``command``, also return the offsets of the ``\\command`` tokens
+    found outside comments.
+    """
+    pairs = {}
+    stack = []
+    commands = []
+    token = None if command is None else "\\" + command
+    for kind, value, offset in tokenize(text):
+        if kind == BEGIN_GROUP:
+            stack.append(offset)
+        elif kind == END_GROUP:
+            if not stack:
+                raise brace_error("chave '}' sem abertura", text, offset, source, first_line)
+            pairs[stack.pop()] = offset
+        elif kind == COMMAND and value == token:
+            commands.append(offset)
+    if stack:
+        raise brace_error("chave '{' sem fechamento", text, stack[-1], source, first_line)
+    return pairs if command is None else (pairs, commands)
+
+
+def iter_commands_with_groups(text, command, n_groups, source=None):
+    """
+    Yield (arguments, offset) for every ``\\command{...}{...}`` of ``text``.
+
+    The first group must follow the command immediately and the next ones may
+    be separated by white space (as \\newglossaryentry{key}\\n{...}).
+    """
+    pairs, commands = match_braces(text, source, command=command)
+    for start in commands:
+        arguments = []
+        cursor = start + len(command) + 1
+        while len(arguments) < n_groups:
+            if arguments:
+                while cursor < len(text) and text[cursor].isspace():
+                    cursor += 1
+            if cursor not in pairs:
+                break
+            arguments.append(text[cursor + 1: pairs[cursor]])
+            cursor = pairs[cursor] + 1
+        if len(arguments) == n_groups:
+            yield arguments, start
+
+
+def strip_wrappers(text, wrappers=("ensuremath",), source=None, first_line=1):
+    """
+    Remove the ``\\wrapper{...}`` commands, keeping their contents, in one
+    linear pass with a stack (nested wrappers included).
+    """
+    out = []
+    stack = []
+    strip_next = False
+    for kind, value, offset in tokenize(text):
+        if kind == COMMAND and value[1:] in wrappers and text.startswith("{", offset + len(value)):
+            strip_next = True
+            continue
+        if kind == BEGIN_GROUP:
+            stack.append((strip_next, offset))
+            if strip_next:
+                strip_next = False
+                continue
+        elif kind == END_GROUP:
+            if not stack:
+                raise brace_error("chave '}' sem abertura", text, offset, source, first_line)
+            if stack.pop()[0]:
+                continue
+        out.append(value)
+    if stack:
+        raise brace_error("chave '{' sem fechamento", text, stack[-1][1], source, first_line)
+    return "".join(out)
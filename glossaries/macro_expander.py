@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   macro_expander.py
+@Time    :   2026/10/18 10:02:11
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Single pass expansion of \\newcommand definitions, resolved
+             to a fixed point over their dependency graph.
+"""
+
+from latex_tokens import CONTROL_WORD_PATTERN, PARTIAL_CONTROL_WORD
+
+COMMAND_PATTERN = CONTROL_WORD_PATTERN
+CHUNK_SIZE = 1 << 16
+
+
+class MacroCycleError(ValueError):
+    """A definition depends on itself, directly or through other definitions."""
+
+    def __init__(self, cycle):
+        self.cycle = cycle
+        super().__init__(
+            "Definição cíclica: " + " -> ".join(str(node) for node in cycle)
+        )
+
+
+def command_name(match):
+    return match.group(1)
+
+
+class MacroExpander:
+    """
+    Replace every ``\\name`` of ``definitions`` by its fully expanded value in
+    one scan.
+
+    The text is scanned once with a single pattern for any control word and
+    each match is looked up in the definitions dict, so the cost is linear in
+    the size of the text regardless of the number of macros. A value that uses
+    other definitions is expanded recursively the first time it is needed and
+    memoized, so every definition is expanded only once.
+
+    ``pattern`` and ``node_of`` allow other reference syntaxes: ``node_of``
+    maps a match of ``pattern`` to a key of ``definitions``, e.g. the
+    ``\\glsentrysymbol{key}`` references of the glossaries.
+    """
+
+    def __init__(self, definitions, pattern=COMMAND_PATTERN, node_of=command_name):
+        self.definitions = dict(definitions)
+        self.pattern = pattern
+        self.node_of = node_of
+        self._resolved = {}
+        self._visiting = {}
+
+    def resolve(self, node):
+        """Return the fully expanded value of the definition ``node``."""
+        if node in self._resolved:
+            return self._resolved[node]
+        if node in self._visiting:
+            path = list(self._visiting)
+            raise MacroCycleError(path[path.index(node):] + [node])
+        self._visiting[node] = None
+        try:
+            value = self.pattern.sub(self._replace, self.definitions[node])
+        finally:
+            del self._visiting[node]
+        self._resolved[node] = value
+        return value
+
+    def resolve_all(self):
+        """Expand every definition, raising MacroCycleError on the first cycle."""
+        return {node: self.resolve(node) for node in self.definitions}
+
+    def _replace(self, match):
+        node = self.node_of(match)
+        if self.definitions.get(node) is None:
+            return match.group(0)
+        return self.resolve(node)
+
+    def expand(self, text):
+        return self.pattern.sub(self._replace, text)
+
+    def expand_lines(self, lines):
+        """Expand an iterable of lines lazily (commands never span lines)."""
+        for line in lines:
+            yield self.expand(line)
+
+    def expand_chunks(self, chunks):
+        """
+        Expand an iterable of arbitrary text chunks lazily. A control word cut
+        by the chunk boundary is carried over to the next chunk.
+        """
+        carry = ""
+        for chunk in chunks:
+            text = carry + chunk
+            partial = PARTIAL_CONTROL_WORD.search(text)
+            if partial:
+                text, carry = text[: partial.start()], text[partial.start():]
+            else:
+                carry = ""
+            if text:
+                yield self.expand(text)
+        if carry:
+            yield self.expand(carry)
+
+    def expand_file(self, source, target, chunk_size=CHUNK_SIZE):
+        """Expand the file ``source`` into ``target`` without loading it whole."""
+        with open(source, "r", encoding="utf-8") as fin, open(
+            target, "w", encoding="utf-8"
+        ) as fout:
+            chunks = iter(lambda: fin.read(chunk_size), "")
+            for text in self.expand_chunks(chunks):
+                fout.write(text)
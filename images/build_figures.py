@@ -0,0 +1,311 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   build_figures.py
+@Time    :   2026/10/18 20:21:37
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Build of the figures of images/*.py: the inputs (script, data,
+             style, repo modules) and outputs of every script are found in
+             its source, only the stale ones run, in a pool with Agg.
+"""
+
+import argparse
+import ast
+import concurrent.futures
+import hashlib
+import json
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+IMAGES_DIR = os.path.join(ROOT_DIR, "images")
+# Manifest with the hashes of the inputs and outputs of the last build. Bump
+# the version when the dependency discovery changes.
+CACHE_FILE = os.path.join(IMAGES_DIR, ".figure_cache.json")
+CACHE_VERSION = 1
+INPUT_EXTENSIONS = (".csv", ".mplstyle", ".json", ".npy", ".npz", ".hdf5", ".h5", ".txt", ".dat")
+SAVE_FUNCTIONS = ("savefig", "imsave")
+# Build tools living next to the figures
+TOOLS = ("build_figures.py", "render_server.py")
+
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from python.linearization_of_model.tracing import span  # noqa: E402
+
+
+def file_hash(file_path):
+    try:
+        with open(file_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _resolve_path(name, script_dir):
+    """Path of a string literal naming a file: relative to the root (the cwd of the build) or the script."""
+    for base in (ROOT_DIR, script_dir):
+        path = os.path.normpath(os.path.join(base, name))
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _module_path(module, package_dir=None, level=0):
+    """File of a repo module (absolute name or relative import), None outside the repo."""
+    if level:
+        base = package_dir
+        for _ in range(level - 1):
+            base = os.path.dirname(base)
+    else:
+        base = ROOT_DIR
+    stem = os.path.join(base, *module.split(".")) if module else base
+    for path in (stem + ".py", os.path.join(stem, "__init__.py")):
+        if os.path.isfile(path):
+            return os.path.normpath(path)
+    return None
+
+
+def _module_dependencies(tree, file_path):
+    """Repo modules imported by ``tree`` (``from pkg import mod`` resolves the submodule too)."""
+    package_dir = os.path.dirname(file_path)
+    found = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            found += [_module_path(alias.name) for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            found.append(_module_path(node.module or "", package_dir, node.level))
+            prefix = (node.module + ".") if node.module else ""
+            found += [_module_path(prefix + alias.name, package_dir, node.level) for alias in node.names]
+    return [path for path in found if path is not None and path != file_path]
+
+
+class Figure:
+    """
+    A figure script with its dependencies read from the source: string
+    literals naming existing data/style files are inputs, string arguments of
+    ``savefig`` are outputs and the repo modules it imports (recursively)
+    are inputs too.
+    """
+
+    def __init__(self, script):
+        self.script = os.path.abspath(script)
+        self.name = os.path.splitext(os.path.basename(script))[0]
+        with open(self.script, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), self.script)
+        script_dir = os.path.dirname(self.script)
+        inputs, outputs = [self.script], []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Call) and _call_name(node) in SAVE_FUNCTIONS:
+                if node.args and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str):
+                    outputs.append(os.path.normpath(os.path.join(ROOT_DIR, node.args[0].value)))
+            elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+                if node.value.endswith(INPUT_EXTENSIONS):
+                    path = _resolve_path(node.value, script_dir)
+                    if path is not None:
+                        inputs.append(path)
+        pending = _module_dependencies(tree, self.script)
+        while pending:
+            module = pending.pop()
+            if module in inputs:
+                continue
+            inputs.append(module)
+            with open(module, "r", encoding="utf-8") as f:
+                pending += _module_dependencies(ast.parse(f.read(), module), module)
+        self.inputs = sorted(set(inputs))
+        self.outputs = sorted(set(outputs))
+
+    def input_hashes(self):
+        return {os.path.relpath(path, ROOT_DIR): file_hash(path) for path in self.inputs}
+
+    def is_stale(self, manifest):
+        """True when an input or output changed since the build recorded in ``manifest``."""
+        cached = manifest.get(self.name)
+        if cached is None or cached["inputs"] != self.input_hashes():
+            return True
+        return any(
+            file_hash(path) is None or file_hash(path) != cached["outputs"].get(os.path.relpath(path, ROOT_DIR))
+            for path in self.outputs
+        )
+
+
+def _call_name(node):
+    func = node.func
+    return func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+
+
+def find_figures(images_dir=IMAGES_DIR):
+    """
+    Figure scripts of ``images_dir``: the .py files importing matplotlib
+    that save a figure (helper modules as geometry.py and the TOOLS are not).
+    """
+    figures = []
+    for name in sorted(os.listdir(images_dir)):
+        path = os.path.join(images_dir, name)
+        if not name.endswith(".py") or name in TOOLS:
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            if "matplotlib" not in f.read():
+                continue
+        figure = Figure(path)
+        if figure.outputs:
+            figures.append(figure)
+    return figures
+
+
+def load_manifest(cache_file=CACHE_FILE):
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == CACHE_VERSION:
+            return manifest["figures"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return {}
+
+
+def save_manifest(figures, cache_file=CACHE_FILE):
+    with open(cache_file, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "figures": figures}, f, indent=1, sort_keys=True)
+
+
+def _init_worker():
+    os.environ["MPLBACKEND"] = "Agg"
+    import matplotlib
+
+    matplotlib.use("Agg")
+    os.chdir(ROOT_DIR)
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+
+
+def render(script):
+    """Run ``script`` as __main__ from the root; returns (seconds, error or None)."""
+    import runpy
+
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    error = None
+    with span("figure " + os.path.basename(script), script=os.path.relpath(script, ROOT_DIR)) as stage:
+        try:
+            runpy.run_path(script, run_name="__main__")
+        except BaseException as err:  # SystemExit included: one figure never stops the build
+            error = "%s: %s" % (type(err).__name__, err)
+            stage.set(error=error)
+        finally:
+            plt.close("all")
+            matplotlib.rcdefaults()
+    return time.perf_counter() - start, error
+
+
+def _render_on_server(script):
+    if IMAGES_DIR not in sys.path:
+        sys.path.insert(0, IMAGES_DIR)
+    import render_server
+
+    # timing only: the memory is that of the server process
+    with span("figure " + os.path.basename(script), "server", script=os.path.relpath(script, ROOT_DIR)) as stage:
+        result = render_server.render(script)
+        stage.set(error=result["error"])
+    return result["seconds"], result["error"]
+
+
+def _render_all(stale, processes, server):
+    """Yield (figure, seconds, error) as the renders finish."""
+    if server:
+        for figure in stale:
+            yield (figure,) + _render_on_server(figure.script)
+        return
+    workers = processes or min(os.cpu_count() or 1, len(stale))
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+        futures = {pool.submit(render, figure.script): figure for figure in stale}
+        for future in concurrent.futures.as_completed(futures):
+            yield (futures[future],) + future.result()
+
+
+def build(figures=None, force=False, processes=None, cache_file=CACHE_FILE, server=False):
+    """
+    Render the stale ``figures`` (all of images/ by default) and update the
+    manifest. With ``server`` the warm worker of render_server.py renders
+    them one after the other instead of a fresh pool. Returns {name: error
+    or None} of the figures that ran.
+    """
+    figures = find_figures() if figures is None else figures
+    manifest = load_manifest(cache_file)
+    stale = [figure for figure in figures if force or figure.is_stale(manifest)]
+    results = {}
+    if stale:
+        with span("figures", children=True, figures=[figure.name for figure in stale], server=server):
+            for figure, seconds, error in _render_all(stale, processes, server):
+                missing = [os.path.relpath(p, ROOT_DIR) for p in figure.outputs if not os.path.isfile(p)]
+                if error is None and missing:
+                    error = "saídas não geradas: %s" % ", ".join(missing)
+                results[figure.name] = error
+                print("%-24s %6.2f s  %s" % (figure.name, seconds, error or "ok"))
+                if error is None:
+                    manifest[figure.name] = {
+                        "inputs": figure.input_hashes(),
+                        "outputs": {os.path.relpath(p, ROOT_DIR): file_hash(p) for p in figure.outputs},
+                    }
+                else:
+                    manifest.pop(figure.name, None)
+        save_manifest(manifest, cache_file)
+    return results
+
+
+def record(figures=None, cache_file=CACHE_FILE):
+    """
+    Mark the figures whose outputs all exist as up to date (e.g. the
+    committed PDFs of a fresh clone) without rendering them. Returns their
+    names.
+    """
+    figures = find_figures() if figures is None else figures
+    manifest = load_manifest(cache_file)
+    recorded = []
+    for figure in figures:
+        if figure.outputs and all(os.path.isfile(p) for p in figure.outputs):
+            manifest[figure.name] = {
+                "inputs": figure.input_hashes(),
+                "outputs": {os.path.relpath(p, ROOT_DIR): file_hash(p) for p in figure.outputs},
+            }
+            recorded.append(figure.name)
+    save_manifest(manifest, cache_file)
+    return recorded
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the stale figures of images/*.py.")
+    parser.add_argument("figures", nargs="*", help="script names (default: every figure)")
+    parser.add_argument("-f", "--force", action="store_true", help="ignore the cache and render every figure")
+    parser.add_argument("-j", "--processes", type=int, default=None)
+    parser.add_argument("-s", "--server", action="store_true", help="render on the warm worker (render_server.py)")
+    parser.add_argument("-l", "--list", action="store_true", help="show the dependencies and the state")
+    parser.add_argument("--record", action="store_true", help="mark the existing outputs as up to date")
+    args = parser.parse_args()
+
+    figures = find_figures()
+    if args.figures:
+        wanted = {os.path.splitext(os.path.basename(name))[0] for name in args.figures}
+        figures = [figure for figure in figures if figure.name in wanted]
+    if args.list:
+        manifest = load_manifest()
+        for figure in figures:
+            print("%s (%s)" % (figure.name, "stale" if figure.is_stale(manifest) else "up to date"))
+            for path in figure.inputs:
+                print("  < " + os.path.relpath(path, ROOT_DIR))
+            for path in figure.outputs:
+                print("  > " + os.path.relpath(path, ROOT_DIR))
+        raise SystemExit(0)
+    if args.record:
+        print("Recorded: " + ", ".join(record(figures)))
+        raise SystemExit(0)
+    results = build(figures, force=args.force, processes=args.processes, server=args.server)
+    if not results:
+        print("Figures up to date.")
+    failed = [name for name, error in results.items() if error]
+    if failed:
+        raise SystemExit("Falha ao gerar: " + ", ".join(failed))
@@ -14,6 +14,8 @@ import numpy as np
 from scipy.spatial.transform import Rotation as R
 from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 
+from images.geometry import Scene
+
 plt.style.use("eahc.mplstyle")
 
 my_colors = plt.rcParams['axes.prop_cycle'].by_key()['color']
@@ -35,15 +37,9 @@ def draw_coordinate_system(ax, position, attitude, length=1.0,color='black',syst
     - attitude: A 3x3 rotation matrix (numpy array) representing the orientation.
     - length: The length of the axes.
     """
-    # Define the standard basis vectors
-    x_axis = np.array([length, 0, 0])
-    y_axis = np.array([0, length, 0])
-    z_axis = np.array([0, 0, length])
-
-    # Rotate the axes according to the attitude matrix
-    x_axis_rotated = attitude.dot(x_axis)
-    y_axis_rotated = attitude.dot(y_axis)
-    z_axis_rotated = attitude.dot(z_axis)
+    # The rotated axes are the columns of the attitude
+    position = np.asarray(position, dtype=float)
+    x_axis_rotated, y_axis_rotated, z_axis_rotated = (np.asarray(attitude) * length).T
     print(r"$\mathbf{x}_{" + system + "}$"+"\t",r"$\mathbf{y}_{"+system+"}$",r"$\mathbf{z}_{"+system+"}$")
     # Draw the axes using quiver
     if 'x' in draw_labels:
@@ -58,71 +54,63 @@ def draw_coordinate_system(ax, position, attitude, length=1.0,color='black',syst
         ax.text(*(position + z_axis_rotated), r"$\mathbf{z}_{"+system+"}$", color=color)
 
 
-def draw_cylinder(ax, position, attitude, radius, height, color="cyan", alpha=0.5, stage_name=""):
+def draw_cylinder(ax, points, color="cyan", alpha=0.5, stage_name=""):
     """
     Draws a cylinder in a 3D plot.
 
     Parameters:
     - ax: Matplotlib 3D axis object.
-    - position: A 3-element list or numpy array for the cylinder's base center.
-    - attitude: A 3x3 rotation matrix (numpy array) for the cylinder's orientation.
-    - radius: The radius of the cylinder.
-    - height: The height of the cylinder.
+    - points: The posed side of the cylinder, (3, 2, n) (see Scene.part_points).
     - color: The color of the cylinder.
     """
-    # Create the points for the cylinder sides
-    u = np.linspace(0, 2 *np.pi, 50)  # Azimuthal angle
-    v = np.linspace(0, height, 2)  # Height
-    u, v = np.meshgrid(u, v)
-
-    x = -v
-    y = radius * np.sin(u)
-    z = radius * np.cos(u)
-
-    # Stack the coordinates for easier rotation
-    points = np.stack([x.flatten(), y.flatten(), z.flatten()])
-
-    # Rotate and translate the points
-    rotated_points = attitude.dot(points)
-    translated_points = rotated_points + np.array(position).reshape(3, 1)
-
-    # Reshape for plotting
-    x_t = translated_points[0, :].reshape(x.shape)
-    y_t = translated_points[1, :].reshape(y.shape)
-    z_t = translated_points[2, :].reshape(z.shape)
-
     # Plot the cylinder surface
-    ax.plot_surface(x_t, y_t, z_t, color=color, alpha=alpha,label=stage_name)
+    ax.plot_surface(*points, color=color, alpha=alpha,label=stage_name)
     ax.legend()
-    # # Create and plot the bottom and top caps
-    # for h in [0, height]:
-    #     cap_z = np.full(u[0].shape, h)
-    #     cap_points = np.stack([x[0], y[0], cap_z])
-    #     rotated_cap = attitude.dot(cap_points)
-    #     translated_cap = rotated_cap + np.array(position).reshape(3, 1)
 
-    # ax.plot(translated_cap[0], translated_cap[1], translated_cap[2], color="black")
 
-def draw_triangle(ax, r, attitude, color='yellow', alpha=0.7):
+def draw_triangle(ax, points, color='yellow', alpha=0.7):
     """
     Draws a 3D triangle.
 
     Parameters:
     - ax: Matplotlib 3D axis object.
-    - vertices: A list of three 3-element lists or numpy arrays representing the triangle's vertices.
+    - points: The posed vertices of the fin, (3, 3) (see Scene.part_points).
     - color: The color of the triangle.
     - alpha: The transparency of the triangle (0 to 1).
     """
-    p1 = np.array(r)
-    p2 = p1 + attitude @ np.array([-fin["c"], 0, 0])
-    p3 = p1 + attitude @ np.array([-fin["c"], fin["b"], 0])
-    p2_rotated = p2
-    p3_rotated = p3
-    vertices = np.array([p1, p2_rotated, p3_rotated])
-    triangle = Poly3DCollection([vertices], color=color, alpha=alpha)
+    triangle = Poly3DCollection([points.T], color=color, alpha=alpha)
     ax.add_collection3d(triangle)
 
 
+def vehicle_scene():
+    """The three stages and the two fins in vehicle axes, as one Scene."""
+    scene = Scene()
+    stages = [
+        ([0, 0, 0], stage_s30, {"color": my_colors[0], "alpha": .25, "stage_name": "S30 (top)"}),
+        ([-stage_s30["height"], 0, 0], stage_s30, {"color": my_colors[1], "alpha": 0.1, "stage_name": "S30 (middle)"}),
+        ([-stage_s30["height"]*2, 0, 0], stage_s31, {"color": my_colors[2], "alpha": 0.1, "stage_name": "S31 (bottom)"}),
+    ]
+    for position, stage, style in stages:
+        scene.add_cylinder(position, np.eye(3), stage["radius"], stage["height"], **style)
+    fin_x = -(stage_s30["height"] * 2 + stage_s31["height"] - fin["c"])
+    # left fin, and the right one rolled by 180 deg
+    for side, roll in ((1, 0), (-1, 180)):
+        attitude = R.from_euler("zyx", [0, 0, roll], degrees=True).as_matrix()
+        scene.add_fin([fin_x, side * stage_s30["radius"], 0], attitude, fin["c"], fin["b"], color=my_colors[0], alpha=0.7)
+    return scene
+
+
+def draw_vehicle(ax, scene, attitude, position):
+    """Pose every part of ``scene`` with one product and draw it."""
+    vertices = scene.pose(attitude, position)
+    for index, part in enumerate(scene.parts):
+        points = scene.part_points(vertices, index)
+        if part["kind"] == "cylinder":
+            draw_cylinder(ax, points, **part["style"])
+        else:
+            draw_triangle(ax, points, **part["style"])
+
+
 def draw_vector(ax, start_point, end_point, vector_name, color="black",y_offset=0):
     """
     Draws a 3D vector and adds a label parallel to it.
@@ -190,66 +178,14 @@ if __name__ == "__main__":
     # --- Draw the cylinder and its local coordinate system ---
     draw_coordinate_system(ax, stage_1_position, stage_1_attitude, length=2,system=r"\mathrm{v}", color=my_colors[0],draw_labels='xyz')
     cg_position = [(-(stage_s31["height"]+2.0*stage_s30["height"])/2.),0,0]
-    ## Draw top stage
     draw_coordinate_system( ax, cg_position, stage_1_attitude, length=1., system=r"\mathrm{b}", color=my_colors[1], draw_labels='yz')
-    draw_cylinder(
-        ax,
-        stage_1_position,
-        stage_1_attitude,
-        stage_s30["radius"],
-        stage_s30["height"],
-        color=my_colors[0],
-        alpha=.25,
-        stage_name="S30 (top)"
-    )
-    ## draw stage 2
-    stage_2_position = [-stage_s30["height"], 0, 0]
-    # draw_coordinate_system(ax, stage_2_position, stage_1_attitude, length=2.5)
-    draw_cylinder(
-        ax,
-        stage_2_position,
-        stage_1_attitude,
-        stage_s30["radius"],
-        stage_s30["height"],
-        color=my_colors[1],
-        alpha=0.1,
-        stage_name="S30 (middle)",
-    )
-
-    ## draw stage 3
-    stage_3_position = [-stage_s30["height"]*2, 0, 0]
-    # draw_coordinate_system(ax, stage_3_position, stage_1_attitude, length=2.5)
-    draw_cylinder(
-        ax,
-        stage_3_position,
-        stage_1_attitude,
-        stage_s31["radius"],
-        stage_s31["height"],
-        color=my_colors[2],
-        alpha=0.1,
-        stage_name="S31 (bottom)",
-    )
-
-    # # --- Define the vertices of the triangle ---
+    ## draw the stages and the fins
+    draw_vehicle(ax, vehicle_scene(), stage_1_attitude, stage_1_position)
     fin1_position = [
         -(stage_s30["height"] * 2 + stage_s31["height"] - fin["c"]),
         stage_s30["radius"],
         0,
-    ]  
-    rotation_angles_deg = [0, 0, 0]
-    rotation = R.from_euler("zyx", rotation_angles_deg, degrees=True)
-    # # --- Draw the triangle left---
-    draw_triangle(ax, fin1_position, rotation.as_matrix(), color=my_colors[0], alpha=0.7)
-
-    fin2_position = [
-        -(stage_s30["height"] * 2 + stage_s31["height"] - fin["c"]),
-        -stage_s30["radius"],
-        0,
-    ]  
-    rotation_angles_deg = [0, 0, 180]
-    rotation = R.from_euler("zyx", rotation_angles_deg, degrees=True)
-    # --- Draw the triangle ---
-    draw_triangle(ax, fin2_position, rotation.as_matrix(), color=my_colors[0], alpha=0.7)
+    ]
 
     # vectors
     vector_start_1 = [0, 0, 0]
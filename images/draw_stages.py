@@ -211,5 +211,5 @@ draw_stage(
 # plt.tight_layout()
 plt.grid()
 # Mostrar ou salvar
-# plt.savefig("rocket_schematic.png", dpi=300, bbox_inches='tight')
-plt.show()
+plt.savefig("images/rocket_schematic.pdf", bbox_inches="tight", transparent=True)
+plt.close(fig="rocket_schematic")
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   geometry.py
+@Time    :   2026/10/18 21:34:06
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Geometry of the 3-D vehicle drawings: cached unit primitives
+             (cylinder, fin, axes triad), a scene with every vertex in one
+             array transformed by one matrix product per frame, and the
+             animation of attitude histories.
+"""
+
+import functools
+
+import numpy as np
+
+CYLINDER_POINTS = 50
+FRAME_CHUNK = 256
+
+
+@functools.lru_cache(maxsize=None)
+def unit_cylinder(n=CYLINDER_POINTS):
+    """
+    Side of the cylinder of unit radius and height ``(3, 2, n)``: the base
+    centred at the origin, the axis along -x (as the stages of the drawings).
+    """
+    u, v = np.meshgrid(np.linspace(0, 2 * np.pi, n), np.linspace(0, 1, 2))
+    points = np.stack([-v, np.sin(u), np.cos(u)])
+    points.flags.writeable = False
+    return points
+
+
+@functools.lru_cache(maxsize=None)
+def unit_fin():
+    """Vertices ``(3, 3)`` of the fin of unit chord (along -x) and span (along y)."""
+    points = np.array([[0.0, -1.0, -1.0], [0.0, 0.0, 1.0], [0.0, 0.0, 0.0]])
+    points.flags.writeable = False
+    return points
+
+
+@functools.lru_cache(maxsize=None)
+def unit_triad():
+    """Origin and the tips of the unit axes x, y, z as columns ``(3, 4)``."""
+    points = np.hstack([np.zeros((3, 1)), np.eye(3)])
+    points.flags.writeable = False
+    return points
+
+
+def place(points, position, attitude, scale=(1.0, 1.0, 1.0)):
+    """``position + attitude @ diag(scale) @ points`` for points ``(3, ...)``."""
+    points = np.asarray(points)
+    flat = points.reshape(3, -1)
+    matrix = np.asarray(attitude) * np.asarray(scale, dtype=float)
+    return (matrix @ flat + np.asarray(position, dtype=float).reshape(3, 1)).reshape(points.shape)
+
+
+def euler_to_matrix(phi, theta, psi):
+    """
+    Body to NED rotation matrices ``(..., 3, 3)`` of the Euler angles (rad,
+    intrinsic sequence z-y-x), the same as ``Rotation.from_euler("ZYX",
+    [psi, theta, phi]).as_matrix()`` for whole histories at once.
+    """
+    phi, theta, psi = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (phi, theta, psi)))
+    cf, sf = np.cos(phi), np.sin(phi)
+    ct, st = np.cos(theta), np.sin(theta)
+    cp, sp = np.cos(psi), np.sin(psi)
+    return np.stack([
+        np.stack([ct * cp, sf * st * cp - cf * sp, cf * st * cp + sf * sp], -1),
+        np.stack([ct * sp, sf * st * sp + cf * cp, cf * st * sp - sf * cp], -1),
+        np.stack([-st, sf * ct, cf * ct], -1),
+    ], -2)
+
+
+class Scene:
+    """
+    The parts of a vehicle drawing in body axes. The vertices of every part
+    are kept in one ``(3, N)`` array, so posing the whole vehicle for one or
+    many frames is one matrix product (``pose``); ``draw`` creates the
+    artists once and ``update`` moves them to a new pose.
+    """
+
+    def __init__(self):
+        self.parts = []
+        self._blocks = []
+        self._vertices = None
+
+    def _add(self, kind, points, style):
+        start = sum(block.shape[1] for block in self._blocks)
+        self._blocks.append(points.reshape(3, -1))
+        self.parts.append({"kind": kind, "slice": slice(start, start + points[0].size),
+                           "shape": points.shape[1:], "style": style})
+        self._vertices = None
+        return self
+
+    def add_cylinder(self, position, attitude, radius, height, **style):
+        return self._add("cylinder", place(unit_cylinder(), position, attitude, (height, radius, radius)), style)
+
+    def add_fin(self, position, attitude, c, b, **style):
+        return self._add("fin", place(unit_fin(), position, attitude, (c, b, 1.0)), style)
+
+    def add_triad(self, position, attitude, length=1.0, labels=None, **style):
+        """Axes triad; ``labels`` are the texts of x, y and z (None for no text)."""
+        return self._add("triad", place(unit_triad(), position, attitude, (length,) * 3), dict(style, labels=labels))
+
+    @property
+    def vertices(self):
+        if self._vertices is None:
+            self._vertices = np.hstack(self._blocks) if self._blocks else np.zeros((3, 0))
+        return self._vertices
+
+    def pose(self, attitude=None, position=None):
+        """
+        Vertices ``(..., 3, N)`` of the vehicle at the attitudes ``(..., 3, 3)``
+        (body to drawing axes) and positions ``(..., 3)``; many frames in one
+        product.
+        """
+        vertices = self.vertices
+        if attitude is not None:
+            vertices = np.matmul(attitude, vertices)
+        if position is not None:
+            vertices = vertices + np.asarray(position, dtype=float)[..., :, None]
+        return vertices
+
+    def part_points(self, vertices, index):
+        """Vertices of part ``index`` in the pose ``vertices`` ``(3, N)``, shaped as its primitive."""
+        return self._points(self.parts[index], vertices)
+
+    @staticmethod
+    def _points(part, vertices):
+        return vertices[:, part["slice"]].reshape((3,) + part["shape"])
+
+    def _geometry(self, part, vertices):
+        points = self._points(part, vertices)
+        if part["kind"] == "cylinder":
+            # side quads between consecutive meridians
+            bottom, top = points[:, 0], points[:, 1]
+            quads = np.stack([bottom[:, :-1], bottom[:, 1:], top[:, 1:], top[:, :-1]], axis=-1)
+            return quads.transpose(1, 2, 0)
+        if part["kind"] == "fin":
+            return points.T[None]
+        return np.stack([np.repeat(points[:, :1], 3, axis=1), points[:, 1:]], axis=-1).transpose(1, 2, 0)
+
+    def draw(self, ax, vertices=None):
+        """Artists (one per part) of the pose ``vertices`` (default: body axes) on a 3-D ``ax``."""
+        from mpl_toolkits.mplot3d.art3d import Line3DCollection, Poly3DCollection
+
+        vertices = self.vertices if vertices is None else vertices
+        artists = []
+        for part in self.parts:
+            style = dict(part["style"])
+            geometry = self._geometry(part, vertices)
+            if part["kind"] == "triad":
+                labels = style.pop("labels")
+                lines = Line3DCollection(geometry, **style)
+                ax.add_collection3d(lines)
+                texts = []
+                for label, tip in zip(labels or (), geometry[:, 1]):
+                    texts.append(ax.text(*tip, label, color=style.get("color")))
+                artists.append((lines, texts))
+            else:
+                collection = Poly3DCollection(geometry, **style)
+                ax.add_collection3d(collection)
+                artists.append((collection, []))
+        return artists
+
+    def update(self, artists, vertices):
+        """Move the ``artists`` of ``draw`` to the pose ``vertices`` ``(3, N)``."""
+        for part, (artist, texts) in zip(self.parts, artists):
+            geometry = self._geometry(part, vertices)
+            if part["kind"] == "triad":
+                artist.set_segments(geometry)
+                for text, tip in zip(texts, geometry[:, 1]):
+                    text.set_position_3d(tip)
+            else:
+                artist.set_verts(geometry)
+        return [a for artist, texts in artists for a in [artist] + texts]
+
+
+def frames(scene, attitudes, positions=None, chunk=FRAME_CHUNK):
+    """Poses of an attitude history ``(F, 3, 3)``, computed ``chunk`` frames per product."""
+    for start in range(0, len(attitudes), chunk):
+        stop = start + chunk
+        block = scene.pose(attitudes[start:stop], None if positions is None else positions[start:stop])
+        yield from block
+
+
+def animate(scene, attitudes, positions=None, file_path=None, fps=30, ax=None, limits=None, **save_kwargs):
+    """
+    Animation of ``scene`` along the attitude history ``(F, 3, 3)`` (see
+    ``euler_to_matrix``) and optional positions ``(F, 3)``. The artists are
+    created once and updated in place; with ``file_path`` the animation is
+    saved (ffmpeg for video, pillow for .gif). Returns the FuncAnimation.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib import animation
+
+    if ax is None:
+        ax = plt.figure().add_subplot(111, projection="3d")
+    artists = scene.draw(ax, scene.pose(attitudes[0], None if positions is None else positions[0]))
+    if limits is None:
+        extent = np.abs(scene.vertices).max() if scene.vertices.size else 1.0
+        limits = [(-extent, extent)] * 3
+    ax.set_xlim(*limits[0])
+    ax.set_ylim(*limits[1])
+    ax.set_zlim(*limits[2])
+    ax.set_aspect("equal")
+    movie = animation.FuncAnimation(
+        ax.figure, lambda vertices: scene.update(artists, vertices),
+        frames=lambda: frames(scene, attitudes, positions), save_count=len(attitudes),
+        interval=1000.0 / fps, blit=False, cache_frame_data=False,
+    )
+    if file_path is not None:
+        writer = "pillow" if file_path.endswith(".gif") else "ffmpeg"
+        movie.save(file_path, writer=writer, fps=fps, **save_kwargs)
+    return movie
@@ -12,6 +12,7 @@ import pandas as pd
 import locale
 import matplotlib.pyplot as plt
 from python.atmosphere1976.atmosphere import Atmosphere1976
+from python.linearization_of_model.atmosphere import get_properties
 # from IPython.core.interactiveshell import InteractiveShell
 # from ipywidgets import interactive, fixed
 # InteractiveShell.ast_node_interactivity = "all"
@@ -25,13 +26,8 @@ FIG_A = (90.0) / 25.4
 atmos_py = Atmosphere1976()
 data = pd.read_csv('images/atmosfera_dados.csv')
 
-# compute with atmos
-atmos_py_data = []
-for i in data["Altitude_km"]:
-   atmos_py_data.append(atmos_py.get_properties(i))
-
-
-atmos_df = pd.DataFrame(atmos_py_data)
+# compute with atmos (all altitudes at once; above 86 km uses atmos_py)
+atmos_df = pd.DataFrame(get_properties(data["Altitude_km"].to_numpy(), upper_model=atmos_py))
 atmos_df.keys()
 
 
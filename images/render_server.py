@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   render_server.py
+@Time    :   2026/10/18 20:58:12
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Long-lived render worker for the figure scripts: matplotlib (Agg),
+             pandas, scipy, mplot3d and the parsed styles stay loaded and the
+             jobs (script + args) arrive over a local socket.
+"""
+
+import argparse
+import os
+import secrets
+import socket
+import subprocess
+import sys
+import time
+from multiprocessing.connection import Client, Listener
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+# Address and key of the running server (written by the server, read by the clients)
+STATE_FILE = os.path.join(ROOT_DIR, "images", ".render_server.json")
+HOST = "127.0.0.1"
+# Unix sockets where available (no TCP handshake/Nagle delay per job), TCP on localhost elsewhere
+FAMILY = "AF_UNIX" if hasattr(socket, "AF_UNIX") and os.name != "nt" else "AF_INET"
+START_TIMEOUT = 30.0
+
+
+class RenderServer:
+    """
+    Runs figure scripts as ``__main__`` in one warm process. After every job
+    the figures are closed and the rcParams go back to the warm state; repo
+    modules whose file changed are dropped from ``sys.modules`` before the
+    next job, so the scripts always see the current code.
+    """
+
+    def __init__(self):
+        os.environ["MPLBACKEND"] = "Agg"
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        import mpl_toolkits.mplot3d  # noqa: F401 (warm import for the 3-D figures)
+        import numpy  # noqa: F401
+        import pandas  # noqa: F401
+        import scipy.spatial.transform  # noqa: F401
+
+        self.matplotlib = matplotlib
+        self.plt = plt
+        self.styles = {}
+        self.saved = []
+        self._patch()
+        self.rc_warm = dict(matplotlib.rcParams)
+        self.modules = self._repo_modules()
+        self._added_path = ROOT_DIR not in sys.path
+        if self._added_path:
+            sys.path.insert(0, ROOT_DIR)
+
+    def _patch(self):
+        """Cache the parsed style files and record the files saved by the scripts."""
+        matplotlib, server = self.matplotlib, self
+        use = matplotlib.style.use
+        savefig = matplotlib.figure.Figure.savefig
+        self._originals = (use, self.plt.style.use, savefig)
+
+        def cached_use(style):
+            if isinstance(style, (str, os.PathLike)) and os.path.isfile(style):
+                path = os.path.abspath(style)
+                key = (path, os.stat(path).st_mtime_ns)
+                if key not in server.styles:
+                    server.styles[key] = matplotlib.rc_params_from_file(path, use_default_template=False)
+                style = server.styles[key]
+            return use(style)
+
+        def recording_savefig(figure, fname, *args, **kwargs):
+            if isinstance(fname, (str, os.PathLike)):
+                server.saved.append(os.path.abspath(fname))
+            return savefig(figure, fname, *args, **kwargs)
+
+        matplotlib.style.use = cached_use
+        self.plt.style.use = cached_use
+        matplotlib.figure.Figure.savefig = recording_savefig
+
+    def close(self):
+        """Undo the patches of ``_patch`` and the sys.path entry (the server shares the process)."""
+        if self._originals is None:
+            return
+        use, plt_use, savefig = self._originals
+        self.matplotlib.style.use = use
+        self.plt.style.use = plt_use
+        self.matplotlib.figure.Figure.savefig = savefig
+        self._originals = None
+        if self._added_path and ROOT_DIR in sys.path:
+            sys.path.remove(ROOT_DIR)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _repo_modules():
+        """{name: mtime} of the loaded modules that live in the repo."""
+        modules = {}
+        for name, module in list(sys.modules.items()):
+            if name in ("__main__", __name__):  # the server itself
+                continue
+            path = getattr(module, "__file__", None)
+            if path and os.path.abspath(path).startswith(ROOT_DIR + os.sep) and os.path.isfile(path):
+                modules[name] = os.stat(path).st_mtime_ns
+        return modules
+
+    def _drop_changed_modules(self):
+        """
+        Evict every repo module when one of them changed: a module that did
+        ``from changed import name`` would keep the old objects otherwise.
+        """
+        current = self._repo_modules()
+        if any(self.modules.get(name) != mtime for name, mtime in current.items()):
+            for name in current:
+                sys.modules.pop(name, None)
+        self.modules = self._repo_modules()
+
+    def render(self, script, args=()):
+        """Run one job; {"outputs", "seconds", "error"}."""
+        import runpy
+
+        start = time.perf_counter()
+        path = os.path.realpath(os.path.join(ROOT_DIR, script))
+        if not path.startswith(os.path.realpath(ROOT_DIR) + os.sep) or not path.endswith(".py"):
+            return {"outputs": [], "seconds": 0.0, "error": "Script fora do repositório: %s" % script}
+        self._drop_changed_modules()
+        self.saved = []
+        argv = sys.argv
+        sys.argv = [script] + list(args)
+        error = None
+        try:
+            os.chdir(ROOT_DIR)
+            runpy.run_path(path, run_name="__main__")
+        except BaseException as err:  # SystemExit included: the server outlives a bad job
+            error = "%s: %s" % (type(err).__name__, err)
+        finally:
+            sys.argv = argv
+            self.plt.close("all")
+            self.matplotlib.rcParams.update(self.rc_warm)
+        self.modules = self._repo_modules()
+        return {"outputs": self.saved, "seconds": time.perf_counter() - start, "error": error}
+
+    def serve(self, state_file=STATE_FILE):
+        """Answer jobs until a "shutdown" request (one at a time: pyplot is not thread safe)."""
+        import json
+
+        authkey = secrets.token_bytes(16)
+        with Listener(None if FAMILY == "AF_UNIX" else (HOST, 0), FAMILY, authkey=authkey) as listener:
+            # the key lets a client run code as this user: readable by the owner only
+            if os.path.exists(state_file):
+                os.remove(state_file)
+            descriptor = os.open(state_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with open(descriptor, "w", encoding="utf-8") as f:
+                json.dump({"address": listener.address, "authkey": authkey.hex(), "pid": os.getpid()}, f)
+            try:
+                while True:
+                    try:
+                        connection = listener.accept()
+                    except OSError:  # wrong key or client gone
+                        continue
+                    with connection:
+                        try:
+                            request = connection.recv()
+                        except EOFError:
+                            continue
+                        if request.get("command") == "shutdown":
+                            connection.send({"error": None})
+                            break
+                        if request.get("command") == "ping":
+                            connection.send({"error": None, "pid": os.getpid()})
+                            continue
+                        connection.send(self.render(request["script"], request.get("args", ())))
+            finally:
+                if os.path.exists(state_file):
+                    os.remove(state_file)
+
+
+def _connect(state_file=STATE_FILE):
+    import json
+
+    with open(state_file, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    address = state["address"] if isinstance(state["address"], str) else tuple(state["address"])
+    return Client(address, authkey=bytes.fromhex(state["authkey"]))
+
+
+def request(message, state_file=STATE_FILE):
+    """Send ``message`` to the running server and return its answer."""
+    with _connect(state_file) as connection:
+        connection.send(message)
+        return connection.recv()
+
+
+def is_running(state_file=STATE_FILE):
+    try:
+        return request({"command": "ping"}, state_file)["error"] is None
+    except (OSError, ValueError, KeyError, EOFError):
+        return False
+
+
+def start(state_file=STATE_FILE, timeout=START_TIMEOUT):
+    """Start a detached server (when none answers) and wait until it is ready."""
+    if is_running(state_file):
+        return
+    if os.path.exists(state_file):
+        os.remove(state_file)
+    kwargs = {"start_new_session": True} if os.name != "nt" else {"creationflags": subprocess.DETACHED_PROCESS}
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "serve", "--state", state_file],
+        cwd=ROOT_DIR, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **kwargs
+    )
+    deadline = time.monotonic() + timeout
+    while not is_running(state_file):
+        if time.monotonic() > deadline:
+            raise TimeoutError("O servidor de figuras não respondeu em %g s" % timeout)
+        time.sleep(0.05)
+
+
+def render(script, args=(), state_file=STATE_FILE, autostart=True):
+    """
+    Render ``script`` (path relative to the repo root) on the warm server,
+    started on demand. Returns {"outputs", "seconds", "error"}.
+    """
+    message = {"command": "render", "script": os.path.relpath(os.path.abspath(script), ROOT_DIR), "args": list(args)}
+    try:
+        return request(message, state_file)
+    except (OSError, ValueError, KeyError):
+        if not autostart:
+            raise
+    start(state_file)
+    return request(message, state_file)
+
+
+def stop(state_file=STATE_FILE):
+    if is_running(state_file):
+        request({"command": "shutdown"}, state_file)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm matplotlib render worker.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="run the server in the foreground")
+    serve.add_argument("--state", default=STATE_FILE)
+    commands.add_parser("start", help="start a detached server")
+    commands.add_parser("stop")
+    commands.add_parser("status")
+    job = commands.add_parser("render", help="render a figure script on the server")
+    job.add_argument("script")
+    job.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        with RenderServer() as server:
+            server.serve(args.state)
+    elif args.command == "start":
+        start()
+    elif args.command == "stop":
+        stop()
+    elif args.command == "status":
+        print("running" if is_running() else "stopped")
+    else:
+        result = render(args.script, args.args)
+        for path in result["outputs"]:
+            print(os.path.relpath(path, os.getcwd()))
+        print("%.3f s" % result["seconds"], file=sys.stderr)
+        if result["error"]:
+            raise SystemExit(result["error"])
@@ -0,0 +1 @@
+"""Numerical tools for the 6-DOF model of the 14x and hxi vehicles."""
@@ -0,0 +1,349 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   aero_data.py
+@Time    :   2026/10/18 14:48:03
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Loader of the vehicle datasets (data/14x, data/hxi) normalized to
+             one schema and cached as memory-mapped columnar .npy files, and
+             the cubic splines of the derivatives vs Mach fitted for every
+             column at once.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+DATA_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data")
+)
+CACHE_DIR = os.path.join(DATA_DIR, ".cache")
+CACHE_VERSION = 1
+# Mach values per gather of the spline coefficients (keeps the temporaries in cache)
+SPLINE_CHUNK = 4096
+
+COEFFICIENTS = "coefficients_alpha_beta_mach"
+DERIVATIVES = "derivatives_vs_mach"
+MASS_PROPERTIES = "mass_properties"
+
+# Grid axes and outputs of the coefficient tables, in this order
+AXES = ["MACH", "ALPHA_DEG", "BETA_DEG", "DELTA_ELEVON_L", "DELTA_ELEVON_R", "DELTA_RUDDER"]
+COEFFICIENT_COLUMNS = ["CA", "CN", "CY", "CLL", "CM", "CLN", "XCP", "ZCP"]
+
+# The _cg_at_* derivative tables use short names for the elevon derivatives
+# (there CLLDR is the right elevon, not the rudder)
+SHORT_ELEVON_NAMES = {
+    "CNDL": "CNDEL",
+    "CNDR": "CNDER",
+    "CMDL": "CMDEL",
+    "CMDR": "CMDER",
+    "CLLDL": "CLLDEL",
+    "CLLDR": "CLLDER",
+    "CHD": "CHDE",
+}
+
+
+# Moment transfer to another CG: (moment, force, displacement, sign) with
+# moment' = moment + sign * force * displacement / reference length, x positive
+# aft and z positive up (as xcg/zcg of mass_properties.csv)
+MOMENT_TRANSFER = [
+    ("CM", "CN", "x", 1.0), ("CM", "CA", "z", -1.0),
+    ("CLN", "CY", "x", 1.0), ("CLL", "CY", "z", -1.0),
+    ("CMA", "CNA", "x", 1.0), ("CMQ", "CNQ", "x", 1.0), ("CMAD", "CNAD", "x", 1.0),
+    ("CMDEL", "CNDEL", "x", 1.0), ("CMDER", "CNDER", "x", 1.0),
+    ("CLNB", "CYB", "x", 1.0), ("CLNP", "CYP", "x", 1.0), ("CLNR", "CYR", "x", 1.0),
+    ("CLNDR", "CYDR", "x", 1.0),
+    ("CLLB", "CYB", "z", -1.0), ("CLLP", "CYP", "z", -1.0), ("CLLR", "CYR", "z", -1.0),
+    ("CLLDR", "CYDR", "z", -1.0),
+]
+
+
+def file_hash(file_path):
+    with open(file_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class ColumnTable:
+    """
+    Named columns stored as the rows of one 2-D array ``data`` of shape
+    ``(len(columns), n_rows)``; every column is a contiguous (memory-mapped)
+    view.
+    """
+
+    def __init__(self, columns, data):
+        self.columns = list(columns)
+        self.data = data
+        self._index = {name: i for i, name in enumerate(self.columns)}
+
+    def __getitem__(self, name):
+        return self.data[self._index[name]]
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __len__(self):
+        return self.data.shape[1]
+
+    def keys(self):
+        return list(self.columns)
+
+    def select(self, names):
+        """2-D array ``(len(names), n_rows)`` with the requested columns."""
+        return self.data[[self._index[name] for name in names]]
+
+    def to_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame(np.asarray(self.data).T, columns=self.columns)
+
+
+def _normalize_coefficients(frame):
+    frame = frame.loc[:, [c for c in frame.columns if not c.startswith("Unnamed")]]
+    for axis in AXES:
+        if axis not in frame:
+            frame[axis] = 0.0
+    missing = [c for c in COEFFICIENT_COLUMNS if c not in frame]
+    if missing:
+        raise ValueError("Colunas ausentes na tabela de coeficientes: %s" % missing)
+    frame = frame[AXES + COEFFICIENT_COLUMNS].astype(float)
+    return frame.sort_values(AXES, kind="mergesort")
+
+
+def _normalize_derivatives(frame):
+    frame = frame.loc[:, [c for c in frame.columns if not c.startswith("Unnamed")]]
+    if "CNDL" in frame:
+        frame = frame.rename(columns=SHORT_ELEVON_NAMES)
+    columns = ["MACH"] + [c for c in frame.columns if c != "MACH"]
+    return frame[columns].astype(float).sort_values("MACH", kind="mergesort")
+
+
+NORMALIZERS = {COEFFICIENTS: _normalize_coefficients, DERIVATIVES: _normalize_derivatives}
+
+
+def csv_path(vehicle, kind, variant=None, data_dir=DATA_DIR):
+    name = kind if variant is None else kind + "_" + variant
+    return os.path.join(data_dir, vehicle, name + ".csv")
+
+
+def list_datasets(data_dir=DATA_DIR):
+    """{vehicle: [variants]} of the coefficient tables (None is the nominal one)."""
+    datasets = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, "*", COEFFICIENTS + "*.csv"))):
+        vehicle = os.path.basename(os.path.dirname(path))
+        stem = os.path.splitext(os.path.basename(path))[0]
+        variant = stem[len(COEFFICIENTS) + 1:] or None
+        datasets.setdefault(vehicle, []).append(variant)
+    return datasets
+
+
+def _write_cache(npy_path, meta_path, array, meta):
+    """
+    Write the .npy and then its sidecar, each to a temporary file in the
+    cache folder renamed over the target: a reader (or a concurrent run)
+    never sees a partial file, and a sidecar always describes a whole .npy.
+    """
+    directory = os.path.dirname(npy_path)
+    os.makedirs(directory, exist_ok=True)
+    for path, write in ((npy_path, lambda f: np.save(f, array)),
+                        (meta_path, lambda f: f.write(json.dumps(meta).encode("utf-8")))):
+        descriptor, temporary = tempfile.mkstemp(prefix=".tmp_", dir=directory)
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                write(f)
+            os.replace(temporary, path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+
+def load_table(vehicle, kind, variant=None, data_dir=DATA_DIR, cache_dir=CACHE_DIR):
+    """
+    Normalized table ``kind`` (COEFFICIENTS or DERIVATIVES) of ``vehicle``.
+
+    The CSV is parsed once and converted to ``cache_dir/<vehicle>/<name>.npy``
+    with a JSON sidecar holding the column names and the CSV hash; later calls
+    memory-map the .npy while the hash still matches.
+    """
+    source = csv_path(vehicle, kind, variant, data_dir)
+    digest = file_hash(source)
+    stem = os.path.splitext(os.path.basename(source))[0]
+    npy_path = os.path.join(cache_dir, vehicle, stem + ".npy")
+    meta_path = os.path.join(cache_dir, vehicle, stem + ".json")
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["version"] == CACHE_VERSION and meta["sha256"] == digest:
+            return ColumnTable(meta["columns"], np.load(npy_path, mmap_mode="r"))
+    except (OSError, ValueError, KeyError):
+        pass
+
+    import pandas as pd
+
+    frame = NORMALIZERS[kind](pd.read_csv(source))
+    _write_cache(npy_path, meta_path, np.ascontiguousarray(frame.to_numpy().T),
+                 {"version": CACHE_VERSION, "sha256": digest, "columns": list(frame.columns)})
+    return ColumnTable(frame.columns, np.load(npy_path, mmap_mode="r"))
+
+
+def load_coefficients(vehicle, variant=None, **kwargs):
+    """Coefficient table with the AXES + COEFFICIENT_COLUMNS schema."""
+    return load_table(vehicle, COEFFICIENTS, variant, **kwargs)
+
+
+def load_derivatives(vehicle, variant=None, **kwargs):
+    """Stability derivatives vs MACH, with the long elevon names."""
+    return load_table(vehicle, DERIVATIVES, variant, **kwargs)
+
+
+class DerivativeSpline:
+    """
+    Cubic splines vs Mach of every column of a derivative table, fitted
+    together: ``coefficients`` is one C-contiguous ``(n - 1, 4, n_columns)``
+    array (the polynomial of each interval, highest power first, for all the
+    columns side by side), so one interval search and one gather evaluate
+    every derivative. Held constant outside the table; repeated Mach rows
+    keep the first one.
+    """
+
+    def __init__(self, columns, breakpoints, coefficients):
+        self.columns = list(columns)
+        self.breakpoints = np.asarray(breakpoints, dtype=float)
+        self.coefficients = np.ascontiguousarray(coefficients)
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self._subsets = {}
+
+    @classmethod
+    def from_table(cls, table, bc_type="not-a-knot"):
+        """Fit the derivative columns (all but MACH) of a ColumnTable."""
+        from scipy.interpolate import CubicSpline
+
+        grid, first = np.unique(np.asarray(table["MACH"]), return_index=True)
+        columns = [name for name in table.keys() if name != "MACH"]
+        spline = CubicSpline(grid, table.select(columns)[:, first].T, axis=0, bc_type=bc_type)
+        return cls(columns, grid, spline.c.transpose(1, 0, 2))
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def keys(self):
+        return list(self.columns)
+
+    def _subset(self, columns):
+        """(rows of the output with data, coefficients of those columns), memoized per ``columns``."""
+        key = tuple(columns)
+        if key not in self._subsets:
+            present = [k for k, name in enumerate(columns) if name in self._index]
+            indices = [self._index[columns[k]] for k in present]
+            coefficients = self.coefficients
+            if indices != list(range(len(self.columns))):
+                coefficients = np.ascontiguousarray(coefficients[:, :, indices])
+            self._subsets[key] = (present, coefficients)
+        return self._subsets[key]
+
+    def __call__(self, mach, columns=None):
+        """
+        ``(len(columns), N)`` array of the ``columns`` (default: all) at the
+        Mach numbers ``mach``; columns absent from the table are zero.
+        """
+        columns = self.columns if columns is None else columns
+        present, coefficients = self._subset(columns)
+        grid = self.breakpoints
+        x = np.clip(np.atleast_1d(np.asarray(mach, dtype=float)), grid[0], grid[-1])
+        out = np.zeros((len(columns), x.size))
+        if present:
+            rows = slice(None) if len(present) == len(columns) else present
+            interval = np.clip(np.searchsorted(grid, x, side="right") - 1, 0, grid.size - 2)
+            offset = x - grid[interval]
+            for start in range(0, x.size, SPLINE_CHUNK):
+                block = slice(start, start + SPLINE_CHUNK)
+                c = coefficients[interval[block]]
+                dx = offset[block, None]
+                out[rows, block] = (((c[:, 0] * dx + c[:, 1]) * dx + c[:, 2]) * dx + c[:, 3]).T
+        return out
+
+
+def load_derivative_spline(vehicle, variant=None, data_dir=DATA_DIR, cache_dir=CACHE_DIR):
+    """
+    DerivativeSpline of the derivative table of ``vehicle``. The coefficients
+    are cached as ``cache_dir/<vehicle>/<name>_spline.npy`` (memory-mapped)
+    with a JSON sidecar holding the columns, the breakpoints and the CSV hash.
+    """
+    source = csv_path(vehicle, DERIVATIVES, variant, data_dir)
+    digest = file_hash(source)
+    stem = os.path.splitext(os.path.basename(source))[0] + "_spline"
+    npy_path = os.path.join(cache_dir, vehicle, stem + ".npy")
+    meta_path = os.path.join(cache_dir, vehicle, stem + ".json")
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["version"] == CACHE_VERSION and meta["sha256"] == digest:
+            return DerivativeSpline(meta["columns"], meta["breakpoints"], np.load(npy_path, mmap_mode="r"))
+    except (OSError, ValueError, KeyError):
+        pass
+
+    spline = DerivativeSpline.from_table(load_derivatives(vehicle, variant, data_dir=data_dir, cache_dir=cache_dir))
+    _write_cache(npy_path, meta_path, spline.coefficients,
+                 {"version": CACHE_VERSION, "sha256": digest, "columns": spline.columns,
+                  "breakpoints": spline.breakpoints.tolist()})
+    return spline
+
+
+def interpolate_derivatives(table, mach, columns):
+    """
+    ``(len(columns), N)`` array of the derivative ``columns`` of ``table``
+    linearly interpolated at the Mach numbers ``mach`` (held constant outside
+    the table). One interval search serves every column; repeated Mach rows
+    keep the first one. Columns absent from the table are zero. A
+    DerivativeSpline ``table`` is evaluated as the cubic splines instead.
+    """
+    if isinstance(table, DerivativeSpline):
+        return table(mach, columns)
+    grid, first = np.unique(np.asarray(table["MACH"]), return_index=True)
+    x = np.atleast_1d(np.asarray(mach, dtype=float))
+    i = np.clip(np.searchsorted(grid, x, side="right") - 1, 0, grid.size - 2)
+    t = np.clip((x - grid[i]) / (grid[i + 1] - grid[i]), 0.0, 1.0)
+    out = np.zeros((len(columns), x.size))
+    present = [k for k, name in enumerate(columns) if name in table]
+    if present:
+        values = table.select([columns[k] for k in present])[:, first]
+        out[present] = values[:, i] * (1.0 - t) + values[:, i + 1] * t
+    return out
+
+
+def shift_moments(values, delta_x, delta_z, c, b):
+    """
+    Moment coefficients of ``values`` ({name: array}) about a CG moved by
+    ``delta_x`` (aft) and ``delta_z`` (up) metres, first order in the
+    displacement (rate derivatives ignore the change of local velocity).
+    Returns a new dict; names absent from ``values`` are skipped.
+    """
+    shifted = dict(values)
+    for moment, force, axis, sign in MOMENT_TRANSFER:
+        if moment in values and force in values:
+            reference = c if moment.startswith("CM") else b
+            displacement = delta_x if axis == "x" else delta_z
+            shifted[moment] = shifted[moment] + sign * values[force] * displacement / reference
+    return shifted
+
+
+def shift_moment_reference(table, delta_x, delta_z, c, b):
+    """
+    Copy of a coefficient or derivative ColumnTable with the moments about a
+    CG moved by (``delta_x``, ``delta_z``), the in-memory equivalent of the
+    hand-prepared ``_cg_at_*`` datasets.
+    """
+    values = {name: np.asarray(table[name]) for name in table.keys()}
+    shifted = shift_moments(values, delta_x, delta_z, c, b)
+    return ColumnTable(table.keys(), np.array([shifted[name] for name in table.keys()]))
+
+
+def load_mass_properties(vehicle, data_dir=DATA_DIR):
+    """{name: value} of mass_properties.csv (mass, b, c, reference_area, I.., xcg..)."""
+    with open(os.path.join(data_dir, vehicle, MASS_PROPERTIES + ".csv"), "r") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    return dict(zip(lines[0].split(","), (float(v) for v in lines[1].split(","))))
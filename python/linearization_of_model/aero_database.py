@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   aero_database.py
+@Time    :   2026/10/18 15:21:47
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Gridded N-D interpolation of the aerodynamic coefficients over
+             (Mach, alpha, beta, control deflections).
+"""
+
+import bisect
+import itertools
+
+import numpy as np
+
+from . import aero_data
+from .aero_data import AXES, COEFFICIENT_COLUMNS
+
+# Points per block of the vectorized evaluation
+CHUNK_SIZE = 1 << 14
+# Coefficients that change sign with the sideslip (the others are even in beta)
+ODD_IN_BETA = ("CY", "CLL", "CLN")
+
+
+def _mirror_beta(values, present, beta_axis, beta, odd):
+    """
+    Fill the nodes at -beta from those at +beta (and back) by the lateral
+    symmetry of the vehicle: ``odd`` coefficient rows change sign.
+    """
+    mirror = np.searchsorted(beta, -beta)
+    valid = (mirror < beta.size) & np.isclose(beta[np.minimum(mirror, beta.size - 1)], -beta)
+    sign = np.where(odd, -1.0, 1.0).reshape((-1,) + (1,) * present.ndim)
+    source = np.take(values, np.where(valid, mirror, 0), axis=beta_axis + 1)
+    known = np.take(present, np.where(valid, mirror, 0), axis=beta_axis)
+    shape = [1] * present.ndim
+    shape[beta_axis] = beta.size
+    fill = ~present & known & valid.reshape(shape)
+    values[:, fill] = (sign * source)[:, fill]
+    present |= fill
+
+
+def _fill_along_axes(values, present, axes, extrapolate):
+    """
+    Linear interpolation (in the axis values) of the missing nodes along each
+    axis in turn, from the last; with ``extrapolate`` the nodes beyond the known ones take the
+    edge value, otherwise only the nodes between known ones are filled.
+    """
+    for axis in reversed(range(present.ndim)):
+        if present.all():
+            break
+        v = np.moveaxis(values, axis + 1, -1)
+        p = np.moveaxis(present, axis, -1)
+        x = np.asarray(axes[axis], dtype=float)
+        for index in np.ndindex(p.shape[:-1]):
+            known = p[index]
+            if known.all() or not known.any():
+                continue
+            target = ~known
+            if not extrapolate:
+                where = np.flatnonzero(known)
+                target[:where[0]] = False
+                target[where[-1] + 1:] = False
+            if not target.any():
+                continue
+            for c in range(v.shape[0]):
+                line = v[(c,) + index]
+                line[target] = np.interp(x[target], x[known], line[known])
+            p[index] |= target
+
+
+def _fill_missing(values, present, axes, beta_axis=None, odd=None):
+    """
+    Fill the grid nodes absent from the table (the hxi table, for instance,
+    has only beta 0/2/4 for some alpha at Mach 1.35): first by the sideslip
+    symmetry (when ``beta_axis`` is given, ``odd`` flags the coefficients odd
+    in beta), then by linear interpolation between known nodes along each
+    axis, and last by holding the edge values along each axis.
+    """
+    values = values.copy()
+    present = present.copy()
+    if beta_axis is not None:
+        _mirror_beta(values, present, beta_axis, axes[beta_axis], odd)
+    _fill_along_axes(values, present, axes, extrapolate=False)
+    _fill_along_axes(values, present, axes, extrapolate=True)
+    if not present.all():
+        raise ValueError("Grade de coeficientes sem pontos suficientes para completar")
+    return values
+
+
+def _cubic_weights(axis, i, t):
+    """
+    Weights and node indices (4 each) of the cubic Hermite interpolation with
+    finite difference slopes (Catmull-Rom on a non-uniform axis, one sided
+    slopes at the ends).
+    """
+    n = axis.size
+    t2 = t * t
+    t3 = t2 * t
+    h00 = 2 * t3 - 3 * t2 + 1
+    h10 = t3 - 2 * t2 + t
+    h01 = -2 * t3 + 3 * t2
+    h11 = t3 - t2
+    im1 = np.maximum(i - 1, 0)
+    ip1 = i + 1
+    ip2 = np.minimum(i + 2, n - 1)
+    h = axis[ip1] - axis[i]
+    left = i > 0
+    right = i + 2 < n
+    # slope at node i
+    s0 = np.where(left, h / (axis[ip1] - axis[im1]), 1.0)
+    # slope at node i+1
+    s1 = np.where(right, h / (axis[ip2] - axis[i]), 1.0)
+    w = np.empty(i.shape + (4,))
+    w[..., 0] = np.where(left, -h10 * s0, 0.0)
+    w[..., 1] = h00 - np.where(left, 0.0, h10 * s0) - h11 * s1
+    w[..., 2] = h01 + h10 * s0 + np.where(right, 0.0, h11 * s1)
+    w[..., 3] = np.where(right, h11 * s1, 0.0)
+    idx = np.stack([im1, i, ip1, ip2], axis=-1)
+    return w, idx
+
+
+class AeroDatabase:
+    """
+    Dense N-D grid of the coefficients of one vehicle dataset.
+
+    The grid axes are detected from the table; axes with a single value (the
+    control deflections of the current tables) are held constant. Each call
+    evaluates all COEFFICIENT_COLUMNS for a batch of flight conditions with
+    ``searchsorted`` on the axes and a multilinear (or cubic) combination of
+    the surrounding nodes. Queries outside the grid are clamped to its edges.
+    """
+
+    def __init__(self, table, coefficients=COEFFICIENT_COLUMNS):
+        self.coefficients = list(coefficients)
+        axes = [np.unique(np.asarray(table[name])) for name in AXES]
+        self.active = [k for k, axis in enumerate(axes) if axis.size > 1]
+        self.axis_names = [AXES[k] for k in self.active]
+        self.axes = [axes[k] for k in self.active]
+        self.constants = {AXES[k]: float(axes[k][0]) for k in range(len(AXES)) if axes[k].size == 1}
+        shape = tuple(axis.size for axis in self.axes)
+        index = tuple(np.searchsorted(axis, np.asarray(table[name]))
+                      for axis, name in zip(self.axes, self.axis_names))
+        values = np.full((len(self.coefficients),) + shape, np.nan)
+        present = np.zeros(shape, dtype=bool)
+        values[(slice(None),) + index] = table.select(self.coefficients)
+        present[index] = True
+        self.filled = ~present
+        # the lateral symmetry holds with the controls at zero (not deflected or not in the table)
+        symmetric = "BETA_DEG" in self.axis_names and not any(
+            self.constants.get(name, 1.0) != 0.0 for name in AXES[3:]
+        )
+        if symmetric:
+            axis = self.axis_names.index("BETA_DEG")
+            odd = np.array([name in ODD_IN_BETA for name in self.coefficients])
+            values = _fill_missing(values, present, self.axes, axis, odd)
+        else:
+            values = _fill_missing(values, present, self.axes)
+        # (nodes, coefficients): one gather brings all coefficients of a node
+        self._set_grid(np.ascontiguousarray(np.moveaxis(values, 0, -1)))
+
+    def _set_grid(self, grid):
+        self.grid = grid
+        self.flat = grid.reshape(-1, len(self.coefficients))
+        shape = grid.shape[:-1]
+        self.strides = np.array(
+            [int(np.prod(shape[d + 1:])) for d in range(len(shape))], dtype=np.intp
+        )
+        self._axes_lists = [axis.tolist() for axis in self.axes]
+        self._flat_lists = None
+
+    @classmethod
+    def from_arrays(cls, grid, axes, axis_names, coefficients=COEFFICIENT_COLUMNS, constants=None):
+        """
+        Database over an existing dense ``grid`` ``(*axis sizes, coefficients)``,
+        used as is (no copy), e.g. a view of shared memory.
+        """
+        database = cls.__new__(cls)
+        database.coefficients = list(coefficients)
+        database.axis_names = list(axis_names)
+        database.active = [AXES.index(name) for name in database.axis_names]
+        database.axes = [np.asarray(axis, dtype=float) for axis in axes]
+        database.constants = dict(constants or {})
+        database.filled = None
+        database._set_grid(grid)
+        return database
+
+    @classmethod
+    def from_dataset(cls, vehicle, variant=None, **kwargs):
+        return cls(aero_data.load_coefficients(vehicle, variant, **kwargs))
+
+    def _axis_weights(self, points, method):
+        """
+        Per axis, the weights ``(N, K)`` of its K surrounding nodes (2 for
+        linear, 4 for cubic) and their offsets in the flattened grid.
+        """
+        weights = []
+        for axis, stride, x in zip(self.axes, self.strides, points):
+            i = np.clip(np.searchsorted(axis, x, side="right") - 1, 0, axis.size - 2)
+            t = np.clip((x - axis[i]) / (axis[i + 1] - axis[i]), 0.0, 1.0)
+            if method == "linear":
+                w = np.stack([1.0 - t, t], axis=-1)
+                idx = np.stack([i, i + 1], axis=-1)
+            elif method == "cubic":
+                w, idx = _cubic_weights(axis, i, t)
+            else:
+                raise ValueError("method deve ser 'linear' ou 'cubic'")
+            weights.append((w, idx * stride))
+        return weights
+
+    def evaluate(self, mach, alpha_deg, beta_deg, delta_elevon_l=0.0,
+                 delta_elevon_r=0.0, delta_rudder=0.0, method="linear",
+                 chunk_size=CHUNK_SIZE):
+        """
+        Coefficients at the broadcast flight conditions, as an array of shape
+        ``(N, len(coefficients))`` in the order of ``self.coefficients``.
+        The tensor product of the per axis weights is formed ``chunk_size``
+        points at a time to bound the temporaries.
+        """
+        query = dict(zip(AXES, (mach, alpha_deg, beta_deg, delta_elevon_l,
+                                delta_elevon_r, delta_rudder)))
+        points = np.broadcast_arrays(
+            *[np.asarray(query[name], dtype=float).ravel() for name in self.axis_names]
+        )
+        n = points[0].size
+        out = np.empty((n, len(self.coefficients)))
+        for start in range(0, n, chunk_size):
+            chunk = [x[start:start + chunk_size] for x in points]
+            weights = self._axis_weights(chunk, method)
+            w, node = weights[0]
+            for w_axis, node_axis in weights[1:]:
+                m = w.shape[0]
+                w = (w[:, :, None] * w_axis[:, None, :]).reshape(m, -1)
+                node = (node[:, :, None] + node_axis[:, None, :]).reshape(m, -1)
+            np.einsum("nk,nkc->nc", w, self.flat[node], out=out[start:start + chunk_size])
+        return out
+
+    def evaluate_dict(self, *args, **kwargs):
+        out = self.evaluate(*args, **kwargs)
+        return {name: out[:, k] for k, name in enumerate(self.coefficients)}
+
+    def evaluate_point(self, mach, alpha_deg, beta_deg, delta_elevon_l=0.0,
+                       delta_elevon_r=0.0, delta_rudder=0.0):
+        """
+        Multilinear interpolation of a single flight condition with plain
+        Python floats (no array allocation), for integrators that call the
+        database once per stage. Returns a list in the order of
+        ``self.coefficients``.
+        """
+        query = (mach, alpha_deg, beta_deg, delta_elevon_l, delta_elevon_r, delta_rudder)
+        base = 0
+        dims = []
+        for k, axis, stride in zip(self.active, self._axes_lists, self.strides.tolist()):
+            x = query[k]
+            i = min(max(bisect.bisect_right(axis, x) - 1, 0), len(axis) - 2)
+            t = (x - axis[i]) / (axis[i + 1] - axis[i])
+            t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+            base += i * stride
+            dims.append((t, stride))
+        if self._flat_lists is None:
+            self._flat_lists = self.flat.tolist()
+        flat = self._flat_lists
+        out = [0.0] * len(self.coefficients)
+        for corner in itertools.product((0, 1), repeat=len(dims)):
+            weight = 1.0
+            node = base
+            for (t, stride), c in zip(dims, corner):
+                if c:
+                    weight *= t
+                    node += stride
+                else:
+                    weight *= 1.0 - t
+            if weight:
+                row = flat[node]
+                for k in range(len(out)):
+                    out[k] += weight * row[k]
+        return out
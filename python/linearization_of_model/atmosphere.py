@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   atmosphere.py
+@Time    :   2026/10/18 13:30:12
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Vectorized U.S. Standard Atmosphere 1976 for arrays of altitudes.
+"""
+
+import numpy as np
+
+GZERO = 9.80665  # m/s^2
+EARTH_RADIUS_KM = 6356.766  # raio para a altitude geopotencial
+GAS_CONSTANT = 8.31432  # J/(mol K)
+MOLAR_MASS = 28.9644e-3  # kg/mol
+SPECIFIC_GAS_CONSTANT = GAS_CONSTANT / MOLAR_MASS  # J/(kg K)
+GAMMA = 1.4
+GMR = GZERO * MOLAR_MASS / GAS_CONSTANT * 1e3  # K/km
+
+# Layer breakpoints of the lower atmosphere (geopotential km) and lapse rates (K/km)
+LAYER_HEIGHT_KM = np.array([0.0, 11.0, 20.0, 32.0, 47.0, 51.0, 71.0, 84.852])
+LAPSE_RATE = np.array([-6.5, 0.0, 1.0, 2.8, 0.0, -2.8, -2.0, 0.0])
+UPPER_LIMIT_KM = 86.0  # geometric altitude of the last breakpoint
+
+
+def _layer_bases():
+    temperature = [288.15]
+    pressure = [101325.0]
+    for i in range(len(LAYER_HEIGHT_KM) - 1):
+        dh = LAYER_HEIGHT_KM[i + 1] - LAYER_HEIGHT_KM[i]
+        t_next = temperature[i] + LAPSE_RATE[i] * dh
+        if LAPSE_RATE[i] == 0.0:
+            p_next = pressure[i] * np.exp(-GMR * dh / temperature[i])
+        else:
+            p_next = pressure[i] * (temperature[i] / t_next) ** (GMR / LAPSE_RATE[i])
+        temperature.append(t_next)
+        pressure.append(p_next)
+    return np.array(temperature), np.array(pressure)
+
+
+LAYER_TEMPERATURE, LAYER_PRESSURE = _layer_bases()
+
+PROPERTIES = (
+    "altitude_km",
+    "temperature_K",
+    "pressure_Pa",
+    "density_kg_m3",
+    "speed_of_sound_m_s",
+    "g_ratio_to_sea_level",
+)
+
+
+def geopotential_altitude(altitude_km):
+    return altitude_km * EARTH_RADIUS_KM / (EARTH_RADIUS_KM + altitude_km)
+
+
+def _scalar_model():
+    try:
+        from python.atmosphere1976.atmosphere import Atmosphere1976
+    except ImportError:
+        from atmosphere1976.atmosphere import Atmosphere1976
+    return Atmosphere1976()
+
+
+def get_properties(altitude_km, upper_model=None):
+    """
+    Properties of the 1976 standard atmosphere for an array of geometric
+    altitudes in km.
+
+    Returns a dict of arrays (columns) with the same keys as
+    ``Atmosphere1976.get_properties``, so ``pd.DataFrame(...)`` works as
+    before. Up to 86 km every point is computed at once: the layer of each
+    altitude comes from ``searchsorted`` over the layer breakpoints. The few
+    points above 86 km, where the standard uses the composition dependent
+    upper model, are delegated to ``upper_model.get_properties`` (an
+    ``Atmosphere1976``, loaded from the submodule when not given).
+    """
+    z = np.atleast_1d(np.asarray(altitude_km, dtype=float))
+    if np.any(z < 0.0):
+        raise ValueError("Altitude negativa fora do modelo 1976")
+    h = geopotential_altitude(z)
+    layer = np.clip(np.searchsorted(LAYER_HEIGHT_KM, h, side="right") - 1, 0, len(LAYER_HEIGHT_KM) - 2)
+    lapse = LAPSE_RATE[layer]
+    t_base = LAYER_TEMPERATURE[layer]
+    dh = h - LAYER_HEIGHT_KM[layer]
+    temperature = t_base + lapse * dh
+    isothermal = lapse == 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(
+            isothermal,
+            np.exp(-GMR * dh / t_base),
+            (t_base / temperature) ** (GMR / np.where(isothermal, 1.0, lapse)),
+        )
+    pressure = LAYER_PRESSURE[layer] * ratio
+    properties = {
+        "altitude_km": z,
+        "temperature_K": temperature,
+        "pressure_Pa": pressure,
+        "density_kg_m3": pressure / (SPECIFIC_GAS_CONSTANT * temperature),
+        "speed_of_sound_m_s": np.sqrt(GAMMA * SPECIFIC_GAS_CONSTANT * temperature),
+        "g_ratio_to_sea_level": (EARTH_RADIUS_KM / (EARTH_RADIUS_KM + z)) ** 2,
+    }
+    upper = np.flatnonzero(z > UPPER_LIMIT_KM)
+    if upper.size:
+        if upper_model is None:
+            upper_model = _scalar_model()
+        for i in upper:
+            values = upper_model.get_properties(z[i])
+            for key in PROPERTIES[1:]:
+                properties[key][i] = values[key]
+    return properties
@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   atmosphere_table.py
+@Time    :   2026/10/18 14:05:40
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Precomputed, memory-mapped 1976 atmosphere table with linear or
+             cubic interpolation at a bounded relative error.
+"""
+
+import json
+import os
+import warnings
+
+import numpy as np
+
+from . import atmosphere
+from .aero_data import _write_cache
+
+CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", ".cache"
+)
+REFERENCE_CSV = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "images", "atmosfera_dados.csv"
+)
+TABLE_VERSION = 1
+
+COLUMNS = atmosphere.PROPERTIES[1:]
+# Interpolated as log(value): exact inside the isothermal layers
+LOG_COLUMNS = ("pressure_Pa", "density_kg_m3")
+# Columns of images/atmosfera_dados.csv and the property they hold
+CSV_COLUMNS = {
+    "Temperatura_K": "temperature_K",
+    "Pressao_Pa": "pressure_Pa",
+    "Densidade_kgm3": "density_kg_m3",
+    "VelocidadeSom_ms": "speed_of_sound_m_s",
+}
+
+
+def geometric_altitude(geopotential_km):
+    return geopotential_km * atmosphere.EARTH_RADIUS_KM / (
+        atmosphere.EARTH_RADIUS_KM - geopotential_km
+    )
+
+
+class AtmosphereTable:
+    """
+    Grid of the 1976 properties, uniform in geopotential altitude so the layer
+    breakpoints of the lower atmosphere fall on grid nodes (temperature is then
+    piecewise linear between nodes). ``values`` has shape ``(len(COLUMNS), n)``,
+    the log columns stored as logarithms; the cell of an altitude is found by
+    a division, not a search. ``converged`` is False for a table that reached
+    the minimum step above the requested error (the best this grid allows).
+    """
+
+    def __init__(self, values, step_km, max_altitude_km, method="linear", max_rel_error=None,
+                 converged=True):
+        if method not in ("linear", "cubic"):
+            raise ValueError("method deve ser 'linear' ou 'cubic'")
+        self.values = values
+        self.step_km = float(step_km)
+        self.max_altitude_km = float(max_altitude_km)
+        self.method = method
+        self.max_rel_error = max_rel_error
+        self.converged = converged
+        self._log = np.array([c in LOG_COLUMNS for c in COLUMNS])
+
+    @staticmethod
+    def _sample(altitude_km, upper_model=None):
+        properties = atmosphere.get_properties(altitude_km, upper_model)
+        values = np.array([properties[c] for c in COLUMNS])
+        for i, c in enumerate(COLUMNS):
+            if c in LOG_COLUMNS:
+                values[i] = np.log(values[i])
+        return values
+
+    @classmethod
+    def build(cls, max_altitude_km=atmosphere.UPPER_LIMIT_KM, max_rel_error=1e-6,
+              method="linear", initial_step_km=1.0, min_step_km=1e-4, upper_model=None):
+        """
+        Halve the grid step until the interpolation error at the cell mid
+        points, relative to the exact model, is below ``max_rel_error``. At
+        ``min_step_km`` the table is returned as it is, with a warning and
+        ``converged`` False.
+        """
+        top = atmosphere.geopotential_altitude(max_altitude_km)
+        step = initial_step_km
+        while True:
+            n = int(np.ceil(top / step)) + 1
+            # the last node is exactly max_altitude_km, whatever the step
+            grid = np.append(np.arange(n - 1) * step, top)
+            z = np.minimum(geometric_altitude(grid), max_altitude_km)
+            table = cls(cls._sample(z, upper_model), step, max_altitude_km, method)
+            mid = np.minimum(geometric_altitude(0.5 * (grid[1:] + grid[:-1])), max_altitude_km)
+            exact = atmosphere.get_properties(mid, upper_model)
+            approx = table.get_properties(mid)
+            error = max(
+                np.max(np.abs(approx[c] / exact[c] - 1.0)) for c in COLUMNS
+            )
+            if error <= max_rel_error or step <= min_step_km:
+                table.max_rel_error = float(error)
+                table.converged = bool(error <= max_rel_error)
+                if not table.converged:
+                    _warn_not_converged(table, max_rel_error)
+                return table
+            step /= 2.0
+
+    def get_properties(self, altitude_km):
+        """Same columns as ``atmosphere.get_properties``, by interpolation."""
+        z = np.atleast_1d(np.asarray(altitude_km, dtype=float))
+        if np.any((z < 0.0) | (z > self.max_altitude_km)):
+            raise ValueError(
+                "Altitude fora da tabela [0, %g] km" % self.max_altitude_km
+            )
+        n = self.values.shape[1]
+        x = atmosphere.geopotential_altitude(z) / self.step_km
+        i = np.minimum(x.astype(np.intp), n - 2)
+        # the last cell may be shorter than step_km
+        last = atmosphere.geopotential_altitude(self.max_altitude_km) / self.step_km - (n - 2)
+        t = np.where(i == n - 2, (x - i) / last, x - i)
+        v = self.values
+        if self.method == "linear":
+            out = v[:, i] * (1.0 - t) + v[:, i + 1] * t
+        else:
+            # Catmull-Rom: cubic Hermite with centered slopes (one sided at the ends)
+            p0 = v[:, np.maximum(i - 1, 0)]
+            p1 = v[:, i]
+            p2 = v[:, i + 1]
+            p3 = v[:, np.minimum(i + 2, n - 1)]
+            m1 = np.where(i > 0, (p2 - p0) / 2.0, p2 - p1)
+            m2 = np.where(i + 2 < n, (p3 - p1) / 2.0, p2 - p1)
+            t2 = t * t
+            t3 = t2 * t
+            out = (
+                (2 * t3 - 3 * t2 + 1) * p1
+                + (t3 - 2 * t2 + t) * m1
+                + (-2 * t3 + 3 * t2) * p2
+                + (t3 - t2) * m2
+            )
+        out[self._log] = np.exp(out[self._log])
+        properties = {"altitude_km": z}
+        properties.update(zip(COLUMNS, out))
+        properties["g_ratio_to_sea_level"] = (
+            atmosphere.EARTH_RADIUS_KM / (atmosphere.EARTH_RADIUS_KM + z)
+        ) ** 2
+        return properties
+
+    def metadata(self):
+        return {
+            "version": TABLE_VERSION,
+            "step_km": self.step_km,
+            "max_altitude_km": self.max_altitude_km,
+            "method": self.method,
+            "max_rel_error": self.max_rel_error,
+            "converged": self.converged,
+            "columns": list(COLUMNS),
+        }
+
+    def save(self, file_path):
+        """
+        Save the grid as ``file_path`` (.npy) and its metadata next to it
+        (.json, written last), each replaced atomically.
+        """
+        file_path = os.path.abspath(file_path)
+        _write_cache(file_path, os.path.splitext(file_path)[0] + ".json",
+                     np.ascontiguousarray(self.values), self.metadata())
+
+    @classmethod
+    def load(cls, file_path, mmap_mode="r"):
+        with open(os.path.splitext(file_path)[0] + ".json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != TABLE_VERSION or meta.get("columns") != list(COLUMNS):
+            raise ValueError("Tabela de atmosfera incompatível: " + file_path)
+        values = np.load(file_path, mmap_mode=mmap_mode)
+        return cls(values, meta["step_km"], meta["max_altitude_km"], meta["method"],
+                   meta["max_rel_error"], meta.get("converged", True))
+
+
+def _warn_not_converged(table, max_rel_error):
+    warnings.warn(
+        "Tabela de atmosfera com erro relativo %.3g acima de %.3g no passo mínimo (%g km)"
+        % (table.max_rel_error, max_rel_error, table.step_km),
+        RuntimeWarning,
+        stacklevel=3,
+    )
+
+
+def table_path(max_altitude_km, max_rel_error, method, cache_dir=CACHE_DIR):
+    name = "atmosphere1976_%s_%gkm_%g.npy" % (method, max_altitude_km, max_rel_error)
+    return os.path.join(cache_dir, name)
+
+
+def cached_table(max_altitude_km=atmosphere.UPPER_LIMIT_KM, max_rel_error=1e-6,
+                 method="linear", cache_dir=CACHE_DIR, upper_model=None):
+    """
+    Load the memory-mapped table from ``cache_dir``, building and saving it on
+    the first use. A table that did not reach ``max_rel_error`` at the minimum
+    step is cached too (a rebuild would give the same grid), with a warning
+    on every load.
+    """
+    file_path = table_path(max_altitude_km, max_rel_error, method, cache_dir)
+    try:
+        table = AtmosphereTable.load(file_path)
+        if table.max_rel_error is not None and table.max_rel_error <= max_rel_error:
+            return table
+        if not table.converged:
+            _warn_not_converged(table, max_rel_error)
+            return table
+    except (OSError, ValueError):
+        pass
+    table = AtmosphereTable.build(max_altitude_km, max_rel_error, method,
+                                  upper_model=upper_model)
+    table.save(file_path)
+    return AtmosphereTable.load(file_path)
+
+
+def validate_against_csv(table, csv_path=REFERENCE_CSV):
+    """
+    Max absolute difference per column between ``table`` and the reference
+    atmosfera_dados.csv (written with 2 decimals), inside the table range.
+    """
+    data = np.genfromtxt(csv_path, delimiter=",", names=True)
+    inside = data["Altitude_km"] <= table.max_altitude_km
+    properties = table.get_properties(data["Altitude_km"][inside])
+    errors = {
+        csv_column: float(np.max(np.abs(data[csv_column][inside] - properties[column])))
+        for csv_column, column in CSV_COLUMNS.items()
+    }
+    errors["Gravidade"] = float(
+        np.max(
+            np.abs(
+                data["Gravidade"][inside]
+                - atmosphere.GZERO * properties["g_ratio_to_sea_level"]
+            )
+        )
+    )
+    return errors
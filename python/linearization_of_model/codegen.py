@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   codegen.py
+@Time    :   2026/10/18 17:10:26
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Generate NumPy source from sympy matrices once and cache it on
+             disk, so later runs import the functions without sympy.
+"""
+
+import hashlib
+import importlib.metadata
+import importlib.util
+import inspect
+import os
+
+import numpy as np
+
+CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", ".cache", "codegen"
+)
+CODEGEN_VERSION = 1
+
+_loaded = {}
+
+
+def derivation_key(name, build):
+    """
+    Hash of the derivation: the source of ``build``, the sympy version and
+    CODEGEN_VERSION. It identifies the expressions without deriving them.
+    """
+    digest = hashlib.sha256()
+    for part in (name, inspect.getsource(build), importlib.metadata.version("sympy"),
+                 str(CODEGEN_VERSION)):
+        digest.update(part.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def expression_hash(outputs):
+    """Hash of the ``srepr`` of the output matrices."""
+    import sympy
+
+    digest = hashlib.sha256()
+    for key in sorted(outputs):
+        digest.update(key.encode("utf-8"))
+        digest.update(sympy.srepr(outputs[key]).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def generate_source(args, outputs, header=""):
+    """
+    Python module text with one function per output matrix. Each function
+    takes ``args`` (arrays broadcast together) and returns a flat list of the
+    matrix elements in row-major order; common subexpressions are computed
+    once per function.
+    """
+    import sympy
+    from sympy.printing.numpy import NumPyPrinter
+
+    printer = NumPyPrinter({"fully_qualified_modules": True})
+    names = [str(a) for a in args]
+    lines = ['"""' + header + '"""', "", "import numpy", "", ""]
+    shapes = {}
+    for key, matrix in outputs.items():
+        matrix = sympy.Matrix(matrix)
+        shapes[key] = matrix.shape
+        temporaries, (reduced,) = sympy.cse(matrix, symbols=sympy.numbered_symbols("_x"))
+        lines.append("def %s(%s):" % (key, ", ".join(names)))
+        for symbol, value in temporaries:
+            lines.append("    %s = %s" % (symbol, printer.doprint(value)))
+        elements = ",\n        ".join(printer.doprint(e) for e in reduced)
+        lines.append("    return [\n        %s,\n    ]" % elements)
+        lines.extend(["", ""])
+    lines.append("SHAPES = %r" % shapes)
+    lines.append("ARGS = %r" % names)
+    return "\n".join(lines) + "\n"
+
+
+class CompiledFunctions:
+    """
+    The functions of a generated module; calling ``name(*args)`` returns an
+    array ``batch_shape + matrix_shape``.
+    """
+
+    def __init__(self, module):
+        self.module = module
+        self.args = tuple(module.ARGS)
+        self.shapes = dict(module.SHAPES)
+        self.expression_hash = module.EXPRESSION_HASH
+        for key in self.shapes:
+            setattr(self, key, self._wrap(key))
+
+    def _wrap(self, key):
+        function = getattr(self.module, key)
+        shape = self.shapes[key]
+
+        def evaluate(*args):
+            # the batch of the inputs: an element depending on constants only is broadcast too
+            batch = np.broadcast_shapes(*(np.shape(a) for a in args))
+            values = [np.broadcast_to(np.asarray(v, dtype=float), batch) for v in function(*args)]
+            return np.stack(values, axis=-1).reshape(batch + shape)
+
+        evaluate.__name__ = key
+        evaluate.__doc__ = "%s%r of %s (generated)." % (key, shape, ", ".join(self.args))
+        return evaluate
+
+
+def _import(name, file_path):
+    spec = importlib.util.spec_from_file_location(name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def compile_functions(name, build, cache_dir=CACHE_DIR):
+    """
+    Functions for the matrices returned by ``build()`` (a pair ``(args,
+    {output: sympy.Matrix})``). The generated module is written to
+    ``cache_dir/<name>_<key>.py``, the key being ``derivation_key``; when it
+    exists ``build`` is not called and sympy is not imported.
+    """
+    key = derivation_key(name, build)
+    if key in _loaded:
+        return _loaded[key]
+    file_path = os.path.join(cache_dir, "%s_%s.py" % (name, key))
+    if not os.path.exists(file_path):
+        args, outputs = build()
+        digest = expression_hash(outputs)
+        source = generate_source(args, outputs, "Generated from %s, do not edit." % name)
+        source += "EXPRESSION_HASH = %r\n" % digest
+        os.makedirs(cache_dir, exist_ok=True)
+        temporary = file_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(source)
+        os.replace(temporary, file_path)
+    _loaded[key] = CompiledFunctions(_import("%s_%s" % (name, key), file_path))
+    return _loaded[key]
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   equations_of_motion.py
+@Time    :   2026/10/18 17:24:51
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   6-DOF rigid body equations of motion (flat earth, body axes, 3-2-1
+             Euler angles) and their Jacobians, derived with sympy once and
+             evaluated through generated NumPy code.
+"""
+
+import numpy as np
+
+from .codegen import compile_functions
+
+STATES = ("u", "v", "w", "p", "q", "r", "phi", "theta", "psi", "x_n", "y_e", "z_d")
+# Body axis resultant aerodynamic forces (N) and moments (N m) about the CG
+INPUTS = ("X", "Y", "Z", "L", "M", "N")
+# Products of inertia defined as Ixy = int(x y dm), so J has -Ixy off the diagonal
+PARAMETERS = ("mass", "Ixx", "Iyy", "Izz", "Ixy", "Ixz", "Iyz", "g")
+
+
+def derive():
+    """Symbolic x' = f(x, u, params) and the Jacobians df/dx and df/du."""
+    import sympy as sp
+
+    u, v, w, p, q, r, phi, theta, psi, x_n, y_e, z_d = sp.symbols(STATES, real=True)
+    X, Y, Z, L, M, N = sp.symbols(INPUTS, real=True)
+    mass, Ixx, Iyy, Izz, Ixy, Ixz, Iyz, g = sp.symbols(PARAMETERS, real=True)
+    velocity = sp.Matrix([u, v, w])
+    omega = sp.Matrix([p, q, r])
+    inertia = sp.Matrix([[Ixx, -Ixy, -Ixz], [-Ixy, Iyy, -Iyz], [-Ixz, -Iyz, Izz]])
+    sphi, cphi = sp.sin(phi), sp.cos(phi)
+    sth, cth = sp.sin(theta), sp.cos(theta)
+    spsi, cpsi = sp.sin(psi), sp.cos(psi)
+    # body to NED
+    body_to_ned = sp.Matrix(
+        [
+            [cth * cpsi, sphi * sth * cpsi - cphi * spsi, cphi * sth * cpsi + sphi * spsi],
+            [cth * spsi, sphi * sth * spsi + cphi * cpsi, cphi * sth * spsi - sphi * cpsi],
+            [-sth, sphi * cth, cphi * cth],
+        ]
+    )
+    gravity = body_to_ned.T * sp.Matrix([0, 0, g])
+    velocity_dot = sp.Matrix([X, Y, Z]) / mass + gravity - omega.cross(velocity)
+    omega_dot = inertia.inv() * (sp.Matrix([L, M, N]) - omega.cross(inertia * omega))
+    euler_dot = sp.Matrix(
+        [
+            p + (q * sphi + r * cphi) * sp.tan(theta),
+            q * cphi - r * sphi,
+            (q * sphi + r * cphi) / cth,
+        ]
+    )
+    position_dot = body_to_ned * velocity
+    f = sp.Matrix.vstack(velocity_dot, omega_dot, euler_dot, position_dot)
+    f = f.applyfunc(sp.simplify)
+    states = sp.Matrix([u, v, w, p, q, r, phi, theta, psi, x_n, y_e, z_d])
+    inputs = sp.Matrix([X, Y, Z, L, M, N])
+    args = list(states) + list(inputs) + [mass, Ixx, Iyy, Izz, Ixy, Ixz, Iyz, g]
+    return args, {
+        "dynamics": f,
+        "state_jacobian": f.jacobian(states),
+        "input_jacobian": f.jacobian(inputs),
+    }
+
+
+def functions():
+    """Generated functions (from the disk cache after the first run)."""
+    return compile_functions("rigid_body_6dof", derive)
+
+
+def parameters_from_mass(mass_properties, g=9.80665):
+    """PARAMETERS values from aero_data.load_mass_properties."""
+    values = dict(mass_properties, g=g)
+    return [values[name] for name in PARAMETERS]
+
+
+def _arguments(state, forces, parameters):
+    state = np.asarray(state, dtype=float)
+    forces = np.asarray(forces, dtype=float)
+    return (
+        [state[..., k] for k in range(len(STATES))]
+        + [forces[..., k] for k in range(len(INPUTS))]
+        + [np.asarray(value, dtype=float) for value in parameters]
+    )
+
+
+def dynamics(state, forces, parameters):
+    """x' for states ``(..., 12)`` and forces/moments ``(..., 6)``; returns ``(..., 12)``."""
+    return functions().dynamics(*_arguments(state, forces, parameters))[..., 0]
+
+
+def jacobians(state, forces, parameters):
+    """(df/dx ``(..., 12, 12)``, df/du ``(..., 12, 6)``) at the given points."""
+    compiled = functions()
+    args = _arguments(state, forces, parameters)
+    return compiled.state_jacobian(*args), compiled.input_jacobian(*args)
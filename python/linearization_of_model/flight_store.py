@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   flight_store.py
+@Time    :   2026/10/18 15:58:12
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Chunked, compressed layout of flight_dynamics_data.hdf5 and a lazy
+             reader of Mach slices / columns with an LRU of decoded chunks.
+"""
+
+import collections
+import os
+
+import h5py
+import numpy as np
+
+from .aero_data import DATA_DIR, ColumnTable
+
+SOURCE_FILE = os.path.join(DATA_DIR, "flight_dynamics_data.hdf5")
+LAYOUT_VERSION = 1
+# Every table has one row per Mach number of <vehicle>/envelope/mach
+MACH_PATH = "envelope/mach"
+ROWS_PER_CHUNK = 64
+COMPRESSION = "gzip"
+COMPRESSION_LEVEL = 4
+CACHE_BYTES = 64 << 20
+
+
+def write_table(group, name, data, attrs=None, rows_per_chunk=ROWS_PER_CHUNK):
+    """
+    Write ``data`` (rows are Mach numbers) as ``group[name]``, one chunk per
+    block of ``rows_per_chunk`` rows and per column, so a reader touching a
+    few columns or a Mach range decodes only those chunks.
+    """
+    data = np.asarray(data)
+    if data.dtype.kind == "O":
+        data = data.astype(h5py.string_dtype())
+    rows = max(min(rows_per_chunk, data.shape[0]), 1)
+    chunks = (rows,) + (1,) * (data.ndim - 1)
+    numeric = data.dtype.kind in "biufc"
+    dataset = group.create_dataset(
+        name,
+        data=data,
+        chunks=chunks,
+        compression=COMPRESSION,
+        compression_opts=COMPRESSION_LEVEL,
+        shuffle=numeric,
+    )
+    for key, value in (attrs or {}).items():
+        dataset.attrs[key] = value
+    return dataset
+
+
+def write_vehicle(h5_file, vehicle, tables, rows_per_chunk=ROWS_PER_CHUNK):
+    """
+    Add (or replace) ``vehicle``; ``tables`` maps a path relative to the
+    vehicle group (e.g. ``coefficients/static``) to ``data`` or
+    ``(data, attrs)`` and must contain MACH_PATH.
+    """
+    if MACH_PATH not in tables:
+        raise ValueError("Tabelas do veículo %s sem %s" % (vehicle, MACH_PATH))
+    if vehicle in h5_file:
+        del h5_file[vehicle]
+    group = h5_file.create_group(vehicle)
+    for path, value in tables.items():
+        data, attrs = value if isinstance(value, tuple) else (value, None)
+        parent, name = os.path.split(path)
+        target = group.require_group(parent) if parent else group
+        write_table(target, name, data, attrs, rows_per_chunk)
+    return group
+
+
+def convert(source=SOURCE_FILE, target=None, rows_per_chunk=ROWS_PER_CHUNK):
+    """
+    Rewrite ``source`` with the chunked layout (same groups, names and
+    attributes) into ``target`` (default: replace ``source``).
+    """
+    target = target or source
+    temporary = target + ".tmp"
+    with h5py.File(source, "r") as src, h5py.File(temporary, "w") as dst:
+        dst.attrs["layout_version"] = LAYOUT_VERSION
+        dst.attrs["rows_per_chunk"] = rows_per_chunk
+        for vehicle in src:
+            tables = {}
+
+            def collect(path, item):
+                if isinstance(item, h5py.Dataset):
+                    tables[path] = (item[()], dict(item.attrs))
+
+            src[vehicle].visititems(collect)
+            write_vehicle(dst, vehicle, tables, rows_per_chunk)
+    os.replace(temporary, target)
+    return target
+
+
+class FlightDataStore:
+    """
+    Lazy reader of the flight dynamics file. Nothing is read when the store
+    is created; ``read`` decodes only the chunks that cover the requested
+    Mach rows and columns and keeps them in an LRU bounded by ``cache_bytes``.
+    """
+
+    def __init__(self, file_path=SOURCE_FILE, cache_bytes=CACHE_BYTES):
+        self.file_path = file_path
+        self.cache_bytes = cache_bytes
+        self._file = None
+        self._chunks = collections.OrderedDict()
+        self._cached_bytes = 0
+        self._mach = {}
+        self._columns = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def file(self):
+        if self._file is None:
+            self._file = h5py.File(self.file_path, "r")
+        return self._file
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.clear_cache()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def vehicles(self):
+        return list(self.file)
+
+    def tables(self, vehicle):
+        """Paths of the datasets of ``vehicle``."""
+        names = []
+        self.file[vehicle].visititems(
+            lambda path, item: names.append(path) if isinstance(item, h5py.Dataset) else None
+        )
+        return names
+
+    def columns(self, vehicle, table):
+        key = (vehicle, table)
+        if key not in self._columns:
+            dataset = self.file[vehicle][table]
+            if "columns" in dataset.attrs:
+                names = [n.decode() if isinstance(n, bytes) else str(n) for n in dataset.attrs["columns"]]
+            else:
+                # no names stored (stability/*, envelope/*): <table>_<k>, or <table> for a 1-D dataset
+                stem = os.path.basename(table)
+                names = [stem] if dataset.ndim == 1 else ["%s_%d" % (stem, k) for k in range(dataset.shape[1])]
+            self._columns[key] = names
+        return self._columns[key]
+
+    def mach(self, vehicle):
+        if vehicle not in self._mach:
+            self._mach[vehicle] = self.file[vehicle][MACH_PATH][()]
+        return self._mach[vehicle]
+
+    def rows(self, vehicle, mach=None):
+        """
+        Row indices for ``mach``: None (all), a ``(low, high)`` range
+        (inclusive) or Mach values present in the envelope.
+        """
+        grid = self.mach(vehicle)
+        if mach is None:
+            return np.arange(grid.size)
+        if isinstance(mach, tuple):
+            low, high = mach
+            return np.flatnonzero((grid >= low) & (grid <= high))
+        values = np.atleast_1d(np.asarray(mach, dtype=float))
+        # nearest of the two neighbours: the stored values carry rounding (1.9999999999999998)
+        right = np.clip(np.searchsorted(grid, values), 0, grid.size - 1)
+        left = np.clip(right - 1, 0, grid.size - 1)
+        index = np.where(np.abs(grid[left] - values) <= np.abs(grid[right] - values), left, right)
+        missing = ~np.isclose(grid[index], values)
+        if np.any(missing):
+            raise KeyError("Mach fora do envelope de %s: %s" % (vehicle, values[missing]))
+        return index
+
+    def _column_index(self, vehicle, table, columns, n_columns):
+        if columns is None:
+            return np.arange(n_columns)
+        names = self.columns(vehicle, table)
+        try:
+            return np.array(
+                [c if isinstance(c, (int, np.integer)) else names.index(c) for c in columns],
+                dtype=np.intp,
+            )
+        except ValueError as error:
+            raise KeyError("Coluna ausente em %s/%s: %s" % (vehicle, table, error))
+
+    def _chunk(self, dataset, key):
+        """Decoded chunk ``key`` = (row block, column block) of ``dataset``."""
+        cache_key = (dataset.name,) + key
+        block = self._chunks.get(cache_key)
+        if block is not None:
+            self._chunks.move_to_end(cache_key)
+            self.hits += 1
+            return block
+        self.misses += 1
+        rows, cols = self._chunk_shape(dataset)
+        r0 = key[0] * rows
+        if dataset.ndim == 1:
+            block = dataset[r0:r0 + rows][:, None]
+        else:
+            c0 = key[1] * cols
+            block = dataset[r0:r0 + rows, c0:c0 + cols]
+        self._chunks[cache_key] = block
+        self._cached_bytes += block.nbytes
+        while self._cached_bytes > self.cache_bytes and len(self._chunks) > 1:
+            _, old = self._chunks.popitem(last=False)
+            self._cached_bytes -= old.nbytes
+        return block
+
+    @staticmethod
+    def _chunk_shape(dataset):
+        # contiguous files (the original layout) are cached in the same units
+        chunks = dataset.chunks or (ROWS_PER_CHUNK,) + (1,) * (dataset.ndim - 1)
+        return chunks[0], (chunks[1] if dataset.ndim > 1 else 1)
+
+    def read(self, vehicle, table, columns=None, mach=None):
+        """
+        ``(rows, columns)`` array of ``vehicle/table`` restricted to the
+        ``mach`` rows (see ``rows``) and ``columns`` (names or indices).
+        """
+        dataset = self.file[vehicle][table]
+        n_columns = dataset.shape[1] if dataset.ndim > 1 else 1
+        rows = self.rows(vehicle, mach)
+        cols = self._column_index(vehicle, table, columns, n_columns)
+        chunk_rows, chunk_cols = self._chunk_shape(dataset)
+        out = np.empty((rows.size, cols.size), dtype=dataset.dtype)
+        row_block = rows // chunk_rows
+        col_block = cols // chunk_cols
+        for rb in np.unique(row_block):
+            at_r = np.flatnonzero(row_block == rb)
+            local_r = rows[at_r] - rb * chunk_rows
+            for cb in np.unique(col_block):
+                at_c = np.flatnonzero(col_block == cb)
+                local_c = cols[at_c] - cb * chunk_cols
+                block = self._chunk(dataset, (int(rb), int(cb)))
+                out[np.ix_(at_r, at_c)] = block[np.ix_(local_r, local_c)]
+        return out[:, 0] if dataset.ndim == 1 else out
+
+    def read_table(self, vehicle, table, columns=None, mach=None):
+        """Same selection as ``read`` as a ColumnTable with a MACH column first."""
+        names = list(columns) if columns is not None else self.columns(vehicle, table)
+        data = self.read(vehicle, table, names, mach)
+        grid = self.mach(vehicle)[self.rows(vehicle, mach)]
+        return ColumnTable(["MACH"] + names, np.vstack([grid, data.T]))
+
+    def clear_cache(self):
+        self._chunks.clear()
+        self._cached_bytes = 0
+
+    def cache_info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "chunks": len(self._chunks),
+            "bytes": self._cached_bytes,
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rewrite the HDF5 file with the chunked layout")
+    parser.add_argument("source", nargs="?", default=SOURCE_FILE)
+    parser.add_argument("-o", "--output", default=None)
+    parser.add_argument("--rows-per-chunk", type=int, default=ROWS_PER_CHUNK)
+    args = parser.parse_args()
+    print("Written:", convert(args.source, args.output, args.rows_per_chunk))
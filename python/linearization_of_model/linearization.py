@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   linearization.py
+@Time    :   2026/10/18 16:32:08
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Batched small perturbation state-space models (longitudinal and
+             lateral-directional) over Mach/altitude envelopes.
+"""
+
+import numpy as np
+
+from . import aero_data, atmosphere
+from .aero_database import AeroDatabase
+
+LONGITUDINAL_STATES = ("u", "w", "q", "theta")
+LONGITUDINAL_INPUTS = ("delta_elevon_l", "delta_elevon_r")
+LATERAL_STATES = ("v", "p", "r", "phi")
+LATERAL_INPUTS = ("delta_elevon_l", "delta_elevon_r", "delta_rudder")
+
+# Derivatives (per radian, rates normalized by c/2V or b/2V) taken from
+# derivatives_vs_mach; the ones missing in a vehicle table are zero
+DYNAMIC_DERIVATIVES = (
+    "CNQ", "CNAD", "CMQ", "CMAD", "CYP", "CYR", "CLLP", "CLLR", "CLNP", "CLNR",
+    "CNDEL", "CNDER", "CMDEL", "CMDER", "CLLDEL", "CLLDER",
+    "CYDR", "CLNDR", "CLLDR",
+)
+
+# Steps of the central differences on the coefficient grid
+ALPHA_STEP_DEG = 0.5
+BETA_STEP_DEG = 0.5
+MACH_STEP = 0.05
+
+
+class StateSpace:
+    """Stacked models ``x' = A x + B u``: A is ``(N, n, n)``, B is ``(N, n, m)``."""
+
+    def __init__(self, A, B, states, inputs):
+        self.A = A
+        self.B = B
+        self.states = tuple(states)
+        self.inputs = tuple(inputs)
+
+    def __len__(self):
+        return self.A.shape[0]
+
+    def __getitem__(self, index):
+        return StateSpace(self.A[index], self.B[index], self.states, self.inputs)
+
+
+class LinearizationEngine:
+    """
+    Small perturbation models of one vehicle about straight and level flight
+    (flight path angle zero, so theta0 = alpha0) at arrays of operating
+    points. Body axes; the static slopes come from central differences on the
+    coefficient grid (AeroDatabase) at the operating alpha, the damping and
+    control derivatives from derivatives_vs_mach. Every operating point is
+    processed at once, there is no loop over points.
+
+    The products of inertia follow ``Ixz = int(x z dm)``, i.e.
+    ``Ixx p' - Ixz r' = L`` and ``Izz r' - Ixz p' = N``.
+    """
+
+    def __init__(self, vehicle, variant=None, atmosphere_model=atmosphere.get_properties):
+        self.vehicle = vehicle
+        self.database = AeroDatabase.from_dataset(vehicle, variant)
+        self.derivatives = aero_data.load_derivatives(vehicle, variant)
+        self.mass = aero_data.load_mass_properties(vehicle)
+        self.atmosphere_model = atmosphere_model
+
+    def operating_points(self, mach, altitude_km, alpha_deg=0.0):
+        """Flight condition arrays shared by both models."""
+        mach, altitude_km, alpha_deg = (
+            np.ravel(x) for x in np.broadcast_arrays(
+                np.asarray(mach, dtype=float), np.asarray(altitude_km, dtype=float),
+                np.asarray(alpha_deg, dtype=float),
+            )
+        )
+        air = self.atmosphere_model(altitude_km)
+        alpha = np.radians(alpha_deg)
+        speed = mach * air["speed_of_sound_m_s"]
+        rho = air["density_kg_m3"]
+        return {
+            "mach": mach,
+            "altitude_km": altitude_km,
+            "alpha_deg": alpha_deg,
+            "alpha": alpha,
+            "speed": speed,
+            "speed_of_sound": air["speed_of_sound_m_s"],
+            "rho": rho,
+            "qbar": 0.5 * rho * speed**2,
+            "u0": speed * np.cos(alpha),
+            "w0": speed * np.sin(alpha),
+            "g": atmosphere.GZERO * air["g_ratio_to_sea_level"],
+        }
+
+    def static_slopes(self, mach, alpha_deg):
+        """
+        d(coefficient)/d(alpha, beta) per radian and d/dMach of the grid
+        coefficients, all from one batched evaluation of 6N points.
+        """
+        n = mach.size
+        lo, hi = self.database.axes[0][[0, -1]]
+        m_up = np.minimum(mach + MACH_STEP, hi)
+        m_dn = np.maximum(mach - MACH_STEP, lo)
+        zero = np.zeros(n)
+        points = (
+            np.concatenate([mach, mach, mach, mach, m_up, m_dn]),
+            np.concatenate([alpha_deg + ALPHA_STEP_DEG, alpha_deg - ALPHA_STEP_DEG,
+                            alpha_deg, alpha_deg, alpha_deg, alpha_deg]),
+            np.concatenate([zero, zero, zero + BETA_STEP_DEG, zero - BETA_STEP_DEG, zero, zero]),
+        )
+        c = self.database.evaluate(*points).reshape(6, n, -1)
+        index = {name: k for k, name in enumerate(self.database.coefficients)}
+        d_alpha = (c[0] - c[1]) / np.radians(2 * ALPHA_STEP_DEG)
+        d_beta = (c[2] - c[3]) / np.radians(2 * BETA_STEP_DEG)
+        dm = m_up - m_dn
+        d_mach = (c[4] - c[5]) / np.where(dm > 0.0, dm, 1.0)[:, None]
+        d_mach[dm <= 0.0] = 0.0
+        center = self.database.evaluate(mach, alpha_deg, 0.0)
+        slopes = {}
+        for name, k in index.items():
+            slopes[name] = center[:, k]
+            slopes[name + "_alpha"] = d_alpha[:, k]
+            slopes[name + "_beta"] = d_beta[:, k]
+            slopes[name + "_mach"] = d_mach[:, k]
+        return slopes
+
+    def _coefficients(self, op):
+        coef = self.static_slopes(op["mach"], op["alpha_deg"])
+        dynamic = aero_data.interpolate_derivatives(
+            self.derivatives, op["mach"], DYNAMIC_DERIVATIVES
+        )
+        coef.update(zip(DYNAMIC_DERIVATIVES, dynamic))
+        return coef
+
+    def longitudinal(self, mach, altitude_km, alpha_deg=0.0, op=None, coef=None):
+        """Stacked longitudinal model, states LONGITUDINAL_STATES."""
+        op = op or self.operating_points(mach, altitude_km, alpha_deg)
+        coef = coef or self._coefficients(op)
+        m, S, c, Iyy = (self.mass[k] for k in ("mass", "reference_area", "c", "Iyy"))
+        V, u0, w0, rho, qbar = (op[k] for k in ("speed", "u0", "w0", "rho", "qbar"))
+        a, theta0, g = op["speed_of_sound"], op["alpha"], op["g"]
+        # body axis force coefficients
+        cx, cz, cm = -coef["CA"], -coef["CN"], coef["CM"]
+        cx_a, cz_a, cm_a = -coef["CA_alpha"], -coef["CN_alpha"], coef["CM_alpha"]
+        cx_m, cz_m, cm_m = -coef["CA_mach"], -coef["CN_mach"], coef["CM_mach"]
+        # partials of (qbar, alpha, Mach) with respect to u and w
+        dq_du, dq_dw = rho * u0, rho * w0
+        da_du, da_dw = -w0 / V**2, u0 / V**2
+        dm_du, dm_dw = u0 / (a * V), w0 / (a * V)
+
+        def force(coefficient, slope_a, slope_m, dq, da, dm):
+            return (dq * coefficient + qbar * (slope_a * da + slope_m * dm)) * S
+
+        X_u = force(cx, cx_a, cx_m, dq_du, da_du, dm_du) / m
+        X_w = force(cx, cx_a, cx_m, dq_dw, da_dw, dm_dw) / m
+        Z_u = force(cz, cz_a, cz_m, dq_du, da_du, dm_du) / m
+        Z_w = force(cz, cz_a, cz_m, dq_dw, da_dw, dm_dw) / m
+        M_u = force(cm, cm_a, cm_m, dq_du, da_du, dm_du) * c / Iyy
+        M_w = force(cm, cm_a, cm_m, dq_dw, da_dw, dm_dw) * c / Iyy
+        rate = c / (2.0 * V)
+        Z_q = -qbar * S * coef["CNQ"] * rate / m
+        M_q = qbar * S * c * coef["CMQ"] * rate / Iyy
+        Z_wd = -qbar * S * coef["CNAD"] * rate * da_dw / m
+        M_wd = qbar * S * c * coef["CMAD"] * rate * da_dw / Iyy
+        Z_d = -(qbar * S / m)[:, None] * np.stack([coef["CNDEL"], coef["CNDER"]], axis=-1)
+        M_d = (qbar * S * c / Iyy)[:, None] * np.stack([coef["CMDEL"], coef["CMDER"]], axis=-1)
+
+        n = V.size
+        A = np.zeros((n, 4, 4))
+        B = np.zeros((n, 4, 2))
+        # (1 - Z_wd) w' = Z_u u + Z_w w + (Z_q + u0) q - g sin(theta0) theta + Z_d d
+        k = 1.0 / (1.0 - Z_wd)
+        A[:, 0] = np.stack([X_u, X_w, -w0, -g * np.cos(theta0)], axis=-1)
+        A[:, 1] = k[:, None] * np.stack([Z_u, Z_w, Z_q + u0, -g * np.sin(theta0)], axis=-1)
+        B[:, 1] = k[:, None] * Z_d
+        A[:, 2] = np.stack([M_u, M_w, M_q, np.zeros(n)], axis=-1) + M_wd[:, None] * A[:, 1]
+        B[:, 2] = M_d + M_wd[:, None] * B[:, 1]
+        A[:, 3, 2] = 1.0
+        return StateSpace(A, B, LONGITUDINAL_STATES, LONGITUDINAL_INPUTS)
+
+    def lateral(self, mach, altitude_km, alpha_deg=0.0, op=None, coef=None):
+        """Stacked lateral-directional model, states LATERAL_STATES."""
+        op = op or self.operating_points(mach, altitude_km, alpha_deg)
+        coef = coef or self._coefficients(op)
+        m, S, b = (self.mass[k] for k in ("mass", "reference_area", "b"))
+        Ixx, Izz, Ixz = (self.mass[k] for k in ("Ixx", "Izz", "Ixz"))
+        V, u0, w0, qbar = (op[k] for k in ("speed", "u0", "w0", "qbar"))
+        theta0, g = op["alpha"], op["g"]
+        rate = b / (2.0 * V)
+        # side force and moments per unit v, p, r and deflections
+        Y = (qbar * S / m)[:, None] * np.stack(
+            [coef["CY_beta"] / V, coef["CYP"] * rate, coef["CYR"] * rate], axis=-1
+        )
+        Y_d = (qbar * S / m)[:, None] * np.stack(
+            [np.zeros(V.size), np.zeros(V.size), coef["CYDR"]], axis=-1
+        )
+        L = (qbar * S * b)[:, None] * np.stack(
+            [coef["CLL_beta"] / V, coef["CLLP"] * rate, coef["CLLR"] * rate], axis=-1
+        )
+        L_d = (qbar * S * b)[:, None] * np.stack([coef["CLLDEL"], coef["CLLDER"], coef["CLLDR"]], axis=-1)
+        N = (qbar * S * b)[:, None] * np.stack(
+            [coef["CLN_beta"] / V, coef["CLNP"] * rate, coef["CLNR"] * rate], axis=-1
+        )
+        N_d = (qbar * S * b)[:, None] * np.stack(
+            [np.zeros(V.size), np.zeros(V.size), coef["CLNDR"]], axis=-1
+        )
+        # [p', r'] = J^-1 [L, N]
+        det = Ixx * Izz - Ixz**2
+        inv = np.array([[Izz, Ixz], [Ixz, Ixx]]) / det
+
+        n = V.size
+        A = np.zeros((n, 4, 4))
+        B = np.zeros((n, 4, 3))
+        A[:, 0, :3] = Y + np.stack([np.zeros(n), w0, -u0], axis=-1)
+        A[:, 0, 3] = g * np.cos(theta0)
+        B[:, 0] = Y_d
+        A[:, 1, :3] = inv[0, 0] * L + inv[0, 1] * N
+        A[:, 2, :3] = inv[1, 0] * L + inv[1, 1] * N
+        B[:, 1] = inv[0, 0] * L_d + inv[0, 1] * N_d
+        B[:, 2] = inv[1, 0] * L_d + inv[1, 1] * N_d
+        A[:, 3, 1] = 1.0
+        A[:, 3, 2] = np.tan(theta0)
+        return StateSpace(A, B, LATERAL_STATES, LATERAL_INPUTS)
+
+    def linearize(self, mach, altitude_km, alpha_deg=0.0):
+        """(longitudinal, lateral) models sharing one atmosphere/aero evaluation."""
+        op = self.operating_points(mach, altitude_km, alpha_deg)
+        coef = self._coefficients(op)
+        return (
+            self.longitudinal(None, None, op=op, coef=coef),
+            self.lateral(None, None, op=op, coef=coef),
+        )
+
+    def envelope(self, mach, altitude_km, alpha_deg=0.0):
+        """
+        Models over the full grid ``mach x altitude_km``; returns the flat
+        (Mach, altitude) arrays followed by (longitudinal, lateral).
+        """
+        grid_mach, grid_alt = (g.ravel() for g in np.meshgrid(mach, altitude_km, indexing="ij"))
+        return (grid_mach, grid_alt) + self.linearize(grid_mach, grid_alt, alpha_deg)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   modal_analysis.py
+@Time    :   2026/10/18 17:52:30
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Stacked eigen-analysis of the linear models, mode tracking along
+             Mach and the flying qualities table.
+"""
+
+import itertools
+
+import numpy as np
+
+from . import aero_data
+from .linearization import LinearizationEngine
+
+# Slots of the tracked eigenvalues: a pair per oscillatory mode, one per real mode
+LONGITUDINAL_MODES = ("short_period", "short_period", "phugoid", "phugoid")
+LATERAL_MODES = ("dutch_roll", "dutch_roll", "roll_subsidence", "spiral")
+# Altitude of the stability results in flight_dynamics_data.hdf5
+DEFAULT_ALTITUDE_KM = 30.0
+
+
+def eigen(A):
+    """Eigenvalues ``(..., n)`` and eigenvectors ``(..., n, n)`` of stacked A."""
+    return np.linalg.eig(A)
+
+
+def _initial_order(eigenvalues, complex_first):
+    """
+    Order of the first point: roots by decreasing modulus, conjugates side by
+    side, the complex ones first when ``complex_first``. With the slots of
+    LONGITUDINAL_MODES (by modulus) and LATERAL_MODES (complex first) this
+    puts the short period before the phugoid and the Dutch roll before the
+    roll subsidence and the spiral.
+    """
+    real = _is_real(eigenvalues)
+    keys = (eigenvalues.imag, -np.abs(eigenvalues)) + ((real,) if complex_first else ())
+    return np.lexsort(keys, axis=-1)
+
+
+def _is_real(eigenvalues):
+    return np.abs(eigenvalues.imag) <= 1e-12 * np.maximum(np.abs(eigenvalues), 1.0)
+
+
+def seed_index(eigenvalues, n_real=None):
+    """
+    Index along K of the point where the modes are best told apart: the
+    smallest relative distance between two roots (conjugates excepted) is
+    the largest, over the points with ``n_real`` real roots when any has
+    (e.g. 2 for the lateral roll and spiral, not yet a complex pair), the
+    worst batch deciding.
+    """
+    values = np.asarray(eigenvalues)
+    n = values.shape[-1]
+    i, j = np.triu_indices(n, 1)
+    a, b = values[..., i], values[..., j]
+    distance = np.abs(a - b) / (np.abs(a) + np.abs(b) + 1e-12)
+    conjugates = np.isclose(a, np.conj(b), rtol=1e-9, atol=0.0) & (np.abs(a.imag) > 0)
+    separation = np.where(conjugates, np.inf, distance).min(axis=-1).min(axis=0)
+    if n_real is not None:
+        matches = (_is_real(values).sum(axis=-1) == n_real).all(axis=0)
+        if matches.any():
+            separation = np.where(matches, separation, -np.inf)
+    return int(np.argmax(separation))
+
+
+def track_modes(eigenvalues, eigenvectors=None, complex_first=False, seed=0):
+    """
+    Reorder the eigenvalues ``(B, K, n)`` along the K axis (Mach) so each
+    slot follows the same mode. The point ``seed`` is ordered first (see
+    ``seed_index``); from there, towards both ends, the permutation closest
+    (in relative distance) to the neighbour already ordered is chosen, all
+    batches at once (the n! permutations of a 4-state model are enumerated).
+    """
+    eigenvalues = np.array(eigenvalues)
+    n = eigenvalues.shape[-1]
+    perms = np.array(list(itertools.permutations(range(n))))
+    eigenvectors = None if eigenvectors is None else np.array(eigenvectors)
+
+    def reorder(k, order):
+        eigenvalues[:, k] = np.take_along_axis(eigenvalues[:, k], order, axis=-1)
+        if eigenvectors is not None:
+            eigenvectors[:, k] = np.take_along_axis(eigenvectors[:, k], order[:, None, :], axis=-1)
+
+    reorder(seed, _initial_order(eigenvalues[:, seed], complex_first))
+    steps = [(k, k - 1) for k in range(seed + 1, eigenvalues.shape[1])]
+    steps += [(k, k + 1) for k in range(seed - 1, -1, -1)]
+    for k, neighbour in steps:
+        previous = eigenvalues[:, neighbour][:, None, :]
+        candidates = eigenvalues[:, k][:, perms]
+        scale = np.abs(previous) + np.abs(candidates) + 1e-12
+        cost = (np.abs(candidates - previous) / scale).sum(axis=-1)
+        reorder(k, perms[np.argmin(cost, axis=-1)])
+    return eigenvalues, eigenvectors
+
+
+def mode_properties(eigenvalues, modes):
+    """
+    {mode_wn, mode_zeta, mode_period} of each pair, from the product and sum
+    of its two roots (valid also for a pair split in two real roots), and
+    {mode_tau} = -1/lambda of each real mode (negative when unstable).
+    """
+    properties = {}
+    for mode in dict.fromkeys(modes):
+        slots = [k for k, m in enumerate(modes) if m == mode]
+        if len(slots) == 2:
+            l1, l2 = eigenvalues[..., slots[0]], eigenvalues[..., slots[1]]
+            wn2 = (l1 * l2).real
+            wn = np.sqrt(np.abs(wn2))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                zeta = np.where(wn2 > 0, -(l1 + l2).real / (2.0 * wn), np.nan)
+                damped = np.abs(l1.imag)
+                period = np.where(damped > 0, 2.0 * np.pi / damped, np.inf)
+            properties[mode + "_wn"] = wn
+            properties[mode + "_zeta"] = zeta
+            properties[mode + "_period"] = period
+        else:
+            with np.errstate(divide="ignore"):
+                properties[mode + "_tau"] = -1.0 / eigenvalues[..., slots[0]].real
+    return properties
+
+
+class ModalAnalysis:
+    """
+    Modes of one vehicle over Mach (and altitude): the engine, with its
+    coefficient tables, is built once and reused for every call.
+    """
+
+    def __init__(self, vehicle, variant=None, engine=None):
+        self.vehicle = vehicle
+        self.engine = engine or LinearizationEngine(vehicle, variant)
+
+    def default_mach(self):
+        """The Mach points of derivatives_vs_mach inside the coefficient grid (outside it is clamped)."""
+        mach = np.unique(np.asarray(self.engine.derivatives["MACH"]))
+        grid = self.engine.database.axes[0]
+        return mach[(mach >= grid.min()) & (mach <= grid.max())]
+
+    def analyze(self, mach=None, altitude_km=DEFAULT_ALTITUDE_KM, alpha_deg=0.0):
+        """
+        Tracked eigenvalues and mode properties on the grid ``altitude x
+        mach`` (Mach sorted, tracking runs along Mach for every altitude).
+        Returns a dict of arrays of shape ``(n_altitude, n_mach)``.
+        """
+        mach = np.sort(np.atleast_1d(self.default_mach() if mach is None else mach))
+        altitude_km = np.atleast_1d(np.asarray(altitude_km, dtype=float))
+        grid_alt, grid_mach = np.meshgrid(altitude_km, mach, indexing="ij")
+        alpha = np.broadcast_to(np.asarray(alpha_deg, dtype=float), grid_mach.shape)
+        lon, lat = self.engine.linearize(grid_mach.ravel(), grid_alt.ravel(), alpha.ravel())
+        shape = grid_mach.shape
+        result = {"mach": grid_mach, "altitude_km": grid_alt, "alpha_deg": np.array(alpha)}
+        for name, model, modes in (("lon", lon, LONGITUDINAL_MODES), ("lat", lat, LATERAL_MODES)):
+            values, _ = eigen(model.A)
+            values = values.reshape(shape + (-1,))
+            n_real = sum(1 for mode in dict.fromkeys(modes) if modes.count(mode) == 1)
+            seed = seed_index(values, n_real)
+            values, _ = track_modes(values, complex_first=modes is LATERAL_MODES, seed=seed)
+            result.update(mode_properties(values, modes))
+            result["eigenvalues_" + name] = values
+        return result
+
+    def table(self, *args, **kwargs):
+        """Flying qualities as a DataFrame, one row per (altitude, Mach)."""
+        import pandas as pd
+
+        result = self.analyze(*args, **kwargs)
+        return pd.DataFrame(
+            {k: np.ravel(v) for k, v in result.items() if not k.startswith("eigenvalues")}
+        )
+
+
+def plot_modes(table, vehicle="", axes=None):
+    """Frequency/damping of the pairs and time constants of the real modes vs Mach."""
+    import matplotlib.pyplot as plt
+
+    if axes is None:
+        _, axes = plt.subplots(nrows=3, ncols=1, sharex=True)
+    for altitude, rows in table.groupby("altitude_km"):
+        label = "%s %g km" % (vehicle, altitude)
+        for mode in ("short_period", "phugoid", "dutch_roll"):
+            axes[0].plot(rows["mach"], rows[mode + "_wn"], label="%s %s" % (mode, label))
+            axes[1].plot(rows["mach"], rows[mode + "_zeta"], label="%s %s" % (mode, label))
+        for mode in ("roll_subsidence", "spiral"):
+            axes[2].plot(rows["mach"], rows[mode + "_tau"], label="%s %s" % (mode, label))
+    axes[0].set_ylabel(r"$\omega_n$ [rad/s]")
+    axes[1].set_ylabel(r"$\zeta$")
+    axes[2].set_ylabel(r"$\tau$ [s]")
+    axes[2].set_xlabel("Mach")
+    for ax in axes:
+        ax.legend(fontsize="x-small")
+    return axes
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Flying qualities table over Mach")
+    parser.add_argument("vehicles", nargs="*", default=sorted(aero_data.list_datasets()))
+    parser.add_argument("--altitude", type=float, nargs="+", default=[DEFAULT_ALTITUDE_KM])
+    parser.add_argument("--alpha", type=float, default=0.0)
+    parser.add_argument("-o", "--output", default=None, help="CSV (vehicle column added)")
+    parser.add_argument("--plot", default=None, help="figure file")
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    tables = []
+    for vehicle in args.vehicles:
+        frame = ModalAnalysis(vehicle).table(altitude_km=args.altitude, alpha_deg=args.alpha)
+        frame.insert(0, "vehicle", vehicle)
+        tables.append(frame)
+    result = pd.concat(tables, ignore_index=True)
+    if args.output:
+        result.to_csv(args.output, index=False)
+    else:
+        print(result.to_string(index=False))
+    if args.plot:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        fig, axes = plt.subplots(nrows=3, ncols=len(tables), sharex="col", squeeze=False)
+        for column, (vehicle, frame) in enumerate(zip(args.vehicles, tables)):
+            plot_modes(frame, vehicle, axes[:, column])
+        fig.savefig(args.plot)
@@ -0,0 +1,363 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   monte_carlo.py
+@Time    :   2026/10/18 19:48:55
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Monte Carlo dispersion campaigns: aero tables in shared memory,
+             seeded cases on a process pool and streaming statistics.
+"""
+
+import concurrent.futures
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from . import aero_data
+from .aero_database import AeroDatabase
+from .simulator import ALTITUDE, Simulator, VehicleModel, initial_state
+
+# Dispersions: parameter -> (kind, sigma); "relative" multiplies the nominal
+# value by (1 + sigma N(0, 1)), "absolute" adds sigma N(0, 1). Coefficient
+# names (CA, CN, CM, ...) are scale factors of the aerodynamic coefficients.
+DEFAULT_DISPERSIONS = {
+    "mass": ("relative", 0.02),
+    "xcg": ("absolute", 0.01),
+    "zcg": ("absolute", 0.005),
+    "Ixx": ("relative", 0.05),
+    "Iyy": ("relative", 0.05),
+    "Izz": ("relative", 0.05),
+    "CA": ("relative", 0.10),
+    "CN": ("relative", 0.05),
+    "CM": ("relative", 0.10),
+    "CY": ("relative", 0.10),
+    "CLL": ("relative", 0.10),
+    "CLN": ("relative", 0.10),
+}
+METRICS = ("flight_time", "downrange_km", "crossrange_km", "final_altitude_km",
+           "final_speed", "max_alpha_deg", "max_beta_deg", "max_rate")
+QUANTILES = (0.01, 0.05, 0.5, 0.95, 0.99)
+
+
+class SharedTables:
+    """
+    The dense coefficient grid and the derivative table of a vehicle placed
+    once in ``multiprocessing.shared_memory``. ``descriptor`` is the small
+    picklable handle the workers ``attach`` to; nothing is copied.
+    """
+
+    def __init__(self, vehicle, variant=None):
+        database = AeroDatabase.from_dataset(vehicle, variant)
+        derivatives = aero_data.load_derivatives(vehicle, variant)
+        self.blocks = []
+        grid = self._share(database.grid)
+        table = self._share(np.asarray(derivatives.data))
+        self.descriptor = {
+            "vehicle": vehicle,
+            "grid": grid,
+            "axes": [axis.tolist() for axis in database.axes],
+            "axis_names": database.axis_names,
+            "coefficients": database.coefficients,
+            "constants": database.constants,
+            "derivatives": table,
+            "derivative_columns": derivatives.keys(),
+        }
+
+    def _share(self, array):
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+        self.blocks.append(block)
+        return (block.name, array.shape, array.dtype.str)
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach(descriptor):
+    """(AeroDatabase, derivative ColumnTable, blocks) viewing the shared memory."""
+    blocks = []
+
+    def view(handle):
+        name, shape, dtype = handle
+        # the creator owns (and unlinks) the block; before Python 3.13 the
+        # attach can not opt out of the resource tracker
+        try:
+            block = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        return np.ndarray(shape, dtype, buffer=block.buf)
+
+    database = AeroDatabase.from_arrays(
+        view(descriptor["grid"]), descriptor["axes"], descriptor["axis_names"],
+        descriptor["coefficients"], descriptor["constants"],
+    )
+    derivatives = aero_data.ColumnTable(descriptor["derivative_columns"], view(descriptor["derivatives"]))
+    return database, derivatives, blocks
+
+
+def sample_cases(first, count, seed, dispersions, nominal):
+    """
+    Parameters of cases ``first .. first + count - 1``. Case k draws from
+    ``default_rng([seed, k])``, so a case is the same whatever batch or
+    worker runs it.
+    """
+    names = sorted(dispersions)
+    draws = np.array(
+        [np.random.default_rng([seed, k]).standard_normal(len(names)) for k in range(first, first + count)]
+    ).reshape(count, len(names))
+    cases = {}
+    for j, name in enumerate(names):
+        kind, sigma = dispersions[name]
+        base = nominal.get(name, 1.0)
+        cases[name] = base * (1.0 + sigma * draws[:, j]) if kind == "relative" else base + sigma * draws[:, j]
+    return cases
+
+
+class RunningStats:
+    """Streaming count, mean, variance (Welford), min and max of one metric."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+        n, mean = values.size, values.mean()
+        delta = mean - self.mean
+        total = self.count + n
+        self.m2 += ((values - mean) ** 2).sum() + delta**2 * self.count * n / total
+        self.mean += delta * n / total
+        self.count = total
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+class P2Quantile:
+    """P-square estimate of one quantile (Jain & Chlamtac) with five markers."""
+
+    def __init__(self, p):
+        self.p = p
+        self.heights = []
+        self.positions = np.arange(1.0, 6.0)
+        self.desired = np.array([1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0])
+        self.increments = np.array([0.0, p / 2, p, (1 + p) / 2, 1.0])
+
+    def update(self, values):
+        for x in np.asarray(values, dtype=float).ravel():
+            self._add(x)
+
+    def _add(self, x):
+        h = self.heights
+        if len(h) < 5:
+            h.append(x)
+            h.sort()
+            return
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if h[i] <= x < h[i + 1])
+        n = self.positions
+        n[k + 1:] += 1
+        self.desired += self.increments
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1.0 if d > 0 else -1.0
+                parabolic = h[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+                )
+                if h[i - 1] < parabolic < h[i + 1]:
+                    h[i] = parabolic
+                else:
+                    j = i + int(d)
+                    h[i] = h[i] + d * (h[j] - h[i]) / (n[j] - n[i])
+                n[i] += d
+
+    @property
+    def value(self):
+        h = self.heights
+        if len(h) < 5:
+            return float(np.quantile(h, self.p)) if h else np.nan
+        return h[2]
+
+
+class CampaignStatistics:
+    """RunningStats and P2 quantiles of every metric, updated batch by batch."""
+
+    def __init__(self, metrics=METRICS, quantiles=QUANTILES):
+        self.stats = {m: RunningStats() for m in metrics}
+        self.quantiles = {m: [P2Quantile(q) for q in quantiles] for m in metrics}
+
+    def update(self, results):
+        for name, values in results.items():
+            self.stats[name].update(values)
+            for sketch in self.quantiles[name]:
+                sketch.update(values)
+
+    def summary(self):
+        summary = {}
+        for name, s in self.stats.items():
+            row = {"count": s.count, "mean": float(s.mean), "std": float(s.std), "min": float(s.min), "max": float(s.max)}
+            row.update({"p%g" % (100 * q.p): float(q.value) for q in self.quantiles[name]})
+            summary[name] = row
+        return summary
+
+
+_worker = {}
+
+
+def _init_worker(descriptor):
+    database, derivatives, blocks = attach(descriptor)
+    _worker.update(database=database, derivatives=derivatives, blocks=blocks)
+
+
+def simulate_cases(database, derivatives, vehicle, first, count, seed, dispersions, scenario):
+    """
+    Integrate cases ``first .. first + count - 1`` as one vectorized
+    ensemble and reduce each trajectory to METRICS while it runs.
+    """
+    nominal = aero_data.load_mass_properties(vehicle)
+    cases = sample_cases(first, count, seed, dispersions, nominal)
+    mass_properties = {k: v for k, v in cases.items() if k in nominal and k not in ("xcg", "zcg")}
+    cg = (cases.get("xcg", nominal["xcg"]), cases.get("zcg", nominal["zcg"]))
+    scale = {k: v for k, v in cases.items() if k in aero_data.COEFFICIENT_COLUMNS}
+    deflection = np.asarray(scenario.get("deflection_rad", (0.0, 0.0, 0.0)), dtype=float)
+    model = VehicleModel(
+        vehicle, database=database, derivatives=derivatives, mass_properties=mass_properties,
+        cg=cg, coefficient_scale=scale,
+        control=lambda t, x: np.broadcast_to(deflection, (x.shape[0], 3)),
+    )
+    x0 = initial_state(scenario["mach"], scenario["altitude_km"], scenario.get("alpha_deg", 0.0))
+    x0 = np.repeat(x0, count, axis=0) if x0.shape[0] == 1 else x0
+    flight_time = np.zeros(count)
+    extremes = np.zeros((3, count))
+
+    def reduce(t, x, active):
+        alpha = np.degrees(np.abs(np.arctan2(x[:, 2], x[:, 0])))
+        speed = np.linalg.norm(x[:, :3], axis=1)
+        beta = np.degrees(np.abs(np.arcsin(np.clip(x[:, 1] / speed, -1.0, 1.0))))
+        rate = np.linalg.norm(x[:, 3:6], axis=1)
+        np.maximum(extremes, np.where(active, [alpha, beta, rate], extremes), out=extremes)
+        flight_time[active] = t
+
+    simulator = Simulator(model, scenario.get("method", "rk4"), scenario.get("dt", 0.01))
+    _, x, _ = simulator.run(x0, scenario["t_final"], callback=reduce)
+    return {
+        "flight_time": flight_time,
+        "downrange_km": x[:, 9] / 1000.0,
+        "crossrange_km": x[:, 10] / 1000.0,
+        "final_altitude_km": -x[:, ALTITUDE] / 1000.0,
+        "final_speed": np.linalg.norm(x[:, :3], axis=1),
+        "max_alpha_deg": extremes[0],
+        "max_beta_deg": extremes[1],
+        "max_rate": extremes[2],
+    }
+
+
+def trimmed_scenario(vehicle, scenario, variant=None):
+    """``scenario`` with alpha_deg and the symmetric elevon deflection of the nominal trim."""
+    from .trim import trim_grid
+
+    trim = trim_grid(vehicle, scenario["mach"], scenario["altitude_km"], variant=variant, processes=1)
+    if not trim["converged"][0]:
+        raise ValueError("Sem trimagem em Mach %g, %g km" % (scenario["mach"], scenario["altitude_km"]))
+    delta = float(trim["delta_rad"][0])
+    return dict(scenario, alpha_deg=float(trim["alpha_deg"][0]), deflection_rad=(delta, delta, 0.0))
+
+
+def _run_batch(args):
+    return simulate_cases(_worker["database"], _worker["derivatives"], *args)
+
+
+def run_campaign(vehicle, n_cases, scenario, dispersions=None, seed=0, batch_size=64,
+                 processes=None, variant=None, on_batch=None):
+    """
+    Simulate ``n_cases`` dispersed cases of ``scenario`` (dict with mach,
+    altitude_km, t_final and optionally alpha_deg, deflection_rad, method,
+    dt; see trimmed_scenario) in batches of ``batch_size`` on a process pool sharing one copy of
+    the tables. Only the per-case metrics come back; they update a
+    CampaignStatistics and are passed to ``on_batch(first, metrics)`` (e.g.
+    to append them to a file) and then dropped. Returns the statistics.
+    """
+    dispersions = DEFAULT_DISPERSIONS if dispersions is None else dispersions
+    statistics = CampaignStatistics()
+    batches = [
+        (vehicle, first, min(batch_size, n_cases - first), seed, dispersions, scenario)
+        for first in range(0, n_cases, batch_size)
+    ]
+    with SharedTables(vehicle, variant) as tables:
+        workers = processes or min(os.cpu_count() or 1, len(batches))
+        with concurrent.futures.ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(tables.descriptor,)
+        ) as pool:
+            futures = {pool.submit(_run_batch, batch): batch[1] for batch in batches}
+            for future in concurrent.futures.as_completed(futures):
+                metrics = future.result()
+                statistics.update(metrics)
+                if on_batch is not None:
+                    on_batch(futures[future], metrics)
+    return statistics
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Monte Carlo dispersion campaign")
+    parser.add_argument("vehicle")
+    parser.add_argument("-n", "--cases", type=int, default=256)
+    parser.add_argument("--mach", type=float, default=6.0)
+    parser.add_argument("--altitude", type=float, default=30.0)
+    parser.add_argument("--time", type=float, default=10.0, help="flight time [s]")
+    parser.add_argument("--dt", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("-j", "--processes", type=int, default=None)
+    parser.add_argument("-o", "--output", default=None, help="CSV with the metrics of every case")
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    scenario = trimmed_scenario(
+        args.vehicle, {"mach": args.mach, "altitude_km": args.altitude, "t_final": args.time, "dt": args.dt}
+    )
+    on_batch = None
+    if args.output:
+        if os.path.exists(args.output):
+            os.remove(args.output)
+
+        def on_batch(first, metrics):
+            frame = pd.DataFrame(metrics)
+            frame.insert(0, "case", np.arange(first, first + len(frame)))
+            frame.to_csv(args.output, mode="a", index=False, header=not os.path.exists(args.output))
+
+    statistics = run_campaign(
+        args.vehicle, args.cases, scenario, seed=args.seed, batch_size=args.batch,
+        processes=args.processes, on_batch=on_batch,
+    )
+    print(pd.DataFrame(statistics.summary()).T.to_string())
@@ -0,0 +1,410 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   simulator.py
+@Time    :   2026/10/18 19:02:37
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   6-DOF simulation of ensembles of the 14x/hxi vehicles with fixed
+             step (RK4) or adaptive (Dormand-Prince 5(4)) integration and
+             chunked output to HDF5 or .npy files.
+"""
+
+import concurrent.futures
+import glob
+import os
+
+import numpy as np
+
+from . import aero_data, atmosphere, equations_of_motion
+from .aero_database import AeroDatabase
+
+N_STATES = len(equations_of_motion.STATES)
+ALTITUDE = equations_of_motion.STATES.index("z_d")
+CONTROLS = ("delta_elevon_l", "delta_elevon_r", "delta_rudder")
+# Damping and control derivatives used by the simulator (missing ones are zero)
+DERIVATIVES = (
+    "CNQ", "CMQ", "CYP", "CYR", "CLLP", "CLLR", "CLNP", "CLNR",
+    "CNDEL", "CNDER", "CMDEL", "CMDER", "CLLDEL", "CLLDER", "CYDR", "CLNDR", "CLLDR",
+)
+# Force and moment coefficients in the order of equations_of_motion.INPUTS (X Y Z L M N)
+FORCE_COEFFICIENTS = ("CA", "CY", "CN", "CLL", "CM", "CLN")
+CA, CY, CN, CLL, CM, CLN = range(len(FORCE_COEFFICIENTS))
+(CNQ, CMQ, CYP, CYR, CLLP, CLLR, CLNP, CLNR,
+ CNDEL, CNDER, CMDEL, CMDER, CLLDEL, CLLDER, CYDR, CLNDR, CLLDR) = range(len(DERIVATIVES))
+CHUNK_SIZE = 1024
+
+
+class VehicleModel:
+    """
+    Aerodynamic forces and moments and the state derivative of an ensemble
+    of ``E`` vehicles. Mass, inertia, CG and ``coefficient_scale``
+    ({coefficient: factor}) may be scalars or ``(E,)`` arrays, so dispersed
+    cases are integrated together. The coefficient tables are referred to
+    the CG of mass_properties.csv (``reference_cg``). ``derivatives`` may be
+    a DerivativeSpline (aero_data.load_derivative_spline) for derivatives
+    cubic in Mach instead of linear.
+    """
+
+    def __init__(self, vehicle, variant=None, database=None, derivatives=None,
+                 mass_properties=None, cg=None, coefficient_scale=None, control=None):
+        self.vehicle = vehicle
+        self.database = database or AeroDatabase.from_dataset(vehicle, variant)
+        self.derivatives = derivatives or aero_data.load_derivatives(vehicle, variant)
+        reference = aero_data.load_mass_properties(vehicle)
+        self.mass_properties = dict(reference, **(mass_properties or {}))
+        self.reference_cg = (reference["xcg"], reference["zcg"])
+        self.cg = cg or (self.mass_properties["xcg"], self.mass_properties["zcg"])
+        self.coefficient_scale = coefficient_scale or {}
+        # control(t, state) -> (E, 3) CONTROLS deflections in rad; None keeps them at zero
+        self.control = control
+        self._dynamics = equations_of_motion.functions().dynamics
+        self._prepare()
+
+    def _prepare(self):
+        """
+        Everything ``forces`` needs that does not depend on the state, by
+        position: the database columns of FORCE_COEFFICIENTS, the derivative
+        table on its Mach grid, the scale factors, the CG shift of the moments
+        and the factors from coefficients to forces. Call again after
+        changing the mass properties, the CG or the scale.
+        """
+        mp = self.mass_properties
+        self._columns = [self.database.coefficients.index(name) for name in FORCE_COEFFICIENTS]
+        if isinstance(self.derivatives, aero_data.DerivativeSpline):
+            self._mach_grid = None
+        else:
+            self._mach_grid = np.unique(np.asarray(self.derivatives["MACH"]))
+            self._derivative_values = aero_data.interpolate_derivatives(
+                self.derivatives, self._mach_grid, DERIVATIVES
+            )
+        factors = [np.asarray(self.coefficient_scale.get(name, 1.0), dtype=float)
+                   for name in FORCE_COEFFICIENTS]
+        self._scale = np.stack(np.broadcast_arrays(*factors), axis=-1) if self.coefficient_scale else None
+        displacement = {"x": self.cg[0] - self.reference_cg[0], "z": self.cg[1] - self.reference_cg[1]}
+        self._shift = [
+            (FORCE_COEFFICIENTS.index(moment), FORCE_COEFFICIENTS.index(force),
+             sign * displacement[axis] / (mp["c"] if moment == "CM" else mp["b"]))
+            for moment, force, axis, sign in aero_data.MOMENT_TRANSFER
+            if moment in FORCE_COEFFICIENTS and force in FORCE_COEFFICIENTS
+        ]
+        self._force_factor = mp["reference_area"] * np.array(
+            [-1.0, 1.0, -1.0, mp["b"], mp["c"], mp["b"]]
+        )
+        self._parameters = [np.asarray(mp[name], dtype=float)
+                            for name in equations_of_motion.PARAMETERS[:-1]]
+
+    def _interpolate_derivatives(self, mach):
+        """``(len(DERIVATIVES), E)`` at ``mach`` (linear on the prepared grid, or the spline)."""
+        if self._mach_grid is None:
+            return self.derivatives(mach, DERIVATIVES)
+        grid, values = self._mach_grid, self._derivative_values
+        i = np.clip(np.searchsorted(grid, mach, side="right") - 1, 0, grid.size - 2)
+        t = np.clip((mach - grid[i]) / (grid[i + 1] - grid[i]), 0.0, 1.0)
+        out = values[:, i + 1] - values[:, i]
+        out *= t
+        out += values[:, i]
+        return out
+
+    def forces(self, t, state):
+        """
+        Body forces and moments ``(E, 6)`` and the air data of the states as
+        ``(mach, alpha, beta, qbar, g)``. The coefficients are kept in one
+        ``(E, 6)`` array in FORCE_COEFFICIENTS order, updated in place.
+        """
+        u, v, w, p, q, r = (state[:, k] for k in range(6))
+        altitude_km = np.maximum(-state[:, ALTITUDE] / 1000.0, 0.0)
+        air = atmosphere.get_properties(altitude_km)
+        speed = np.sqrt(u * u + v * v + w * w)
+        mach = speed / air["speed_of_sound_m_s"]
+        alpha = np.arctan2(w, u)
+        beta = np.arcsin(np.clip(v / speed, -1.0, 1.0))
+        qbar = 0.5 * air["density_kg_m3"] * speed**2
+        c = self.database.evaluate(mach, np.degrees(alpha), np.degrees(beta))[:, self._columns]
+        d = self._interpolate_derivatives(mach)
+        mp = self.mass_properties
+        long_rate = q * (mp["c"] / 2.0) / speed
+        p_hat = p * (mp["b"] / 2.0) / speed
+        r_hat = r * (mp["b"] / 2.0) / speed
+        c[:, CN] += d[CNQ] * long_rate
+        c[:, CM] += d[CMQ] * long_rate
+        c[:, CY] += d[CYP] * p_hat + d[CYR] * r_hat
+        c[:, CLL] += d[CLLP] * p_hat + d[CLLR] * r_hat
+        c[:, CLN] += d[CLNP] * p_hat + d[CLNR] * r_hat
+        if self.control is not None:
+            left, right, rudder = np.asarray(self.control(t, state), dtype=float).T
+            c[:, CN] += d[CNDEL] * left + d[CNDER] * right
+            c[:, CM] += d[CMDEL] * left + d[CMDER] * right
+            c[:, CLL] += d[CLLDEL] * left + d[CLLDER] * right + d[CLLDR] * rudder
+            c[:, CY] += d[CYDR] * rudder
+            c[:, CLN] += d[CLNDR] * rudder
+        if self._scale is not None:
+            c *= self._scale
+        # moments about the CG (the force columns are not changed by the shift)
+        for moment, force, factor in self._shift:
+            c[:, moment] += c[:, force] * factor
+        c *= qbar[:, None]
+        c *= self._force_factor
+        return c, (mach, alpha, beta, qbar, atmosphere.GZERO * air["g_ratio_to_sea_level"])
+
+    def derivative(self, t, state, out):
+        """Write x' of ``state`` ``(E, 12)`` into ``out``."""
+        forces, (_, _, _, _, g) = self.forces(t, state)
+        args = [state[:, k] for k in range(N_STATES)] + [forces[:, k] for k in range(6)]
+        args += self._parameters
+        args.append(g)
+        np.copyto(out, self._dynamics(*args)[..., 0])
+        return out
+
+
+def initial_state(mach, altitude_km, alpha_deg=0.0, beta_deg=0.0, heading_deg=0.0,
+                  flight_path_deg=0.0):
+    """States ``(E, 12)`` of wings-level flight at the broadcast conditions."""
+    mach, altitude_km, alpha, beta, psi, gamma = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(v, dtype=float)) for v in
+          (mach, altitude_km, np.radians(alpha_deg), np.radians(beta_deg),
+           np.radians(heading_deg), np.radians(flight_path_deg)))
+    )
+    speed = mach * atmosphere.get_properties(altitude_km)["speed_of_sound_m_s"]
+    state = np.zeros(mach.shape + (N_STATES,))
+    state[:, 0] = speed * np.cos(alpha) * np.cos(beta)
+    state[:, 1] = speed * np.sin(beta)
+    state[:, 2] = speed * np.sin(alpha) * np.cos(beta)
+    state[:, 7] = alpha + gamma
+    state[:, 8] = psi
+    state[:, ALTITUDE] = -altitude_km * 1000.0
+    return state
+
+
+class HDF5Writer:
+    """Append chunks of (times, states) to resizable datasets ``t`` and ``x``."""
+
+    def __init__(self, file_path, n_members, n_states=N_STATES, chunk_size=CHUNK_SIZE):
+        import h5py
+
+        self.file = h5py.File(file_path, "w")
+        self.t = self.file.create_dataset(
+            "t", (0,), dtype="f8", maxshape=(None,), chunks=(chunk_size,)
+        )
+        # HDF5 chunks of about 1 MB at most, whatever the ensemble size
+        rows = max(1, min(chunk_size, (1 << 17) // (n_members * n_states)))
+        self.x = self.file.create_dataset(
+            "x", (0, n_members, n_states), dtype="f8", maxshape=(None, n_members, n_states),
+            chunks=(rows, n_members, n_states), compression="gzip", shuffle=True,
+        )
+        self.x.attrs["states"] = list(equations_of_motion.STATES)
+
+    def write(self, times, states):
+        n = self.t.shape[0]
+        self.t.resize((n + len(times),))
+        self.x.resize((n + len(times),) + self.x.shape[1:])
+        self.t[n:] = times
+        self.x[n:] = states
+
+    def close(self):
+        self.file.close()
+
+
+class NpyWriter:
+    """Each chunk as ``<directory>/t_<k>.npy`` and ``x_<k>.npy``; see ``load_npy``."""
+
+    def __init__(self, directory, *args, **kwargs):
+        self.directory = directory
+        self.count = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, times, states):
+        np.save(os.path.join(self.directory, "t_%06d.npy" % self.count), times)
+        np.save(os.path.join(self.directory, "x_%06d.npy" % self.count), states)
+        self.count += 1
+
+    def close(self):
+        pass
+
+
+def load_npy(directory):
+    """(times, states) of a run written by NpyWriter."""
+    parts = sorted(glob.glob(os.path.join(directory, "t_*.npy")))
+    times = [np.load(p) for p in parts]
+    states = [
+        np.load(os.path.join(directory, "x_" + os.path.basename(p)[2:])) for p in parts
+    ]
+    return np.concatenate(times), np.concatenate(states)
+
+
+# Dormand-Prince 5(4) tableau
+DP_C = np.array([0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0])
+DP_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    [35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+]
+DP_B = np.array([35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0.0])
+DP_E = DP_B - np.array([5179 / 57600, 0.0, 7571 / 16695, 393 / 640,
+                        -92097 / 339200, 187 / 2100, 1 / 40])
+
+
+class Simulator:
+    """
+    Integrate ``model`` for an ensemble of initial states ``(E, 12)``.
+
+    All stage and output buffers are allocated once; the output is kept in a
+    ``chunk_size`` buffer that is handed to ``writer`` (HDF5Writer/NpyWriter)
+    when full, so memory does not grow with the run. Members that reach the
+    ground stop (their state is frozen). The adaptive mode uses one step
+    size for the whole ensemble (the largest error decides).
+    """
+
+    def __init__(self, model, method="rk4", dt=0.01, rtol=1e-6, atol=1e-6,
+                 max_dt=1.0, chunk_size=CHUNK_SIZE):
+        if method not in ("rk4", "dopri5"):
+            raise ValueError("method deve ser 'rk4' ou 'dopri5'")
+        self.model = model
+        self.method = method
+        self.dt = dt
+        self.rtol = rtol
+        self.atol = atol
+        self.max_dt = max_dt
+        self.chunk_size = chunk_size
+
+    def _allocate(self, n_members):
+        shape = (n_members, N_STATES)
+        self.k = np.zeros((7,) + shape)
+        self.stage = np.zeros(shape)
+        self.error = np.zeros(shape)
+        self.next_state = np.zeros(shape)
+        self.out_t = np.zeros(self.chunk_size)
+        self.out_x = np.zeros((self.chunk_size,) + shape)
+
+    def _rk4(self, t, x, dt):
+        k, s, f = self.k, self.stage, self.model.derivative
+        f(t, x, k[0])
+        np.multiply(k[0], 0.5 * dt, out=s)
+        s += x
+        f(t + 0.5 * dt, s, k[1])
+        np.multiply(k[1], 0.5 * dt, out=s)
+        s += x
+        f(t + 0.5 * dt, s, k[2])
+        np.multiply(k[2], dt, out=s)
+        s += x
+        f(t + dt, s, k[3])
+        np.add(k[1], k[2], out=s)
+        s *= 2.0
+        s += k[0]
+        s += k[3]
+        s *= dt / 6.0
+        np.add(x, s, out=self.next_state)
+        return dt
+
+    def _dopri5(self, t, x, dt, fsal):
+        k, s, f = self.k, self.stage, self.model.derivative
+        if not fsal:
+            f(t, x, k[0])
+        while True:
+            for i in range(1, 7):
+                np.copyto(s, x)
+                for j, a in enumerate(DP_A[i]):
+                    if a:
+                        s += (dt * a) * k[j]
+                f(t + DP_C[i] * dt, s, k[i])
+            np.copyto(self.next_state, s)
+            self.error.fill(0.0)
+            for j, e in enumerate(DP_E):
+                if e:
+                    self.error += (dt * e) * k[j]
+            scale = self.atol + self.rtol * np.maximum(np.abs(x), np.abs(self.next_state))
+            norm = np.sqrt(np.mean((self.error / scale) ** 2))
+            factor = 0.9 * norm ** -0.2 if norm > 0 else 5.0
+            if norm <= 1.0:
+                # (step taken, step proposed for the next one)
+                return dt, min(dt * min(5.0, factor), self.max_dt)
+            dt *= max(0.2, factor)
+
+    def run(self, x0, t_final, writer=None, t0=0.0, every=1, callback=None):
+        """
+        Integrate from ``x0`` to ``t_final``; every ``every`` steps (and at
+        the last one) the state goes to the output buffer and ``callback(t, states, active)``, when
+        given, is called after each step (e.g. to reduce a trajectory on the
+        fly). Returns the final (t, states, active).
+        """
+        x = np.array(x0, dtype=float)
+        self._allocate(x.shape[0])
+        active = np.ones(x.shape[0], dtype=bool)
+        t, n_out, step = t0, 0, 0
+        fsal = False
+        # the adaptive step lives in the run: self.dt is always the initial one
+        step_size = self.dt
+
+        def emit(t, x):
+            nonlocal n_out
+            self.out_t[n_out] = t
+            self.out_x[n_out] = x
+            n_out += 1
+            if n_out == self.chunk_size:
+                if writer is not None:
+                    writer.write(self.out_t, self.out_x)
+                n_out = 0
+
+        emit(t, x)
+        while t < t_final - 1e-12 and active.any():
+            dt = min(step_size, t_final - t)
+            if self.method == "rk4":
+                taken = self._rk4(t, x, dt)
+            else:
+                taken, step_size = self._dopri5(t, x, dt, fsal)
+            # the members on the ground keep their last state
+            grounded = self.next_state[:, ALTITUDE] > 0.0
+            active &= ~grounded
+            x[active] = self.next_state[active]
+            if self.method == "dopri5":
+                # last stage is the derivative at the new state (FSAL)
+                np.copyto(self.k[0], self.k[6])
+                fsal = active.all()
+            t += taken
+            step += 1
+            if callback is not None:
+                callback(t, x, active)
+            if step % every == 0:
+                emit(t, x)
+        if step % every:  # the final state is always in the output
+            emit(t, x)
+        if writer is not None and n_out:
+            writer.write(self.out_t[:n_out], self.out_x[:n_out])
+        return t, x, active
+
+
+def _simulate_slice(args):
+    (vehicle, variant, x0, t_final, method, dt, output, writer_kind, every, model_kwargs) = args
+    model = VehicleModel(vehicle, variant, **model_kwargs)
+    writer = (HDF5Writer if writer_kind == "hdf5" else NpyWriter)(output, x0.shape[0])
+    try:
+        return Simulator(model, method, dt).run(x0, t_final, writer, every=every)
+    finally:
+        writer.close()
+
+
+def run_ensemble(vehicle, x0, t_final, output, variant=None, method="rk4", dt=0.01,
+                 writer_kind="hdf5", every=1, processes=None, model_kwargs=None):
+    """
+    Simulate the initial states ``x0`` ``(E, 12)`` split in ``processes``
+    vectorized sub-ensembles (one per worker, each written to
+    ``<output>_<k>.h5`` or ``<output>_<k>/``). ``model_kwargs`` must hold
+    scalars only; per-member dispersions belong to VehicleModel directly.
+    Returns the final (t, states, active) of each sub-ensemble.
+    """
+    processes = processes or os.cpu_count() or 1
+    parts = np.array_split(np.asarray(x0, dtype=float), processes)
+    suffix = ".h5" if writer_kind == "hdf5" else ""
+    jobs = [
+        (vehicle, variant, part, t_final, method, dt, "%s_%d%s" % (output, k, suffix),
+         writer_kind, every, model_kwargs or {})
+        for k, part in enumerate(parts) if len(part)
+    ]
+    if len(jobs) == 1:
+        return [_simulate_slice(jobs[0])]
+    with concurrent.futures.ProcessPoolExecutor(len(jobs)) as pool:
+        return list(pool.map(_simulate_slice, jobs))
@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   tracing.py
+@Time    :   2026/10/19 00:05:31
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Timing spans of the build and analysis stages (duration, inputs,
+             peak RSS) appended to the trace file named by $EAHC_TRACE, its
+             export to the Chrome trace format and a summary of the slowest
+             stages. Without $EAHC_TRACE every span is a no-op.
+
+             Standalone (no relative imports): the glossary, figure and TeX
+             scripts import it from this folder and the Makefile runs it as a
+             script (``tracing.py run --name pdflatex -- pdflatex ...``).
+"""
+
+import argparse
+import contextlib
+import functools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+TRACE_ENV = "EAHC_TRACE"
+SAMPLE_INTERVAL = 0.05  # s between RSS samples
+
+_psutil = []
+
+
+def _load_psutil():
+    """psutil, imported on the first traced span (None when missing: timing only)."""
+    if not _psutil:
+        try:
+            import psutil
+        except ImportError:
+            psutil = None
+        _psutil.append(psutil)
+    return _psutil[0]
+
+
+def trace_file():
+    """Path of the trace, None when tracing is off."""
+    return os.environ.get(TRACE_ENV) or None
+
+
+def enable(file_path):
+    """Trace to ``file_path`` from now on (inherited by the subprocesses)."""
+    os.environ[TRACE_ENV] = os.path.abspath(file_path)
+
+
+class _PeakRSS(threading.Thread):
+    """
+    Samples the RSS of a process until stopped; ``peak`` in bytes.
+    ``children``: False (the process), True (with its children) or "only".
+    """
+
+    def __init__(self, pid, children=False, interval=SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.psutil = _load_psutil()
+        self.process = self.psutil.Process(pid)
+        self.children = children
+        self.interval = interval
+        self.peak = 0
+        self._done = threading.Event()
+
+    def sample(self):
+        error = self.psutil.Error
+        try:
+            processes = [] if self.children == "only" else [self.process]
+            if self.children:
+                processes += self.process.children(recursive=True)
+            rss = 0
+            for process in processes:
+                try:
+                    rss += process.memory_info().rss
+                except error:
+                    pass
+            self.peak = max(self.peak, rss)
+        except error:
+            pass
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self.sample()
+        self._done.set()
+        self.join()
+        return self.peak
+
+
+def write_event(event, file_path=None):
+    """Append one event (a JSON line; short appends keep concurrent processes apart)."""
+    file_path = file_path or trace_file()
+    if file_path is None:
+        return
+    with open(file_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(event, default=str) + "\n")
+
+
+class span(contextlib.ContextDecorator):
+    """
+    Time a stage as ``with span("glossaries", files=...):`` or as the
+    decorator ``@span("render")``. ``inputs`` are stored with the event;
+    ``set(**values)`` adds results from inside the block. The peak RSS is
+    that of ``pid`` (default: this process), with its children when
+    ``children`` is True, of the children alone when it is "only".
+    """
+
+    def __init__(self, name, category="stage", pid=None, children=False, **inputs):
+        self.name = name
+        self.category = category
+        self.inputs = inputs
+        self.pid = pid
+        self.children = children
+
+    def set(self, **values):
+        self.inputs.update(values)
+
+    def __enter__(self):
+        self.file_path = trace_file()
+        if self.file_path is None:
+            return self
+        self.sampler = None
+        if _load_psutil() is not None:
+            self.sampler = _PeakRSS(self.pid or os.getpid(), self.children)
+            self.sampler.start()
+        self.ts = time.time_ns() // 1000
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.file_path is None:
+            return False
+        duration = time.perf_counter() - self.start
+        args = dict(self.inputs)
+        if self.sampler is not None:
+            peak = self.sampler.stop()
+            if peak:  # 0: the process ended before the first sample
+                args["peak_rss_mb"] = round(peak / 2**20, 1)
+        if exc_type is not None:
+            args["error"] = "%s: %s" % (exc_type.__name__, exc)
+        write_event({
+            "name": self.name, "cat": self.category, "ph": "X", "ts": self.ts,
+            "dur": int(duration * 1e6), "pid": os.getpid(), "tid": threading.get_ident() % 2**31,
+            "args": args,
+        }, self.file_path)
+        return False
+
+    # a fresh instance per call, so a decorated function can recurse or run in threads
+    def _recreate_cm(self):
+        return span(self.name, self.category, self.pid, self.children, **self.inputs)
+
+
+def traced(name=None, category="stage"):
+    """Decorator: a span named after the function (module.qualname) by default."""
+
+    def decorate(function):
+        label = name or "%s.%s" % (function.__module__, function.__qualname__)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(label, category):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def run(command, name=None, inputs=None, **kwargs):
+    """
+    ``subprocess.run(command, **kwargs)`` inside a span of category
+    "subprocess"; the peak RSS is that of the children of this process (the
+    command and whatever it starts).
+    """
+    name = name or os.path.basename(str(command[0] if not isinstance(command, str) else command.split()[0]))
+    with span(name, "subprocess", children="only",
+              command=command if isinstance(command, str) else " ".join(map(str, command)),
+              **(inputs or {})) as current:
+        result = subprocess.run(command, **kwargs)
+        current.set(returncode=result.returncode)
+        return result
+
+
+# --- reading the trace ------------------------------------------------------
+
+
+def read_events(file_path):
+    events = []
+    with open(file_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:  # a line cut by a killed process
+                    continue
+    return events
+
+
+def export_chrome(file_path, output):
+    """Chrome trace (chrome://tracing, Perfetto) of the JSON lines trace."""
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": read_events(file_path), "displayTimeUnit": "ms"}, f)
+
+
+def summarize(events, top=15):
+    """Rows (name, category, count, total s, mean s, max s, peak RSS MB) by decreasing total."""
+    groups = {}
+    for event in events:
+        row = groups.setdefault(event["name"], [event.get("cat", ""), 0, 0.0, 0.0, None])
+        seconds = event["dur"] / 1e6
+        row[1] += 1
+        row[2] += seconds
+        row[3] = max(row[3], seconds)
+        rss = event.get("args", {}).get("peak_rss_mb")
+        if rss is not None:
+            row[4] = rss if row[4] is None else max(row[4], rss)
+    rows = [(name, cat, n, total, total / n, longest, rss) for name, (cat, n, total, longest, rss) in groups.items()]
+    return sorted(rows, key=lambda row: -row[3])[:top]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stage timing traces ($%s)." % TRACE_ENV)
+    commands = parser.add_subparsers(dest="command", required=True)
+    summary = commands.add_parser("summary", help="slowest stages of a trace")
+    summary.add_argument("trace", nargs="?", default=trace_file())
+    summary.add_argument("-n", "--top", type=int, default=15)
+    export = commands.add_parser("export", help="Chrome trace JSON")
+    export.add_argument("trace", nargs="?", default=trace_file())
+    export.add_argument("-o", "--output", required=True)
+    wrap = commands.add_parser("run", help="run a command inside a span")
+    wrap.add_argument("--name", default=None)
+    wrap.add_argument("argv", nargs=argparse.REMAINDER)
+    commands.add_parser("clear", help="empty the trace of $%s" % TRACE_ENV)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        argv = args.argv[1:] if args.argv[:1] == ["--"] else args.argv
+        if not argv:
+            parser.error("run: sem comando")
+        try:
+            sys.exit(run(argv, args.name).returncode)
+        except OSError as err:
+            print("%s: %s" % (argv[0], err.strerror), file=sys.stderr)
+            sys.exit(127)
+    if args.command == "clear":
+        if trace_file() and os.path.exists(trace_file()):
+            os.remove(trace_file())
+        sys.exit(0)
+    if not args.trace:
+        parser.error("trace file: argument or $%s" % TRACE_ENV)
+    if args.command == "export":
+        export_chrome(args.trace, args.output)
+    else:
+        rows = summarize(read_events(args.trace), args.top)
+        print("%-32s %-10s %5s %10s %10s %10s %9s" % ("stage", "category", "n", "total s", "mean s", "max s", "RSS MB"))
+        for name, cat, n, total, mean, longest, rss in rows:
+            print("%-32s %-10s %5d %10.3f %10.3f %10.3f %9s" % (
+                name[:32], cat, n, total, mean, longest, "-" if rss is None else "%.1f" % rss))
@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   trim.py
+@Time    :   2026/10/18 18:20:14
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Batched trim (alpha, symmetric elevon) for straight and level
+             flight over Mach x altitude x CG grids.
+"""
+
+import concurrent.futures
+import os
+
+import numpy as np
+
+from . import aero_data, atmosphere
+from .aero_database import AeroDatabase
+
+ALPHA_STEP_DEG = 0.01
+TOLERANCE = 1e-8
+MAX_ITERATIONS = 30
+# Newton steps are limited to keep alpha inside the coefficient grid
+MAX_ALPHA_STEP_DEG = 5.0
+# Bound of the elevon deflection searched by the fallback solver
+MAX_DEFLECTION_RAD = np.pi / 2
+
+
+class TrimModel:
+    """
+    Residuals of the level flight trim of one vehicle:
+
+        (CN cos(alpha) - CA sin(alpha)) qbar S - m g = 0
+        CM = 0
+
+    with CN = CN(M, alpha) + (CNDEL + CNDER) delta and CM likewise, delta the
+    symmetric elevon deflection (rad). The moments are transferred to the CG
+    of each point with aero_data.shift_moments, the tables being referred to
+    the xcg/zcg of mass_properties.csv; a CG sweep needs no extra tables.
+    """
+
+    def __init__(self, vehicle, variant=None, mass=None):
+        self.vehicle = vehicle
+        self.variant = variant
+        self.database = AeroDatabase.from_dataset(vehicle, variant)
+        self.derivatives = aero_data.load_derivatives(vehicle, variant)
+        self.mass = dict(aero_data.load_mass_properties(vehicle))
+        if mass is not None:
+            self.mass["mass"] = mass
+        self.alpha_range = (
+            self.database.axes[self.database.axis_names.index("ALPHA_DEG")][[0, -1]]
+        )
+
+    def conditions(self, mach, altitude_km, cg_x=None, cg_z=None):
+        """Flight condition arrays (broadcast and flattened) of the batch."""
+        cg_x = self.mass["xcg"] if cg_x is None else cg_x
+        cg_z = self.mass["zcg"] if cg_z is None else cg_z
+        mach, altitude_km, cg_x, cg_z = (
+            np.ravel(v) for v in np.broadcast_arrays(
+                *(np.asarray(v, dtype=float) for v in (mach, altitude_km, cg_x, cg_z))
+            )
+        )
+        air = atmosphere.get_properties(altitude_km)
+        speed = mach * air["speed_of_sound_m_s"]
+        control = aero_data.interpolate_derivatives(
+            self.derivatives, mach, ("CNDEL", "CNDER", "CMDEL", "CMDER")
+        )
+        return {
+            "mach": mach,
+            "altitude_km": altitude_km,
+            "cg_x": cg_x,
+            "cg_z": cg_z,
+            "qbar": 0.5 * air["density_kg_m3"] * speed**2,
+            "weight": self.mass["mass"] * atmosphere.GZERO * air["g_ratio_to_sea_level"],
+            "cn_delta": control[0] + control[1],
+            "cm_delta": control[2] + control[3],
+        }
+
+    def residuals(self, cond, alpha_deg, delta):
+        """Residuals ``(N, 2)`` (normalized lift balance, CM) and Jacobians ``(N, 2, 2)``."""
+        n = alpha_deg.size
+        index = np.r_[np.arange(n), np.arange(n), np.arange(n)]
+        alphas = np.concatenate([alpha_deg, alpha_deg + ALPHA_STEP_DEG, alpha_deg - ALPHA_STEP_DEG])
+        c = self.database.evaluate(cond["mach"][index], alphas, 0.0)
+        columns = {name: c[:, k] for k, name in enumerate(self.database.coefficients)}
+        dx = (cond["cg_x"] - self.mass["xcg"])[index]
+        dz = (cond["cg_z"] - self.mass["zcg"])[index]
+        columns["CN"] = columns["CN"] + cond["cn_delta"][index] * np.tile(delta, 3)
+        columns["CM"] = columns["CM"] + cond["cm_delta"][index] * np.tile(delta, 3)
+        columns = aero_data.shift_moments(columns, dx, dz, self.mass["c"], self.mass["b"])
+        a = np.radians(alphas)
+        lift = columns["CN"] * np.cos(a) - columns["CA"] * np.sin(a)
+        required = (cond["weight"] / (cond["qbar"] * self.mass["reference_area"]))[index]
+        f = np.stack([lift - required, columns["CM"]], axis=-1).reshape(3, n, 2)
+        h = np.radians(ALPHA_STEP_DEG)
+        J = np.empty((n, 2, 2))
+        J[:, :, 0] = (f[1] - f[2]) / (2.0 * h)
+        # d(moment transfer)/d(delta) through CN
+        dx, dz = dx[:n], dz[:n]
+        cn_delta = cond["cn_delta"]
+        J[:, 0, 1] = cn_delta * np.cos(a[:n])
+        J[:, 1, 1] = cond["cm_delta"] + cn_delta * dx / self.mass["c"]
+        return f[0], J
+
+    def bracketed(self, cond):
+        """
+        True where the lift balance changes sign between the ends of the
+        alpha grid once delta is chosen to zero CM (a trim exists inside the
+        tables); the other points are not worth a fallback solve.
+        """
+        ends = []
+        n = cond["mach"].size
+        for alpha in self.alpha_range:
+            alpha_deg = np.full(n, alpha)
+            f, J = self.residuals(cond, alpha_deg, np.zeros(n))
+            # delta that zeroes CM (linear in delta), then the lift residual
+            delta = -f[:, 1] / J[:, 1, 1]
+            ends.append(self.residuals(cond, alpha_deg, delta)[0][:, 0])
+        return ends[0] * ends[1] <= 0.0
+
+    def newton(self, cond, alpha_deg, delta, tol=TOLERANCE, max_iterations=MAX_ITERATIONS):
+        """
+        Vectorized Newton iterations on the whole batch; points stop updating
+        once converged. Returns alpha_deg, delta, converged and iterations.
+        """
+        alpha_deg = np.array(alpha_deg, dtype=float)
+        delta = np.array(delta, dtype=float)
+        converged = np.zeros(alpha_deg.size, dtype=bool)
+        iterations = np.zeros(alpha_deg.size, dtype=int)
+        active = np.arange(alpha_deg.size)
+        for _ in range(max_iterations):
+            sub = {k: v[active] for k, v in cond.items()}
+            f, J = self.residuals(sub, alpha_deg[active], delta[active])
+            done = np.all(np.abs(f) < tol, axis=-1)
+            converged[active[done]] = True
+            keep = ~done & (np.abs(np.linalg.det(J)) > 1e-14)
+            active, f, J = active[keep], f[keep], J[keep]
+            if active.size == 0:
+                break
+            step = np.linalg.solve(J, -f[..., None])[..., 0]
+            step_alpha = np.clip(np.degrees(step[:, 0]), -MAX_ALPHA_STEP_DEG, MAX_ALPHA_STEP_DEG)
+            alpha_deg[active] = np.clip(alpha_deg[active] + step_alpha, *self.alpha_range)
+            delta[active] += step[:, 1]
+            iterations[active] += 1
+        return alpha_deg, delta, converged, iterations
+
+    def solve_point(self, mach, altitude_km, cg_x, cg_z, alpha_deg=0.0, delta=0.0):
+        """One point with scipy (fallback for the points Newton missed)."""
+        from scipy.optimize import least_squares
+
+        cond = self.conditions(mach, altitude_km, cg_x, cg_z)
+        lower = [self.alpha_range[0], -MAX_DEFLECTION_RAD]
+        upper = [self.alpha_range[1], MAX_DEFLECTION_RAD]
+        start = np.clip(np.nan_to_num([alpha_deg, delta]), lower, upper)
+
+        def fun(x):
+            return self.residuals(cond, np.array([x[0]]), np.array([x[1]]))[0][0]
+
+        result = least_squares(
+            fun,
+            start,
+            bounds=(lower, upper),
+            xtol=1e-12, ftol=1e-12, gtol=1e-12,
+        )
+        return result.x[0], result.x[1], bool(np.all(np.abs(result.fun) < 10 * TOLERANCE))
+
+
+_worker_model = None
+
+
+def _init_worker(vehicle, variant, mass):
+    global _worker_model
+    _worker_model = TrimModel(vehicle, variant, mass)
+
+
+def _solve_in_worker(args):
+    return _worker_model.solve_point(*args)
+
+
+def _neighbour_guess(converged, values, shape):
+    """
+    For every point of the grid ``shape``, the value of the nearest converged
+    point along the grid axes (itself when converged; NaN when none).
+    """
+    grid = np.where(converged, values, np.nan).reshape(shape)
+    best = grid.copy()
+    distance = np.where(np.isnan(grid), np.inf, 0.0)
+    for axis in range(len(shape)):
+        n = shape[axis]
+        for offset in range(1, n):
+            for direction in (1, -1):
+                moved = np.roll(grid, direction * offset, axis=axis)
+                index = np.arange(n) - direction * offset
+                valid = ((index >= 0) & (index < n)).reshape(
+                    [-1 if k == axis else 1 for k in range(len(shape))]
+                )
+                better = valid & ~np.isnan(moved) & (offset < distance)
+                best = np.where(better, moved, best)
+                distance = np.where(better, offset, distance)
+    return best.ravel()
+
+
+def trim_grid(vehicle, mach, altitude_km, cg_x=None, cg_z=None, variant=None, mass=None,
+              processes=None, model=None):
+    """
+    Trim every point of the grid ``mach x altitude_km x cg_x x cg_z``.
+
+    1. Newton from the small angle estimate (linear CN/CM in alpha and
+       delta at alpha = 0), the whole grid at once;
+    2. points that failed restart from their nearest converged neighbour in
+       the grid, again as one batch;
+    3. what is still unconverged, if a trim exists inside the alpha range of
+       the tables, goes to a process pool (``processes`` workers, 0 to solve
+       them in this process) with scipy.
+
+    Returns a dict of flat arrays (mach, altitude_km, cg_x, cg_z, alpha_deg,
+    delta_rad, converged, iterations) in C order of the grid.
+    """
+    model = model or TrimModel(vehicle, variant, mass)
+    axes = [
+        np.atleast_1d(np.asarray(v, dtype=float))
+        for v in (mach, altitude_km,
+                  model.mass["xcg"] if cg_x is None else cg_x,
+                  model.mass["zcg"] if cg_z is None else cg_z)
+    ]
+    shape = tuple(a.size for a in axes)
+    grids = np.meshgrid(*axes, indexing="ij")
+    cond = model.conditions(*grids)
+
+    # small angle estimate
+    zero = np.zeros(cond["mach"].size)
+    f0, J0 = model.residuals(cond, zero, zero)
+    with np.errstate(all="ignore"):
+        guess = np.linalg.solve(J0, -f0[..., None])[..., 0]
+    guess = np.nan_to_num(guess)
+    alpha0 = np.clip(np.degrees(guess[:, 0]), *model.alpha_range)
+    alpha, delta, converged, iterations = model.newton(cond, alpha0, guess[:, 1])
+
+    failed = np.flatnonzero(~converged)
+    if failed.size and converged.any():
+        alpha_n = _neighbour_guess(converged, alpha, shape)[failed]
+        delta_n = _neighbour_guess(converged, delta, shape)[failed]
+        # no converged neighbour: keep the small angle estimate
+        alpha_n = np.where(np.isnan(alpha_n), alpha0[failed], alpha_n)
+        delta_n = np.where(np.isnan(delta_n), guess[failed, 1], delta_n)
+        sub = {k: v[failed] for k, v in cond.items()}
+        a, d, ok, it = model.newton(sub, alpha_n, delta_n)
+        alpha[failed], delta[failed] = a, d
+        converged[failed], iterations[failed] = ok, iterations[failed] + it
+
+    failed = np.flatnonzero(~converged)
+    if failed.size:
+        failed = failed[model.bracketed({k: v[failed] for k, v in cond.items()})]
+    if failed.size:
+        jobs = [
+            (cond["mach"][i], cond["altitude_km"][i], cond["cg_x"][i], cond["cg_z"][i],
+             alpha[i], delta[i])
+            for i in failed
+        ]
+        if processes == 0 or failed.size == 1:
+            results = [model.solve_point(*job) for job in jobs]
+        else:
+            workers = processes or min(os.cpu_count() or 1, failed.size)
+            with concurrent.futures.ProcessPoolExecutor(
+                workers, initializer=_init_worker,
+                initargs=(model.vehicle, model.variant, model.mass["mass"]),
+            ) as pool:
+                results = list(pool.map(_solve_in_worker, jobs, chunksize=8))
+        for i, (a, d, ok) in zip(failed, results):
+            alpha[i], delta[i], converged[i] = a, d, ok
+
+    return {
+        "mach": cond["mach"],
+        "altitude_km": cond["altitude_km"],
+        "cg_x": cond["cg_x"],
+        "cg_z": cond["cg_z"],
+        "alpha_deg": alpha,
+        "delta_rad": delta,
+        "converged": converged,
+        "iterations": iterations,
+    }
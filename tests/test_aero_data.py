@@ -0,0 +1,57 @@
+import json
+import os
+
+import numpy as np
+
+from python.linearization_of_model import aero_data
+
+
+def test_table_cache_round_trip(tmp_path):
+    cache_dir = str(tmp_path)
+    built = aero_data.load_table("14x", aero_data.COEFFICIENTS, cache_dir=cache_dir)
+    names = os.listdir(tmp_path / "14x")
+    assert len(names) == 2 and not [name for name in names if name.startswith(".tmp_")]
+    cached = aero_data.load_table("14x", aero_data.COEFFICIENTS, cache_dir=cache_dir)
+    assert isinstance(cached.data, np.memmap)
+    assert cached.keys() == built.keys()
+    np.testing.assert_array_equal(np.asarray(cached.data), np.asarray(built.data))
+
+
+def test_table_cache_rebuilt_when_sidecar_is_stale(tmp_path):
+    cache_dir = str(tmp_path)
+    built = np.array(aero_data.load_table("hxi", aero_data.DERIVATIVES, cache_dir=cache_dir).data)
+    (meta_path,) = [p for p in (tmp_path / "hxi").iterdir() if p.suffix == ".json"]
+    meta = json.loads(meta_path.read_text())
+    meta_path.write_text(json.dumps(dict(meta, sha256="0" * 64)))
+    np.save(str(meta_path.with_suffix(".npy")), np.zeros((1, 1)))
+    rebuilt = aero_data.load_table("hxi", aero_data.DERIVATIVES, cache_dir=cache_dir)
+    np.testing.assert_array_equal(np.asarray(rebuilt.data), built)
+    assert json.loads(meta_path.read_text())["sha256"] == meta["sha256"]
+    assert not [p for p in (tmp_path / "hxi").iterdir() if p.name.startswith(".tmp_")]
+
+
+def test_derivative_spline_matches_scipy(tmp_path):
+    from scipy.interpolate import CubicSpline
+
+    table = aero_data.load_derivatives("14x", cache_dir=str(tmp_path))
+    spline = aero_data.DerivativeSpline.from_table(table)
+    grid, first = np.unique(np.asarray(table["MACH"]), return_index=True)
+    column = spline.columns[3]
+    reference = CubicSpline(grid, np.asarray(table[column])[first])
+    # more points than a chunk, and beyond both ends (held constant)
+    mach = np.linspace(grid[0] - 1.0, grid[-1] + 1.0, aero_data.SPLINE_CHUNK + 7)
+    values = spline(mach, [column, "absent"])
+    np.testing.assert_allclose(values[0], reference(np.clip(mach, grid[0], grid[-1])), rtol=1e-12, atol=1e-12)
+    assert not values[1].any()
+    np.testing.assert_allclose(spline(grid)[:, :], table.select(spline.columns)[:, first], atol=1e-12)
+
+
+def test_derivative_spline_cache(tmp_path):
+    cache_dir = str(tmp_path)
+    built = aero_data.load_derivative_spline("hxi", cache_dir=cache_dir)
+    cached = aero_data.load_derivative_spline("hxi", cache_dir=cache_dir)
+    assert not cached.coefficients.flags.owndata  # a view of the memory-mapped file
+    assert cached.columns == built.columns
+    mach = np.linspace(1.0, 10.0, 50)
+    np.testing.assert_array_equal(cached(mach), built(mach))
+    assert not [p for p in (tmp_path / "hxi").iterdir() if p.name.startswith(".tmp_")]
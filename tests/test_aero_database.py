@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from python.linearization_of_model import aero_data
+from python.linearization_of_model.aero_database import AeroDatabase
+
+
+@pytest.fixture(scope="module")
+def hxi():
+    return AeroDatabase(aero_data.load_coefficients("hxi"))
+
+
+def test_missing_sideslip_filled_by_symmetry(hxi):
+    # at Mach 1.35 the table has beta 0/2/4 only
+    beta = np.array([2.0, 4.0])
+    alpha = np.array([-10.0, 0.0, 5.0])
+    a, b = np.meshgrid(alpha, beta, indexing="ij")
+    positive = hxi.evaluate_dict(1.35, a, b)
+    negative = hxi.evaluate_dict(1.35, a, -b)
+    assert np.abs(positive["CLN"]).max() > 0
+    for name in ("CY", "CLL", "CLN"):
+        np.testing.assert_allclose(negative[name], -positive[name])
+    for name in ("CA", "CN", "CM"):
+        np.testing.assert_allclose(negative[name], positive[name])
+
+
+def test_missing_alpha_interpolated_between_nodes(hxi):
+    # alpha -6, -4, -2 are absent at Mach 1.35: linear between -10, -5 and 0
+    known = hxi.evaluate(1.35, [-10.0, -5.0, 0.0], 2.0)
+    filled = hxi.evaluate(1.35, [-6.0, -4.0, -2.0], 2.0)
+    np.testing.assert_allclose(filled[0], known[0] + (known[1] - known[0]) * 4.0 / 5.0)
+    np.testing.assert_allclose(filled[1], known[1] + (known[2] - known[1]) / 5.0)
+    np.testing.assert_allclose(filled[2], known[1] + (known[2] - known[1]) * 3.0 / 5.0)
+
+
+def test_evaluate_matches_table_nodes(hxi):
+    table = aero_data.load_coefficients("hxi")
+    points = [np.asarray(table[name]) for name in ("MACH", "ALPHA_DEG", "BETA_DEG")]
+    np.testing.assert_allclose(hxi.evaluate(*points), np.transpose(table.select(hxi.coefficients)), atol=1e-12)
+    single = hxi.evaluate_point(4.5, 3.0, -1.0)
+    np.testing.assert_allclose(single, hxi.evaluate(4.5, 3.0, -1.0)[0])
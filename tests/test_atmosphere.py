@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from python.linearization_of_model import atmosphere, atmosphere_table
+
+
+def test_standard_values():
+    properties = atmosphere.get_properties([0.0, 11.0 * atmosphere.EARTH_RADIUS_KM / (atmosphere.EARTH_RADIUS_KM - 11.0)])
+    np.testing.assert_allclose(properties["temperature_K"], [288.15, 216.65])
+    np.testing.assert_allclose(properties["pressure_Pa"], [101325.0, 22632.06], rtol=1e-5)
+    np.testing.assert_allclose(properties["density_kg_m3"][0], 1.2250, rtol=1e-4)
+    np.testing.assert_allclose(properties["speed_of_sound_m_s"][0], 340.294, rtol=1e-5)
+
+
+def test_vectorized_matches_reference_csv_and_points():
+    data = np.genfromtxt(atmosphere_table.REFERENCE_CSV, delimiter=",", names=True)
+    inside = data["Altitude_km"] <= atmosphere.UPPER_LIMIT_KM
+    z = data["Altitude_km"][inside]
+    properties = atmosphere.get_properties(z)
+    for csv_column, column in atmosphere_table.CSV_COLUMNS.items():
+        # the CSV is written with 2 decimals
+        np.testing.assert_allclose(properties[column], data[csv_column][inside], atol=0.006, rtol=1e-4)
+    for k in range(0, z.size, max(1, z.size // 10)):
+        single = atmosphere.get_properties(z[k])
+        assert all(single[c][0] == properties[c][k] for c in atmosphere.PROPERTIES)
+
+
+def test_upper_points_delegated():
+    class Upper:
+        def __init__(self):
+            self.calls = []
+
+        def get_properties(self, z):
+            self.calls.append(z)
+            return {name: -1.0 for name in atmosphere.PROPERTIES}
+
+    upper = Upper()
+    properties = atmosphere.get_properties([10.0, 90.0, 100.0], upper)
+    assert upper.calls == [90.0, 100.0]
+    assert properties["temperature_K"][0] > 0 and (properties["temperature_K"][1:] == -1.0).all()
+    with pytest.raises(ValueError):
+        atmosphere.get_properties([-1.0])
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from python.linearization_of_model import atmosphere, atmosphere_table
+from python.linearization_of_model.atmosphere_table import AtmosphereTable
+
+
+def test_table_within_its_error_bound(tmp_path):
+    table = atmosphere_table.cached_table(20.0, 1e-6, cache_dir=str(tmp_path))
+    assert table.converged and table.max_rel_error <= 1e-6
+    z = np.linspace(0.0, 20.0, 997)
+    exact = atmosphere.get_properties(z)
+    approx = table.get_properties(z)
+    for column in atmosphere_table.COLUMNS:
+        np.testing.assert_allclose(approx[column], exact[column], rtol=1e-6)
+    with pytest.raises(ValueError):
+        table.get_properties(20.5)
+
+
+def test_best_effort_table_cached(tmp_path, monkeypatch):
+    calls = []
+    build = AtmosphereTable.build.__func__
+
+    def counted(cls, *args, **kwargs):
+        calls.append(args)
+        return build(cls, *args, **kwargs)
+
+    monkeypatch.setattr(AtmosphereTable, "build", classmethod(counted))
+    for _ in range(2):
+        with pytest.warns(RuntimeWarning):
+            table = atmosphere_table.cached_table(10.0, 1e-14, cache_dir=str(tmp_path))
+        assert not table.converged and table.max_rel_error > 1e-14
+    assert len(calls) == 1
+
+
+def test_interrupted_save_keeps_the_previous_table(tmp_path, monkeypatch):
+    file_path = atmosphere_table.table_path(10.0, 1e-6, "linear", str(tmp_path))
+    table = atmosphere_table.cached_table(10.0, 1e-6, cache_dir=str(tmp_path))
+    values = np.array(table.values)
+
+    def interrupted(file, array, **kwargs):
+        # a few bytes reach the disk, then the process is stopped
+        with open(file, "wb") if isinstance(file, str) else file as f:
+            f.write(b"\x93NUMPY")
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(np, "save", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        table.save(file_path)
+    monkeypatch.undo()
+    assert not list(tmp_path.glob(".tmp_*"))
+    np.testing.assert_array_equal(AtmosphereTable.load(file_path).values, values)
@@ -0,0 +1,43 @@
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "benchmarks"))
+
+import run_benchmarks  # noqa: E402
+
+
+def test_regressions_flagged_on_the_best_time():
+    baseline = {"results": {"a@1x": {"min": 1.0}, "b@1x": {"min": 1.0}, "c@1x": {"min": 1.0}}}
+    results = {"a@1x": {"min": 1.3}, "b@1x": {"min": 0.5}, "c@1x": {"min": 1.1}, "d@1x": {"min": 2.0}}
+    flags = {row[0]: row[-1] for row in run_benchmarks.compare(results, baseline, threshold=0.2)}
+    assert flags == {"a@1x": "REGRESSION", "b@1x": "faster", "c@1x": "", "d@1x": "new"}
+
+
+def test_baseline_round_trip(tmp_path):
+    file_path = str(tmp_path / "baseline.json")
+    assert run_benchmarks.load_baseline(file_path) is None
+    results = {"a@1x": {"median": 2.0, "min": 1.0}}
+    run_benchmarks.save_baseline(results, file_path)
+    assert run_benchmarks.load_baseline(file_path)["results"] == results
+
+
+def test_scaled_glossary_renames_every_copy():
+    content = "\\newglossaryentry{mach}{name={\\gls{alt}}}\n\\newglossaryentry{alt}{name=h}"
+    scaled = run_benchmarks.scale_glossary(content, ["alt", "mach"], 3)
+    for tag in ("", "b", "c"):
+        assert scaled.count("{mach%s}" % tag) == 1 and scaled.count("{alt%s}" % tag) == 2
+
+
+def test_measure_returns_per_call_times():
+    calls = []
+    median, best = run_benchmarks.measure(lambda: calls.append(1), min_time=0.01, repeats=3)
+    assert 0 < best <= median and len(calls) > 3
+
+
+def test_macros_setup_needs_no_generated_file():
+    setup, _ = run_benchmarks.BENCHMARKS["macros.substitute"]
+    with open(os.path.join(ROOT_DIR, "tex_folder", "control.tex"), "r", encoding="utf-8") as f:
+        text = f.read()
+    # the definitions are rendered from the sources and do replace commands
+    assert setup(1)() != text
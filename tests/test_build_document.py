@@ -0,0 +1,114 @@
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "tex_folder"))
+
+import build_document  # noqa: E402
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class FakeBuild(build_document.DocumentBuild):
+    """
+    The tools replaced by writers: pdflatex's .aux settles after ``settle``
+    passes and declares one glossary whose .glo is the text of symbols.tex;
+    its .bcf names refs.bib; biber and makeglossaries copy their inputs.
+    """
+
+    settle = 2
+
+    def run(self, name, command):
+        self.runs.append((name, 0.0))
+        if name == "biber":
+            self.write(".bbl", read(os.path.join(self.tex_dir, "refs.bib")))
+        elif name == "makeglossaries":
+            self.write(".gls", read(self.path(".glo")))
+        else:
+            passes = sum(1 for run, _ in self.runs if run == "pdflatex")
+            marker = "settled" if passes >= self.settle else "pass %d" % passes
+            self.write(".aux", "\\@newglossary{main}{glg}{gls}{glo}\n" + marker)
+            self.write(".bcf", "<bcf:datasource type=\"file\">refs.bib</bcf:datasource>")
+            self.write(".glo", read(os.path.join(self.tex_dir, "symbols.tex")))
+            self.write(".fls", "PWD %s\nINPUT %s.tex\nINPUT symbols.tex\nINPUT %s\n"
+                       % (self.tex_dir, self.jobname, self.path(".aux")))
+            self.write(".pdf", "pdf")
+
+    def write(self, extension, text):
+        with open(self.path(extension), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def tools(self):
+        return [name for name, _ in self.runs]
+
+
+@pytest.fixture
+def tex_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(build_document, "ROOT_DIR", str(tmp_path))
+    (tmp_path / "main_tex.tex").write_text("\\documentclass{article}\n")
+    (tmp_path / "symbols.tex").write_text("\\newglossaryentry{a}{}\n")
+    (tmp_path / "refs.bib").write_text("@book{a}\n")
+    return str(tmp_path)
+
+
+def edit(tex_dir, name, text="% edit\n"):
+    with open(os.path.join(tex_dir, name), "a") as f:
+        f.write(text)
+
+
+def test_passes_until_the_aux_settles(tex_dir):
+    document = FakeBuild(tex_dir=tex_dir, verbose=False)
+    assert document.build() == 3
+    assert document.tools() == ["pdflatex", "biber", "makeglossaries", "pdflatex", "pdflatex"]
+    assert document.sources() == [os.path.join(tex_dir, name) for name in ("main_tex.tex", "symbols.tex")]
+    assert FakeBuild(tex_dir=tex_dir, verbose=False).build() == 0
+
+
+def test_text_edit_costs_one_pass(tex_dir):
+    FakeBuild(tex_dir=tex_dir, verbose=False).build()
+    edit(tex_dir, "main_tex.tex")
+    document = FakeBuild(tex_dir=tex_dir, verbose=False)
+    assert not document.is_up_to_date()
+    document.settle = 1
+    assert document.build() == 1
+    assert document.tools() == ["pdflatex"]
+
+
+def test_tools_rerun_only_on_their_inputs(tex_dir):
+    FakeBuild(tex_dir=tex_dir, verbose=False).build()
+    edit(tex_dir, "refs.bib", "@book{b}\n")
+    document = FakeBuild(tex_dir=tex_dir, verbose=False)
+    document.settle = 1
+    assert document.build() == 2
+    assert document.tools() == ["pdflatex", "biber", "pdflatex"]
+    edit(tex_dir, "symbols.tex", "\\newglossaryentry{b}{}\n")
+    document = FakeBuild(tex_dir=tex_dir, verbose=False)
+    document.settle = 1
+    assert document.build() == 2
+    assert document.tools() == ["pdflatex", "makeglossaries", "pdflatex"]
+
+
+def test_pass_limit(tex_dir):
+    document = FakeBuild(tex_dir=tex_dir, verbose=False)
+    document.settle = 100
+    assert document.build(max_passes=4) == 4
+
+
+def test_state_replaced_atomically(tex_dir, monkeypatch):
+    document = FakeBuild(tex_dir=tex_dir, verbose=False)
+    document.build()
+    state = read(document.state_file)
+
+    def interrupted(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(build_document.json, "dump", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        document.save_state()
+    assert read(document.state_file) == state
+    assert not [name for name in os.listdir(document.aux_dir) if name.startswith(".tmp_")]
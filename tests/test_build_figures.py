@@ -0,0 +1,61 @@
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "images"))
+
+import build_figures  # noqa: E402
+
+FIGURE = '''import matplotlib.pyplot as plt
+from images import helper
+
+data = open("images/data.csv").read()
+plt.savefig("images/out.pdf")
+'''
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    """A root with images/fig.py reading data.csv, importing helper.py (-> leaf.py) and saving out.pdf."""
+    images = tmp_path / "images"
+    images.mkdir()
+    (images / "fig.py").write_text(FIGURE)
+    (images / "helper.py").write_text("from . import leaf\n")
+    (images / "leaf.py").write_text("X = 1\n")
+    (images / "data.csv").write_text("1,2\n")
+    (images / "notes.py").write_text("import matplotlib\n")
+    monkeypatch.setattr(build_figures, "ROOT_DIR", str(tmp_path))
+    return images
+
+
+def test_dependencies_read_from_the_source(tree):
+    figures = build_figures.find_figures(str(tree))
+    assert [figure.name for figure in figures] == ["fig"]
+    inputs = [os.path.basename(path) for path in figures[0].inputs]
+    assert sorted(inputs) == ["data.csv", "fig.py", "helper.py", "leaf.py"]
+    assert figures[0].outputs == [str(tree / "out.pdf")]
+
+
+def test_stale_after_an_input_or_output_changes(tree):
+    figure = build_figures.Figure(str(tree / "fig.py"))
+    assert figure.is_stale({})
+    (tree / "out.pdf").write_bytes(b"pdf")
+    outputs = {"images/out.pdf": build_figures.file_hash(str(tree / "out.pdf"))}
+    manifest = {"fig": {"inputs": figure.input_hashes(), "outputs": outputs}}
+    assert not figure.is_stale(manifest)
+    (tree / "leaf.py").write_text("X = 2\n")
+    assert figure.is_stale(manifest)
+    manifest["fig"]["inputs"] = figure.input_hashes()
+    (tree / "out.pdf").unlink()
+    assert figure.is_stale(manifest)
+
+
+def test_record_marks_the_existing_outputs(tree, tmp_path):
+    cache_file = str(tmp_path / "cache.json")
+    figures = build_figures.find_figures(str(tree))
+    assert build_figures.record(figures, cache_file) == []
+    (tree / "out.pdf").write_bytes(b"pdf")
+    assert build_figures.record(figures, cache_file) == ["fig"]
+    assert build_figures.build(figures, cache_file=cache_file) == {}
@@ -0,0 +1,54 @@
+import numpy as np
+
+from python.linearization_of_model import equations_of_motion
+from python.linearization_of_model.codegen import compile_functions
+
+MASS = {"mass": 2000.0, "Ixx": 100.0, "Iyy": 900.0, "Izz": 950.0, "Ixy": 0.0, "Ixz": 5.0, "Iyz": 0.0}
+
+
+def _build():
+    import sympy
+
+    x, y = sympy.symbols("x y")
+    return [x, y], {"mixed": sympy.Matrix([[x * y, 2], [y, 3]]), "constant": sympy.Matrix([[y, 2]])}
+
+
+def test_constant_elements_follow_the_batch(tmp_path):
+    compiled = compile_functions("test_mixed", _build, cache_dir=str(tmp_path))
+    out = compiled.mixed(np.arange(4.0), 2.0)
+    assert out.shape == (4, 2, 2)
+    np.testing.assert_array_equal(out[:, 0, 1], 2.0)
+    np.testing.assert_array_equal(out[:, 0, 0], 2.0 * np.arange(4.0))
+    assert compiled.mixed(1.0, 2.0).shape == (2, 2)
+    # no element depends on the batched argument
+    np.testing.assert_array_equal(compiled.constant(np.arange(4.0), 2.0), np.tile([[2.0, 2.0]], (4, 1, 1)))
+
+
+def test_jacobian_shapes_and_values():
+    rng = np.random.default_rng(0)
+    state = rng.normal(size=(5, 12)) + np.r_[1000.0, np.zeros(11)]
+    forces = rng.normal(size=(5, 6)) * 1000.0
+    parameters = equations_of_motion.parameters_from_mass(MASS)
+    a, b = equations_of_motion.jacobians(state, forces, parameters)
+    assert a.shape == (5, 12, 12)
+    assert b.shape == (5, 12, 6)
+    assert equations_of_motion.dynamics(state, forces, parameters).shape == (5, 12)
+    # central differences of the dynamics (linear in the forces: any step is exact)
+    for k in range(6):
+        step = 10.0
+        delta = np.zeros(6)
+        delta[k] = step
+        numeric = (
+            equations_of_motion.dynamics(state, forces + delta, parameters)
+            - equations_of_motion.dynamics(state, forces - delta, parameters)
+        ) / (2 * step)
+        np.testing.assert_allclose(b[..., k], numeric, rtol=1e-5, atol=1e-8)
+    step = 1e-6
+    for k in range(12):
+        delta = np.zeros(12)
+        delta[k] = step
+        numeric = (
+            equations_of_motion.dynamics(state + delta, forces, parameters)
+            - equations_of_motion.dynamics(state - delta, forces, parameters)
+        ) / (2 * step)
+        np.testing.assert_allclose(a[..., k], numeric, rtol=1e-5, atol=1e-6)
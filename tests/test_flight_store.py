@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from python.linearization_of_model import aero_data
+from python.linearization_of_model.flight_store import FlightDataStore
+
+
+@pytest.fixture(scope="module")
+def store():
+    with FlightDataStore() as store:
+        yield store
+
+
+@pytest.mark.parametrize("vehicle", ["14x", "hxi"])
+def test_rows_of_every_mach_value(store, vehicle):
+    grid = store.mach(vehicle)
+    # the envelope as printed (1.9999999999999998 -> 2.0) and the CSV Mach values on it
+    printed = np.array([float("%.6f" % m) for m in grid])
+    np.testing.assert_array_equal(store.rows(vehicle, printed), np.arange(grid.size))
+    csv = np.unique(np.asarray(aero_data.load_derivatives(vehicle)["MACH"]))
+    on_grid = csv[np.isclose(csv[:, None], grid).any(axis=1)]
+    assert on_grid.size
+    np.testing.assert_allclose(grid[store.rows(vehicle, on_grid)], on_grid)
+    with pytest.raises(KeyError):
+        store.rows(vehicle, [grid[-1] + 1.0])
+
+
+def test_read_table_without_column_names(store):
+    table = store.read_table("14x", "stability/wn")
+    dataset = store.file["14x"]["stability/wn"]
+    assert table.keys() == ["MACH"] + ["wn_%d" % k for k in range(dataset.shape[1])]
+    np.testing.assert_array_equal(np.asarray(table.data[1:]).T, dataset[()])
+    assert store.read_table("14x", "envelope/altitude_km").keys() == ["MACH", "altitude_km"]
@@ -0,0 +1,41 @@
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+from images.geometry import Scene, euler_to_matrix, frames, place, unit_cylinder, unit_fin
+
+
+def test_primitives_match_the_explicit_drawing():
+    attitude = Rotation.from_euler("ZYX", [0.3, -0.2, 0.1]).as_matrix()
+    position, radius, height, c, b = np.array([1.0, -2.0, 0.5]), 0.4, 3.0, 0.7, 0.5
+    u, v = np.meshgrid(np.linspace(0, 2 * np.pi, 50), np.linspace(0, height, 2))
+    points = attitude @ np.stack([-v.ravel(), radius * np.sin(u).ravel(), radius * np.cos(u).ravel()])
+    expected = (points + position[:, None]).reshape(3, 2, 50)
+    np.testing.assert_allclose(place(unit_cylinder(), position, attitude, (height, radius, radius)), expected)
+    fin = place(unit_fin(), position, attitude, (c, b, 1.0)).T
+    np.testing.assert_allclose(fin, [position, position + attitude @ [-c, 0, 0], position + attitude @ [-c, b, 0]])
+
+
+def test_euler_to_matrix_matches_scipy():
+    angles = np.random.default_rng(0).uniform(-np.pi, np.pi, (20, 3))
+    expected = Rotation.from_euler("ZYX", angles[:, ::-1]).as_matrix()
+    np.testing.assert_allclose(euler_to_matrix(*angles.T), expected, atol=1e-12)
+
+
+def test_batched_pose_matches_each_frame():
+    scene = Scene().add_cylinder((0, 0, 0), np.eye(3), 0.5, 2.0).add_fin((-1, 0, 0), np.eye(3), 0.3, 0.2)
+    scene.add_triad((0, 0, 0), np.eye(3), 1.5)
+    attitudes = euler_to_matrix(*np.random.default_rng(1).uniform(-1, 1, (3, 7)))
+    positions = np.arange(21.0).reshape(7, 3)
+    posed = list(frames(scene, attitudes, positions, chunk=3))
+    assert len(posed) == 7 and posed[0].shape == (3, 100 + 3 + 4)
+    for vertices, attitude, position in zip(posed, attitudes, positions):
+        np.testing.assert_allclose(vertices, place(scene.vertices, position, attitude))
+
+
+def test_part_points_keep_the_primitive_shape():
+    attitude = euler_to_matrix(0.1, 0.2, 0.3)
+    scene = Scene().add_fin((1, 2, 3), attitude, 0.3, 0.2).add_cylinder((0, 0, 0), np.eye(3), 0.5, 2.0)
+    vertices = scene.pose(attitude, (1.0, 0.0, -1.0))
+    np.testing.assert_allclose(scene.part_points(vertices, 1),
+                               place(unit_cylinder(), (1.0, 0.0, -1.0), attitude, (2.0, 0.5, 0.5)))
+    assert scene.part_points(vertices, 0).shape == (3, 3)
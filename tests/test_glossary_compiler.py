@@ -0,0 +1,63 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GLOSSARY_DIR = os.path.join(ROOT_DIR, "glossaries")
+FIXTURE_DIR = os.path.join(ROOT_DIR, "tests", "fixtures", "glossaries")
+EXPECTED_DIR = os.path.join(FIXTURE_DIR, "expected")
+sys.path.insert(0, GLOSSARY_DIR)
+
+import glossary_compiler  # noqa: E402
+
+
+@pytest.fixture
+def glossary_dir(tmp_path):
+    """Copy of the small fixture sources; no LyX file, so the default header is used."""
+    for file_name in glossary_compiler.SOURCE_FILES + glossary_compiler.SIGLAS_FILES:
+        shutil.copy(os.path.join(FIXTURE_DIR, file_name), tmp_path)
+    return str(tmp_path)
+
+
+def read(directory, file_name):
+    with open(os.path.join(directory, file_name), "rb") as f:
+        return f.read()
+
+
+def test_outputs_match_the_golden_files(glossary_dir):
+    assert sorted(glossary_compiler.compile_glossaries(glossary_dir)) == sorted(glossary_compiler.OUTPUT_FILES)
+    for file_name in glossary_compiler.OUTPUT_FILES:
+        assert read(glossary_dir, file_name) == read(EXPECTED_DIR, file_name), file_name
+
+
+def test_entries_parsed_with_file_and_line():
+    content = "% comment {\n\\newglossaryentry{a}{type=symbolslist,\n  symbol={\\ensuremath{x}}}\n" \
+              "\\newglossaryentry{b}\n{name={\\glsentrysymbol{a}}}\n"
+    entries = glossary_compiler.parse_entries(content, source="/tmp/test.tex")
+    assert [(e.key, e.source, e.line) for e in entries] == [("a", "test.tex", 2), ("b", "test.tex", 4)]
+    assert entries[0].type == "symbolslist"
+
+
+def test_unchanged_sources_reuse_the_cache(glossary_dir):
+    assert glossary_compiler.compile_glossaries(glossary_dir)
+    assert glossary_compiler.compile_glossaries(glossary_dir) == []
+    source = os.path.join(glossary_dir, "constants.tex")
+    with open(source, "a", encoding="utf-8") as f:
+        f.write("\n% edited\n")
+    manifest = glossary_compiler.load_manifest(os.path.join(glossary_dir, glossary_compiler.CACHE_FILE))
+    compiler = glossary_compiler.GlossaryCompiler(glossary_dir)
+    assert not compiler.is_up_to_date(manifest)
+    compiler.load(manifest)
+    assert compiler.parsed == ["constants.tex"]
+    # a comment changes no output
+    assert compiler.write() == []
+
+
+def test_edited_output_is_rewritten(glossary_dir):
+    glossary_compiler.compile_glossaries(glossary_dir)
+    with open(os.path.join(glossary_dir, glossary_compiler.MATH_SYMBOLS_FILE), "a", encoding="utf-8") as f:
+        f.write("% hand edit\n")
+    assert glossary_compiler.compile_glossaries(glossary_dir) == [glossary_compiler.MATH_SYMBOLS_FILE]
+    assert read(glossary_dir, glossary_compiler.MATH_SYMBOLS_FILE) == read(EXPECTED_DIR, glossary_compiler.MATH_SYMBOLS_FILE)
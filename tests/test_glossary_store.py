@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "glossaries"))
+
+from glossary_store import GlossaryEntry, GlossaryStore  # noqa: E402
+
+
+def entries():
+    return [
+        GlossaryEntry.parse("u", r"type=states, name=\glsentrysymbol{u}, symbol=\ensuremath{u}", "states.tex", 3),
+        GlossaryEntry.parse("v", r"type=states, parent={u}, symbol=\ensuremath{v}", "states.tex", 9),
+        GlossaryEntry.parse("g", r"type=constants, symbol=\ensuremath{g}, symbol=\ensuremath{h}", "constants.tex", 1),
+    ]
+
+
+def test_indices_follow_add_and_remove():
+    store = GlossaryStore(entries())
+    assert store["g"].symbol == r"\ensuremath{g}"  # the first occurrence wins
+    assert [e.key for e in store.of_type("states")] == ["u", "v"]
+    assert [e.key for e in store.children("u")] == ["v"]
+    store.set_rendered("u", "u")
+    store.set_rendered("v", "u")
+    assert store.keys_for_symbol("u") == ["u", "v"]
+    store.remove("v")
+    assert "v" not in store and len(store) == 2
+    assert store.children("u") == [] and store.keys_for_symbol("u") == ["u"]
+    store.add(GlossaryEntry("u", type="constants", source="constants.tex"))
+    assert [e.key for e in store.from_source("constants.tex")] == ["g", "u"]
+    assert store.of_type("states") == [] and store.keys_for_symbol("u") == []
+
+
+def test_json_round_trip(tmp_path):
+    store = GlossaryStore(entries())
+    store.set_rendered("g", "g")
+    store.save(str(tmp_path / "store.json"))
+    loaded = GlossaryStore.load(str(tmp_path / "store.json"))
+    assert [e.to_row() for e in loaded] == [e.to_row() for e in store]
+    assert loaded.keys_for_symbol("g") == ["g"]
+    with pytest.raises(ValueError):
+        GlossaryStore.from_json(dict(store.to_json(), version=0))
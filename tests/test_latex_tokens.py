@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "glossaries"))
+
+from latex_tokens import (  # noqa: E402
+    LatexBraceError, iter_commands_with_groups, match_braces, strip_wrappers,
+)
+
+
+def test_braces_in_comments_and_escaped_are_ignored():
+    text = r"a{b\{c}% {unmatched" + "\n{d}"
+    assert match_braces(text) == {1: 6, text.index("{d"): text.index("{d") + 2}
+
+
+@pytest.mark.parametrize("text, line, column", [("a\nb}c", 2, 2), ("x\n\n  {y", 3, 3)])
+def test_unbalanced_brace_position(text, line, column):
+    with pytest.raises(LatexBraceError) as error:
+        match_braces(text, source="f.tex", first_line=1)
+    assert (error.value.source, error.value.line, error.value.column) == ("f.tex", line, column)
+
+
+def test_commands_with_groups_and_wrappers():
+    text = "\\newglossaryentry{k}\n  {type=x, symbol={\\ensuremath{\\ensuremath{a}_{b}}}}\\newglossaryentry{solo}"
+    found = list(iter_commands_with_groups(text, "newglossaryentry", 2))
+    assert [arguments[0] for arguments, _ in found] == ["k"]
+    assert strip_wrappers(r"\ensuremath{\ensuremath{a}_{b}} \ensuremath x") == r"a_{b} \ensuremath x"
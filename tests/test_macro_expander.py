@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "glossaries"))
+
+from macro_expander import MacroCycleError, MacroExpander  # noqa: E402
+
+
+def test_single_scan_keeps_unknown_and_longer_commands():
+    expander = MacroExpander({"a": "A", "ab": "AB"})
+    assert expander.expand(r"\a \ab \abc \a_x \a1 \b \a{}") == r"A AB \abc \a_x \a1 \b A{}"
+
+
+def test_chunks_split_inside_a_command(tmp_path):
+    expander = MacroExpander({"alpha": "[a]", "al": "[l]"})
+    text = r"x \alpha y \al z \alpha" * 50
+    chunks = [text[k:k + 7] for k in range(0, len(text), 7)]
+    assert "".join(expander.expand_chunks(chunks)) == expander.expand(text)
+    source, target = tmp_path / "in.tex", tmp_path / "out.tex"
+    source.write_text(text, encoding="utf-8")
+    expander.expand_file(str(source), str(target), chunk_size=5)
+    assert target.read_text(encoding="utf-8") == expander.expand(text)
+
+
+def test_nested_definitions_resolved_once():
+    expander = MacroExpander({"a": r"\b+\b", "b": r"\c", "c": "x"})
+    assert expander.expand(r"\a") == "x+x"
+    assert expander.resolve_all() == {"a": "x+x", "b": "x", "c": "x"}
+
+
+def test_cycle_reported_with_its_path():
+    expander = MacroExpander({"a": r"\b", "b": r"\c", "c": r"\a", "d": "ok"})
+    assert expander.expand(r"\d") == "ok"
+    with pytest.raises(MacroCycleError) as error:
+        expander.expand(r"\a")
+    assert error.value.cycle == ["a", "b", "c", "a"]
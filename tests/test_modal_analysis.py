@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from python.linearization_of_model.modal_analysis import (
+    LATERAL_MODES,
+    ModalAnalysis,
+    mode_properties,
+    seed_index,
+    track_modes,
+)
+
+
+def test_seed_skips_coalesced_roots():
+    # roll/spiral a complex pair at the first point, separated afterwards
+    dutch = [-0.1 - 3j, -0.1 + 3j]
+    values = np.array([[dutch + [-0.05 - 0.01j, -0.05 + 0.01j], dutch + [-0.5, -0.01], dutch + [-0.6, -0.005]]])
+    seed = seed_index(values, n_real=2)
+    assert seed in (1, 2)
+    tracked, _ = track_modes(values, complex_first=True, seed=seed)
+    properties = mode_properties(tracked, LATERAL_MODES)
+    np.testing.assert_allclose(properties["roll_subsidence_tau"][0, 1:], [1 / 0.5, 1 / 0.6])
+    np.testing.assert_allclose(properties["spiral_tau"][0, 1:], [100.0, 200.0])
+    np.testing.assert_allclose(properties["dutch_roll_wn"], np.abs(dutch[0]))
+
+
+@pytest.mark.parametrize("vehicle", ["14x", "hxi"])
+def test_default_sweep_inside_the_coefficient_grid(vehicle):
+    analysis = ModalAnalysis(vehicle)
+    grid = analysis.engine.database.axes[0]
+    mach = analysis.default_mach()
+    assert mach.min() >= grid.min() and mach.max() <= grid.max()
+    result = analysis.analyze(altitude_km=[25.0, 30.0])
+    assert result["short_period_wn"].shape == (2, mach.size)
+    assert not np.any(np.isclose(result["roll_subsidence_tau"], result["spiral_tau"]))
+    # roll subsidence faster than the spiral everywhere
+    assert np.all(np.abs(result["roll_subsidence_tau"]) < np.abs(result["spiral_tau"]))
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from python.linearization_of_model import aero_data, monte_carlo
+from python.linearization_of_model.aero_database import AeroDatabase
+
+SCENARIO = {"mach": 6.0, "altitude_km": 30.0, "alpha_deg": 1.0, "t_final": 0.05, "dt": 0.01}
+
+
+def test_running_stats_match_numpy():
+    values = np.random.default_rng(1).normal(3.0, 2.0, 1001)
+    stats = monte_carlo.RunningStats()
+    for chunk in np.array_split(values, 7):
+        stats.update(chunk)
+    assert stats.count == values.size
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.std == pytest.approx(values.std(ddof=1))
+    assert (stats.min, stats.max) == (values.min(), values.max())
+
+
+@pytest.mark.parametrize("p", [0.05, 0.5, 0.95])
+def test_p2_quantile_close_to_exact(p):
+    values = np.random.default_rng(2).standard_normal(20000)
+    sketch = monte_carlo.P2Quantile(p)
+    sketch.update(values)
+    assert sketch.value == pytest.approx(np.quantile(values, p), abs=0.05)
+
+
+def test_cases_do_not_depend_on_the_batch():
+    nominal = aero_data.load_mass_properties("14x")
+    dispersions = monte_carlo.DEFAULT_DISPERSIONS
+    whole = monte_carlo.sample_cases(0, 10, 7, dispersions, nominal)
+    part = monte_carlo.sample_cases(4, 3, 7, dispersions, nominal)
+    other = monte_carlo.sample_cases(0, 10, 8, dispersions, nominal)
+    for name in dispersions:
+        np.testing.assert_array_equal(part[name], whole[name][4:7])
+        assert not np.array_equal(whole[name], other[name])
+
+
+def test_campaign_matches_one_ensemble():
+    batches = {}
+    statistics = monte_carlo.run_campaign(
+        "14x", 5, SCENARIO, seed=3, batch_size=2, processes=2,
+        on_batch=lambda first, metrics: batches.update({first: metrics}),
+    )
+    assert sorted(batches) == [0, 2, 4]
+    database = AeroDatabase.from_dataset("14x")
+    derivatives = aero_data.load_derivatives("14x")
+    expected = monte_carlo.simulate_cases(
+        database, derivatives, "14x", 0, 5, 3, monte_carlo.DEFAULT_DISPERSIONS, SCENARIO
+    )
+    summary = statistics.summary()
+    for name in monte_carlo.METRICS:
+        values = np.concatenate([batches[first][name] for first in sorted(batches)])
+        np.testing.assert_allclose(values, expected[name], rtol=1e-10)
+        assert summary[name]["count"] == 5
+        assert summary[name]["mean"] == pytest.approx(expected[name].mean())
@@ -0,0 +1,97 @@
+import os
+import stat
+import sys
+import threading
+import time
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "images"))
+
+pytest.importorskip("matplotlib")
+
+import render_server  # noqa: E402
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """A temporary repository root (the server chdirs into it and reloads only its modules)."""
+    root = tmp_path / "repo"
+    root.mkdir()
+    monkeypatch.setattr(render_server, "ROOT_DIR", str(root))
+    monkeypatch.chdir(root)
+    return root
+
+
+@pytest.fixture
+def server(repo):
+    import matplotlib.pyplot as plt
+    import matplotlib.style
+    from matplotlib.figure import Figure
+
+    originals = (matplotlib.style.use, plt.style.use, Figure.savefig)
+    with render_server.RenderServer() as server:
+        yield server
+    # nothing of the server leaks into the other tests
+    assert (matplotlib.style.use, plt.style.use, Figure.savefig) == originals
+
+
+@pytest.fixture
+def package(repo, monkeypatch):
+    """A script -> helper -> leaf chain of modules inside the repo."""
+    monkeypatch.syspath_prepend(str(repo))
+    yield str(repo)
+    for name in ("_render_leaf", "_render_helper"):
+        sys.modules.pop(name, None)
+
+
+def write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    # a distinct mtime even on filesystems with coarse timestamps
+    mtime = time.time_ns() + 10**9 * write.counter
+    write.counter += 1
+    os.utime(path, ns=(mtime, mtime))
+
+
+write.counter = 1
+
+
+def test_edited_leaf_module_reaches_the_script(server, package):
+    output = os.path.join(package, "out.txt")
+    write(os.path.join(package, "_render_leaf.py"), "X = 1\n")
+    write(os.path.join(package, "_render_helper.py"), "from _render_leaf import X\n")
+    script = os.path.join(package, "script.py")
+    write(script, "import _render_helper\nopen(%r, 'w').write(str(_render_helper.X))\n" % output)
+    relative = os.path.relpath(script, package)
+    assert server.render(relative)["error"] is None
+    assert open(output).read() == "1"
+    write(os.path.join(package, "_render_leaf.py"), "X = 2\n")
+    assert server.render(relative)["error"] is None
+    assert open(output).read() == "2"
+
+
+def test_scripts_outside_the_repo_are_rejected(server, tmp_path):
+    script = tmp_path / "evil.py"
+    script.write_text("raise SystemExit('ran')\n")
+    result = server.render(str(script))
+    assert result["error"].startswith("Script fora do repositório")
+    assert server.render("../repo/../evil.py")["error"].startswith("Script fora")
+
+
+def test_state_file_is_private(server, tmp_path):
+    state_file = str(tmp_path / "state.json")
+    thread = threading.Thread(target=server.serve, args=(state_file,), daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10.0
+    while not render_server.is_running(state_file):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    try:
+        if os.name != "nt":
+            assert stat.S_IMODE(os.stat(state_file).st_mode) == 0o600
+    finally:
+        render_server.stop(state_file)
+        thread.join(10.0)
+    assert not os.path.exists(state_file)
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from python.linearization_of_model import aero_data
+from python.linearization_of_model.simulator import (
+    NpyWriter, Simulator, VehicleModel, initial_state, load_npy,
+)
+
+
+@pytest.fixture(scope="module")
+def model():
+    return VehicleModel("14x")
+
+
+@pytest.fixture(scope="module")
+def x0():
+    state = initial_state([5.0, 7.0], [30.0, 35.0], alpha_deg=[2.0, 4.0], beta_deg=[0.0, 1.0])
+    state[:, 3:6] = [[0.01, 0.02, -0.01], [0.0, -0.03, 0.02]]
+    return state
+
+
+def test_forces_follow_scale_and_cg(model, x0):
+    mp = model.mass_properties
+    moved = VehicleModel("14x", database=model.database, derivatives=model.derivatives,
+                         cg=(mp["xcg"] + 0.2, mp["zcg"] - 0.1), coefficient_scale={"CN": 2.0})
+    forces, (mach, alpha, beta, qbar, g) = model.forces(0.0, x0)
+    scaled, _ = moved.forces(0.0, x0)
+    qs = qbar * mp["reference_area"]
+    coefficients = {"CA": -forces[:, 0] / qs, "CY": forces[:, 1] / qs, "CN": -forces[:, 2] / qs,
+                    "CLL": forces[:, 3] / (qs * mp["b"]), "CM": forces[:, 4] / (qs * mp["c"]),
+                    "CLN": forces[:, 5] / (qs * mp["b"])}
+    coefficients["CN"] = 2.0 * coefficients["CN"]
+    expected = aero_data.shift_moments(coefficients, 0.2, -0.1, mp["c"], mp["b"])
+    np.testing.assert_allclose(scaled[:, 2], -expected["CN"] * qs)
+    np.testing.assert_allclose(scaled[:, 4], expected["CM"] * qs * mp["c"])
+    np.testing.assert_allclose(scaled[:, 3], expected["CLL"] * qs * mp["b"])
+    np.testing.assert_allclose(scaled[:, 5], expected["CLN"] * qs * mp["b"])
+    np.testing.assert_allclose(mach, [5.0, 7.0])
+
+
+def test_last_sample_written(model, x0, tmp_path):
+    writer = NpyWriter(str(tmp_path / "run"))
+    t, x, active = Simulator(model, dt=0.01, chunk_size=3).run(x0, 0.05, writer, every=2)
+    times, states = load_npy(str(tmp_path / "run"))
+    np.testing.assert_allclose(times, [0.0, 0.02, 0.04, 0.05])
+    assert t == pytest.approx(0.05) and active.all()
+    np.testing.assert_array_equal(states[-1], x)
+
+
+def test_rk4_and_dopri5_agree(model, x0):
+    _, rk4, _ = Simulator(model, "rk4", dt=0.005).run(x0, 0.5)
+    _, dopri5, _ = Simulator(model, "dopri5", dt=0.01, rtol=1e-9, atol=1e-9).run(x0, 0.5)
+    # the tables are piecewise linear: the fixed step is only as accurate as its kinks allow
+    np.testing.assert_allclose(dopri5, rk4, rtol=1e-4, atol=1e-2)
+
+
+def test_adaptive_step_restarts_from_the_given_dt(model, x0):
+    simulator = Simulator(model, "dopri5", dt=0.01, rtol=1e-9, atol=1e-9)
+    _, first, _ = simulator.run(x0, 0.3)
+    assert simulator.dt == 0.01
+    _, second, _ = simulator.run(x0, 0.3)
+    np.testing.assert_array_equal(second, first)
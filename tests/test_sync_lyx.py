@@ -0,0 +1,83 @@
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "tex_folder"))
+
+import sync_lyx  # noqa: E402
+
+
+@pytest.fixture
+def folders(tmp_path, monkeypatch):
+    lyx_dir, tex_dir = tmp_path / "lyx", tmp_path / "tex"
+    lyx_dir.mkdir()
+    tex_dir.mkdir()
+    monkeypatch.setattr(sync_lyx, "LYX_DIR", str(lyx_dir))
+    monkeypatch.setattr(sync_lyx, "TEX_DIR", str(tex_dir))
+    for name in ("main_lyx", "a", "b", "c"):
+        (lyx_dir / (name + ".lyx")).write_text(name)
+    return tmp_path
+
+
+def fake_convert(failing):
+    def convert(document, direction):
+        if document.name in failing:
+            raise sync_lyx.SyncError("%s: lyx falhou" % document.name)
+        with open(document.target, "w", encoding="utf-8") as f:
+            f.write("converted " + document.name)
+        return document
+
+    return convert
+
+
+def test_successes_recorded_when_a_child_fails(folders, monkeypatch):
+    state_file = str(folders / "state.json")
+    monkeypatch.setattr(sync_lyx, "convert", fake_convert({"a"}))
+    names = ["main_lyx", "a", "b", "c"]
+    with pytest.raises(sync_lyx.SyncError):
+        sync_lyx.sync("lyx2tex", names, processes=1, state_file=state_file)
+    state = sync_lyx.load_state(state_file)
+    assert sorted(state) == ["b", "c", "main_lyx"]
+    # only the failed child is converted again
+    monkeypatch.setattr(sync_lyx, "convert", fake_convert(set()))
+    assert sync_lyx.sync("lyx2tex", names, state_file=state_file) == ["a"]
+    assert sync_lyx.sync("lyx2tex", names, state_file=state_file) == []
+
+
+def test_children_skipped_when_the_master_fails(folders, monkeypatch):
+    state_file = str(folders / "state.json")
+    monkeypatch.setattr(sync_lyx, "convert", fake_convert({"main_lyx"}))
+    with pytest.raises(sync_lyx.SyncError):
+        sync_lyx.sync("lyx2tex", ["main_lyx", "a"], state_file=state_file)
+    assert sync_lyx.load_state(state_file) == {}
+
+
+def test_failed_child_converted_again_after_a_master_export(folders, monkeypatch):
+    state_file = str(folders / "state.json")
+    names = ["main_lyx", "a"]
+    monkeypatch.setattr(sync_lyx, "convert", fake_convert(set()))
+    sync_lyx.sync("lyx2tex", names, state_file=state_file)
+    for name in names:
+        (folders / "lyx" / (name + ".lyx")).write_text(name + " edited")
+    monkeypatch.setattr(sync_lyx, "convert", fake_convert({"a"}))
+    with pytest.raises(sync_lyx.SyncError):
+        sync_lyx.sync("lyx2tex", names, state_file=state_file)
+    monkeypatch.setattr(sync_lyx, "convert", fake_convert(set()))
+    assert sync_lyx.sync("lyx2tex", names, state_file=state_file) == ["a"]
+    assert (folders / "tex" / "a.tex").read_text() == "converted a"
+
+
+def test_state_replaced_atomically(folders, monkeypatch):
+    state_file = str(folders / "state.json")
+    sync_lyx.save_state({"a": {"lyx": "1", "tex": "2"}}, state_file)
+
+    def interrupted(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(sync_lyx.json, "dump", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        sync_lyx.save_state({}, state_file)
+    assert sync_lyx.load_state(state_file) == {"a": {"lyx": "1", "tex": "2"}}
+    assert not list(folders.glob(".tmp_*"))
@@ -0,0 +1,66 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from python.linearization_of_model import tracing
+
+
+@pytest.fixture
+def trace(tmp_path, monkeypatch):
+    path = tmp_path / "trace.jsonl"
+    monkeypatch.setenv(tracing.TRACE_ENV, str(path))
+    return path
+
+
+def events(path):
+    return tracing.read_events(str(path))
+
+
+def test_span_and_summary(trace):
+    with tracing.span("outer", size=3) as stage:
+        stage.set(done=True)
+
+    @tracing.span("decorated")
+    def twice(k):
+        return k if k == 0 else twice(k - 1)
+
+    twice(1)
+    recorded = events(trace)
+    assert [e["name"] for e in recorded] == ["outer", "decorated", "decorated"]
+    assert recorded[0]["args"]["size"] == 3 and recorded[0]["args"]["done"]
+    rows = tracing.summarize(recorded)
+    assert {row[0]: row[2] for row in rows} == {"outer": 1, "decorated": 2}
+
+
+def test_run_behaves_as_subprocess_run(trace):
+    python = [sys.executable, "-c"]
+    result = tracing.run(python + ["import sys; print(sys.stdin.read().upper())"], "echo",
+                         input="abc", capture_output=True, text=True)
+    assert result.stdout.strip() == "ABC"
+    with pytest.raises(subprocess.CalledProcessError):
+        tracing.run(python + ["raise SystemExit(3)"], "fail", check=True)
+    with pytest.raises(subprocess.TimeoutExpired):
+        tracing.run(python + ["import time; time.sleep(30)"], "slow", timeout=0.5)
+    recorded = {e["name"]: e["args"] for e in events(trace)}
+    assert recorded["echo"]["returncode"] == 0
+    assert "CalledProcessError" in recorded["fail"]["error"]
+    assert "TimeoutExpired" in recorded["slow"]["error"]
+
+
+def test_untraced_is_a_noop(monkeypatch, tmp_path):
+    monkeypatch.delenv(tracing.TRACE_ENV, raising=False)
+    with tracing.span("nothing") as stage:
+        stage.set(value=1)
+    assert tracing.run([sys.executable, "-c", "pass"]).returncode == 0
+    assert not list(tmp_path.iterdir())
+
+
+def test_export(trace, tmp_path):
+    with tracing.span("stage"):
+        pass
+    output = tmp_path / "chrome.json"
+    tracing.export_chrome(str(trace), str(output))
+    exported = json.loads(output.read_text())["traceEvents"]
+    assert exported[0]["ph"] == "X" and exported[0]["name"] == "stage"
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from python.linearization_of_model.flight_store import FlightDataStore
+from python.linearization_of_model.trim import TrimModel, trim_grid
+
+
+@pytest.fixture(scope="module")
+def model():
+    return TrimModel("14x")
+
+
+def test_trim_grid_zeroes_the_residuals(model):
+    mach = np.linspace(5.0, 8.0, 7)
+    result = trim_grid("14x", mach, [25.0, 30.0], cg_x=[1.15, 1.2, 1.25], processes=0, model=model)
+    assert result["converged"].all()
+    assert result["alpha_deg"].shape == (7 * 2 * 3,)
+    cond = model.conditions(result["mach"], result["altitude_km"], result["cg_x"], result["cg_z"])
+    f, _ = model.residuals(cond, result["alpha_deg"], result["delta_rad"])
+    assert np.abs(f).max() < 1e-7
+    # the elevon trim moves monotonically with the CG position
+    delta = result["delta_rad"].reshape(7, 2, 3)
+    assert (np.diff(delta, axis=-1) > 0).all()
+
+
+def test_trim_close_to_reference_solution(model):
+    with FlightDataStore() as store:
+        mach = store.mach("14x")
+        reference = store.file["14x"]["stability/trim_solution"][()]
+        altitude = store.file["14x"]["envelope/altitude_km"][()]
+    result = trim_grid("14x", mach, altitude[0], processes=0, model=model)
+    # the reference includes the thrust (its fourth column): the gap grows with Mach
+    np.testing.assert_allclose(result["alpha_deg"], np.degrees(reference[:, 2]), atol=0.12)
+    np.testing.assert_allclose(result["delta_rad"], reference[:, 0], atol=0.03)
@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   build_document.py
+@Time    :   2026/10/18 22:10:44
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   Incremental build of main_tex.pdf: the inputs of pdflatex (from
+             its -recorder .fls), biber and makeglossaries are hashed between
+             runs, each tool runs only when its inputs changed and pdflatex
+             stops as soon as the .aux/.toc files converge.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+TEX_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TEX_DIR)
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from python.linearization_of_model import tracing  # noqa: E402
+
+JOBNAME = "main_tex"
+AUX_FOLDER = "aux_folder"
+STATE_VERSION = 1
+MAX_PASSES = 5
+
+if os.name == "nt":
+    LATEX = ["pdflatex-dev.exe"]
+    BIBER = ["biber.exe"]
+    GLOSSARY = ["makeglossaries.exe"]
+else:
+    LATEX = ["pdflatex"]
+    BIBER = ["biber"]
+    GLOSSARY = ["makeglossaries"]
+LATEX_OPTIONS = ["-synctex=1", "-interaction=batchmode", "-recorder"]
+
+# Files written by pdflatex whose contents feed the next pass
+PASS_EXTENSIONS = (".aux", ".toc", ".lof", ".lot", ".out", ".nav", ".snm")
+# Written by pdflatex, never inputs of the document
+OUTPUT_EXTENSIONS = PASS_EXTENSIONS + (
+    ".pdf", ".log", ".fls", ".synctex.gz", ".bcf", ".run.xml", ".glo", ".acn", ".ist", ".glg", ".alg"
+)
+NEWGLOSSARY = re.compile(r"\\@newglossary\{([^}]*)\}\{([^}]*)\}\{([^}]*)\}\{([^}]*)\}")
+DATASOURCE = re.compile(r"<bcf:datasource[^>]*>([^<]+)</bcf:datasource>")
+
+
+class BuildError(RuntimeError):
+    pass
+
+
+def file_hash(file_path):
+    try:
+        with open(file_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def hashes(paths):
+    return {path: file_hash(path) for path in sorted(paths)}
+
+
+class DocumentBuild:
+    """
+    State of the build of ``jobname`` in ``tex_dir/aux_folder``. The last
+    hashes of the document sources and of the inputs of biber and
+    makeglossaries are kept in ``<jobname>.build.json``.
+    """
+
+    def __init__(self, jobname=JOBNAME, tex_dir=TEX_DIR, aux_folder=AUX_FOLDER, verbose=True):
+        self.jobname = jobname
+        self.tex_dir = tex_dir
+        self.aux_dir = os.path.join(tex_dir, aux_folder)
+        self.verbose = verbose
+        self.state_file = self.path(".build.json")
+        self.runs = []
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+            if self.state.get("version") != STATE_VERSION:
+                self.state = {}
+        except (OSError, ValueError):
+            self.state = {}
+
+    def path(self, extension):
+        return os.path.join(self.aux_dir, self.jobname + extension)
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    def run(self, name, command):
+        start = time.perf_counter()
+        result = tracing.run(command, name, cwd=self.tex_dir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        seconds = time.perf_counter() - start
+        self.runs.append((name, seconds))
+        self.log("%-15s %6.2f s" % (name, seconds))
+        if result.returncode != 0:
+            output = result.stdout.decode("utf-8", "replace").strip().splitlines()
+            raise BuildError("%s falhou (código %d)\n%s" % (name, result.returncode, "\n".join(output[-20:])))
+
+    # --- dependencies -----------------------------------------------------
+
+    def sources(self):
+        """Project files read by the last pdflatex pass (INPUT lines of the .fls), without its own outputs."""
+        try:
+            with open(self.path(".fls"), "r", encoding="utf-8", errors="replace") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return []
+        pwd = self.tex_dir
+        found = set()
+        for line in lines:
+            if line.startswith("PWD "):
+                pwd = line[4:]
+            elif line.startswith("INPUT "):
+                path = os.path.normpath(os.path.join(pwd, line[6:]))
+                if not path.startswith(ROOT_DIR + os.sep) or path.startswith(self.aux_dir + os.sep):
+                    continue
+                if not path.endswith(OUTPUT_EXTENSIONS) and os.path.isfile(path):
+                    found.add(path)
+        return sorted(found)
+
+    def pass_files(self):
+        """Files of the aux folder that carry information from one pass to the next."""
+        return [p for p in glob.glob(os.path.join(self.aux_dir, "*")) if p.endswith(PASS_EXTENSIONS)]
+
+    def glossary_files(self):
+        """(inputs, outputs) of makeglossaries: the \\@newglossary types of the .aux and the style."""
+        try:
+            with open(self.path(".aux"), "r", encoding="utf-8", errors="replace") as f:
+                types = NEWGLOSSARY.findall(f.read())
+        except OSError:
+            types = []
+        if not types:
+            return [], []
+        inputs = [self.path("." + t[3]) for t in types] + [self.path(".ist"), self.path(".xdy")]
+        outputs = [self.path("." + t[2]) for t in types]
+        return [p for p in inputs if os.path.isfile(p)], outputs
+
+    def bibliography_files(self):
+        """(inputs, outputs) of biber: the .bcf and its data sources."""
+        bcf = self.path(".bcf")
+        try:
+            with open(bcf, "r", encoding="utf-8", errors="replace") as f:
+                sources = DATASOURCE.findall(f.read())
+        except OSError:
+            return [], []
+        inputs = [bcf] + [os.path.normpath(os.path.join(self.tex_dir, s.strip())) for s in sources]
+        return inputs, [self.path(".bbl")]
+
+    # --- steps ------------------------------------------------------------
+
+    def latex(self):
+        self.run(
+            "pdflatex",
+            LATEX + LATEX_OPTIONS + ["-output-directory=" + os.path.relpath(self.aux_dir, self.tex_dir),
+                                     self.jobname + ".tex"],
+        )
+
+    def _tool(self, name, files, command):
+        """Run ``command`` when the inputs of ``files()`` changed or an output is missing; True if its outputs changed."""
+        inputs, outputs = files()
+        if not inputs:
+            return False
+        current = hashes(inputs)
+        if self.state.get(name) == current and all(os.path.isfile(p) for p in outputs):
+            return False
+        before = hashes(outputs)
+        self.run(name, command)
+        self.state[name] = current
+        return hashes(outputs) != before
+
+    def biber(self):
+        return self._tool(
+            "biber", self.bibliography_files,
+            BIBER + ["-output-directory=" + os.path.relpath(self.aux_dir, self.tex_dir), self.jobname],
+        )
+
+    def glossaries(self):
+        return self._tool(
+            "makeglossaries", self.glossary_files,
+            GLOSSARY + ["-d", os.path.relpath(self.aux_dir, self.tex_dir), self.jobname],
+        )
+
+    def is_up_to_date(self):
+        """True when the document sources and the .bib files are those of the last build."""
+        sources = self.state.get("sources")
+        return (
+            bool(sources)
+            and os.path.isfile(self.path(".pdf"))
+            and hashes(sources) == sources
+            and all(hashes(self.state[name]) == self.state[name] for name in ("biber",) if name in self.state)
+        )
+
+    def build(self, force=False, max_passes=MAX_PASSES):
+        """
+        Bring the PDF up to date; returns the number of pdflatex passes.
+        Every pass is followed by biber/makeglossaries when their inputs
+        changed; the build ends at the first pass that leaves the pass
+        files unchanged with no new .bbl/.gls.
+        """
+        if not force and self.is_up_to_date():
+            self.log("%s.pdf up to date." % self.jobname)
+            return 0
+        os.makedirs(self.aux_dir, exist_ok=True)
+        self.state.pop("sources", None)
+        passes = 0
+        with tracing.span("document " + self.jobname, children=True, force=force) as stage:
+            while True:
+                before = hashes(self.pass_files())
+                self.latex()
+                passes += 1
+                tools_changed = self.biber()
+                tools_changed = self.glossaries() or tools_changed
+                if hashes(self.pass_files()) == before and not tools_changed:
+                    break
+                if passes >= max_passes:
+                    self.log("Aviso: sem convergência após %d passadas." % passes)
+                    break
+            stage.set(passes=passes)
+        self.state.update(version=STATE_VERSION, sources=hashes(self.sources()))
+        self.save_state()
+        return passes
+
+    def save_state(self):
+        """Write the state to a temporary file renamed over the old one: never a partial JSON."""
+        descriptor, temporary = tempfile.mkstemp(prefix=".tmp_", dir=self.aux_dir)
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, indent=1)
+            os.replace(temporary, self.state_file)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incremental build of the document.")
+    parser.add_argument("jobname", nargs="?", default=JOBNAME)
+    parser.add_argument("-f", "--force", action="store_true", help="run pdflatex even when up to date")
+    parser.add_argument("--max-passes", type=int, default=MAX_PASSES)
+    parser.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args()
+
+    document = DocumentBuild(args.jobname, verbose=not args.quiet)
+    try:
+        passes = document.build(args.force, args.max_passes)
+    except BuildError as err:
+        sys.exit(str(err))
+    if passes:
+        total = sum(seconds for _, seconds in document.runs)
+        print("%d pdflatex pass(es), %d tool run(s), %.2f s" % (passes, len(document.runs), total))
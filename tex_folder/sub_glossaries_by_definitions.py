@@ -1,4 +1,11 @@
+import os
 import re
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "glossaries")
+)
+from macro_expander import MacroCycleError, MacroExpander  # noqa: E402
 
 
 def carregar_definicoes(caminho_def):
@@ -15,31 +22,23 @@ def carregar_definicoes(caminho_def):
 
 
 def substituir_comandos(texto, comandos):
-    # Ordena do maior para o menor para evitar conflitos de prefixos
-    for nome in sorted(comandos, key=len, reverse=True):
-        valor = comandos[nome]
-        padrao = re.compile(rf"\\{re.escape(nome)}\b")
-        # Passa o valor como função, não como string, para evitar problemas com backslashes
-        texto = padrao.sub(lambda m: valor, texto)
-    return texto
+    # Uma única varredura; o nome mais longo sempre vence e as definições que
+    # usam outros comandos são expandidas por completo (ver MacroExpander)
+    return MacroExpander(comandos).expand(texto)
 
 
 def processar_arquivo_tex(origem_tex, saida_tex, comandos):
-    with open(origem_tex, "r", encoding="utf-8") as f:
-        conteudo = f.read()
-
-    novo_conteudo = substituir_comandos(conteudo, comandos)
-
-    with open(saida_tex, "w", encoding="utf-8") as f:
-        f.write(novo_conteudo)
+    # Processa o arquivo em blocos, sem carregá-lo inteiro na memória
+    MacroExpander(comandos).expand_file(origem_tex, saida_tex)
 
 
 if __name__ == "__main__":
-    import sys
-
     if len(sys.argv) != 4:
         print("Uso: python substitui_comandos.py definicoes.tex entrada.tex saida.tex")
     else:
         defs = carregar_definicoes(sys.argv[1])
-        processar_arquivo_tex(sys.argv[2], sys.argv[3], defs)
+        try:
+            processar_arquivo_tex(sys.argv[2], sys.argv[3], defs)
+        except MacroCycleError as err:
+            sys.exit(str(err))
         print("Comandos substituídos com sucesso.")
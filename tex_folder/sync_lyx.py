@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :   sync_lyx.py
+@Time    :   2026/10/18 22:47:19
+@Author  :   Roney D. Silva
+@Contact :   roneyddasilva@gmail.com
+@Desc    :   LyX <-> TeX synchronization by content hash: only the documents
+             (master and children) whose source changed since the last sync
+             are converted, the children in parallel.
+"""
+
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+TEX_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TEX_DIR)
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from python.linearization_of_model import tracing  # noqa: E402
+
+LYX_DIR = os.path.join(ROOT_DIR, "lyx_folder")
+# Hashes of both sides of every document at its last conversion
+STATE_FILE = os.path.join(TEX_DIR, ".lyx_sync.json")
+STATE_VERSION = 1
+# Master of each direction (as SRC_LYX and the tex2lyx target of the Makefile)
+MASTERS = {"lyx2tex": "main_lyx", "tex2lyx": "main_tex"}
+
+if os.name == "nt":
+    LYX = ["Lyx.exe"]
+    TEX2LYX = ["tex2lyx"]
+else:
+    LYX = ["lyx"]
+    TEX2LYX = ["tex2lyx"]
+
+LYX_INCLUDE = re.compile(r'^filename "?([^"\n]+?)"?$', re.M)
+TEX_INCLUDE = re.compile(r"^[^%\n]*\\(?:input|include)\{([^}]+)\}", re.M)
+TEXTCLASS = re.compile(r"^\\textclass (\S+)", re.M)
+DOCUMENTCLASS = re.compile(r"^\\documentclass(?:\[[^\]]*\])?\{([^}]+)\}", re.M)
+BODY = re.compile(r"\\begin\{document\}\n?(.*?)\\end\{document\}", re.S)
+
+
+class SyncError(RuntimeError):
+    pass
+
+
+def file_hash(file_path):
+    try:
+        with open(file_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def read_text(file_path):
+    with open(file_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class Document:
+    """One document in both formats; ``source``/``target`` follow the direction."""
+
+    def __init__(self, name, direction, master):
+        self.name = name
+        self.master = master
+        self.lyx = os.path.join(LYX_DIR, name + ".lyx")
+        self.tex = os.path.join(TEX_DIR, name + ".tex")
+        self.source, self.target = (self.lyx, self.tex) if direction == "lyx2tex" else (self.tex, self.lyx)
+
+    def hashes(self):
+        return {"lyx": file_hash(self.lyx), "tex": file_hash(self.tex)}
+
+
+def children(direction, master=None):
+    """Documents included by the master that live next to it (the generated glossaries are not)."""
+    master = master or MASTERS[direction]
+    if direction == "lyx2tex":
+        path, pattern, extension = os.path.join(LYX_DIR, master + ".lyx"), LYX_INCLUDE, ".lyx"
+    else:
+        path, pattern, extension = os.path.join(TEX_DIR, master + ".tex"), TEX_INCLUDE, ".tex"
+    names = []
+    for include in pattern.findall(read_text(path)):
+        include = include.strip()
+        if os.path.dirname(include):
+            continue
+        stem, ext = os.path.splitext(include)
+        if ext in ("", extension) and os.path.isfile(os.path.join(os.path.dirname(path), stem + extension)):
+            names.append(stem)
+    return list(dict.fromkeys(names))
+
+
+def load_state(state_file=STATE_FILE):
+    try:
+        state = json.loads(read_text(state_file))
+        if state.get("version") == STATE_VERSION:
+            return state["documents"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return {}
+
+
+def save_state(documents, state_file=STATE_FILE):
+    """Write the state to a temporary file renamed over the old one: never a partial JSON."""
+    descriptor, temporary = tempfile.mkstemp(prefix=".tmp_", dir=os.path.dirname(os.path.abspath(state_file)))
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+            json.dump({"version": STATE_VERSION, "documents": documents}, f, indent=1, sort_keys=True)
+        os.replace(temporary, state_file)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+def plan(documents, state, direction):
+    """
+    (to_convert, conflicts): the documents whose source hash differs from the
+    last sync (or whose target is missing), and among them those whose
+    target also changed since then, i.e. an edit the conversion would lose.
+    """
+    source_key, target_key = ("lyx", "tex") if direction == "lyx2tex" else ("tex", "lyx")
+    to_convert, conflicts = [], []
+    for document in documents:
+        current = document.hashes()
+        recorded = state.get(document.name, {})
+        if current[target_key] is not None and current[source_key] == recorded.get(source_key):
+            continue
+        to_convert.append(document)
+        if current[target_key] is not None and current[target_key] != recorded.get(target_key):
+            conflicts.append(document)
+    return to_convert, conflicts
+
+
+def _lyx_textclass(document):
+    """Text class for tex2lyx of a child without preamble: its own .lyx, else the master's."""
+    for path in (document.lyx, os.path.join(LYX_DIR, document.master + ".lyx")):
+        if os.path.isfile(path):
+            match = TEXTCLASS.search(read_text(path))
+            if match:
+                return match.group(1)
+    match = DOCUMENTCLASS.search(read_text(os.path.join(TEX_DIR, document.master + ".tex")))
+    return match.group(1) if match else "article"
+
+
+def convert(document, direction):
+    """
+    Convert one document into a temporary file next to the target and
+    replace the target. A child exported by LyX on its own is a full
+    document; its body is what the master \\input's.
+    """
+    is_child = document.name != document.master
+    temporary = os.path.join(os.path.dirname(document.target), ".sync_" + os.path.basename(document.target))
+    if direction == "lyx2tex":
+        command = LYX + ["--force-overwrite", "-E", "latex", temporary, document.source]
+    else:
+        command = TEX2LYX + ["-f", "-e", "utf8", "-skipchildren"]
+        if is_child:
+            command += ["-c", _lyx_textclass(document)]
+        command += [document.source, temporary]
+    result = tracing.run(command, "%s %s" % (direction, document.name), cwd=os.path.dirname(document.source),
+                         stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    if result.returncode != 0 or not os.path.isfile(temporary):
+        output = result.stdout.decode("utf-8", "replace").strip().splitlines()
+        raise SyncError("%s: %s falhou\n%s" % (document.name, command[0], "\n".join(output[-20:])))
+    if direction == "lyx2tex" and is_child:
+        match = BODY.search(read_text(temporary))
+        if match:
+            with open(temporary, "w", encoding="utf-8") as f:
+                f.write(match.group(1))
+    os.replace(temporary, document.target)
+    return document
+
+
+def confirm(document, direction):
+    kind = "tex" if direction == "lyx2tex" else "lyx"
+    print("Warning: '%s' changed since the last sync." % os.path.relpath(document.target, ROOT_DIR))
+    answer = input("Continuing will overwrite the newer .%s file. Continue? (y/N) " % kind)
+    return answer.strip().lower() == "y"
+
+
+def sync(direction, names=None, assume_yes=False, processes=None, state_file=STATE_FILE):
+    """
+    Convert the changed documents of ``direction`` ("lyx2tex" or "tex2lyx"):
+    the master first (LyX may rewrite the children while exporting it), then
+    the children in parallel. Returns the names converted.
+    """
+    master = MASTERS[direction]
+    names = names if names is not None else [master] + children(direction)
+    documents = [Document(name, direction, master) for name in names]
+    state = load_state(state_file)
+    to_convert, conflicts = plan(documents, state, direction)
+    for document in conflicts:
+        if not (assume_yes or confirm(document, direction)):
+            raise SyncError("Aborted.")
+    converted, failed = [], []
+    first = [d for d in to_convert if d.name == master]
+    rest = [d for d in to_convert if d.name != master]
+    try:
+        for batch in (first, rest):
+            if not batch:
+                continue
+            workers = processes or min(len(batch), os.cpu_count() or 1)
+            errors = []
+            with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+                futures = {pool.submit(convert, document, direction): document for document in batch}
+                # every conversion that finished is recorded, whatever failed before it
+                for future in concurrent.futures.as_completed(futures):
+                    try:
+                        document = future.result()
+                    except Exception as err:
+                        errors.append(err)
+                        failed.append(futures[future].name)
+                        continue
+                    state[document.name] = document.hashes()
+                    converted.append(document.name)
+                    print("%s -> %s" % (os.path.relpath(document.source, ROOT_DIR),
+                                        os.path.relpath(document.target, ROOT_DIR)))
+            if errors:
+                raise errors[0]
+    finally:
+        # LyX also rewrites the children of an exported master: record them as they are
+        # now, except those whose own conversion failed (their target is stale)
+        if direction == "lyx2tex" and master in converted:
+            for document in documents:
+                if document.name not in converted and document.name not in failed and document.name in state:
+                    state[document.name] = document.hashes()
+        save_state(state, state_file)
+    return converted
+
+
+def record(direction, names=None, state_file=STATE_FILE):
+    """Mark the current files as synchronized (first use, or after a manual conversion)."""
+    master = MASTERS[direction]
+    names = names if names is not None else [master] + children(direction)
+    state = load_state(state_file)
+    for name in names:
+        state[name] = Document(name, direction, master).hashes()
+    save_state(state, state_file)
+    return names
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert the changed LyX/TeX documents.")
+    parser.add_argument("direction", choices=sorted(MASTERS))
+    parser.add_argument("names", nargs="*", help="documents (default: the master and its children)")
+    parser.add_argument("-y", "--yes", action="store_true", help="overwrite changed targets without asking")
+    parser.add_argument("-j", "--processes", type=int, default=None)
+    parser.add_argument("-n", "--dry-run", action="store_true", help="only list what would be converted")
+    parser.add_argument("--record", action="store_true", help="mark the current files as synchronized")
+    args = parser.parse_args()
+
+    names = args.names or None
+    if args.record:
+        print("Recorded: " + ", ".join(record(args.direction, names)))
+    elif args.dry_run:
+        master = MASTERS[args.direction]
+        documents = [Document(n, args.direction, master) for n in names or [master] + children(args.direction)]
+        to_convert, conflicts = plan(documents, load_state(), args.direction)
+        for document in to_convert:
+            print(document.name + (" (target changed)" if document in conflicts else ""))
+    else:
+        try:
+            converted = sync(args.direction, names, args.yes, args.processes)
+        except SyncError as err:
+            sys.exit(str(err))
+        if not converted:
+            print("Documents up to date.")